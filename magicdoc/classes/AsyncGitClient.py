@@ -0,0 +1,145 @@
+##############################################################################
+# CloudMage : MagicDoc Async Git Client Class
+#=============================================================================
+# CloudMage MagicDoc Automatic Documentation Generator CLI Utility/Library
+#   - Concurrent Repository/Release Fetch Class
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/28/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Base Python Modules
+import asyncio, time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+# Import MagicDoc Classes/Modules
+from magicdoc.classes.Log import log_context
+from magicdoc.classes.HttpClient import RATE_LIMIT_RESET_MARGIN, RATE_LIMIT_MAX_WAIT
+
+# Default number of provider requests in flight at once.
+DEFAULT_CONCURRENCY = 8
+# Once no more than this many requests remain in the rate limit window, requests are spread out over the time left until it resets.
+DEFAULT_RATE_LIMIT_RESERVE = 100
+
+
+#####################
+# Class Definition: #
+#####################
+class AsyncGitClient(object):
+    """MagicDoc Async Git Client Class
+    This class resolves the repository and latest release data of many GitParsers concurrently on an asyncio event loop, and stores it on each
+    parser as if its repo setter had run, so callers keep reading the repo and release properties as usual. Parsers that point at the same repository
+    share one pair of requests.
+
+    Requests are sent through the parsers' shared HttpClient from a thread pool, so that they keep its connection pool, response cache, retries and
+    network budget. A semaphore bounds the number of requests in flight. When the rate limit reported by a host runs low, requests to it are paced
+    evenly over the time left until it resets, instead of running it down and failing.
+    """
+
+    def __init__(self, log, http, concurrency=DEFAULT_CONCURRENCY, rate_limit_reserve=DEFAULT_RATE_LIMIT_RESERVE):
+        '''AsyncGitClient Class Constructor'''
+
+        # Set class instantiation variables
+        self._log = log
+        self._http = http
+        self._concurrency = max(1, concurrency)
+        self._rate_limit_reserve = rate_limit_reserve
+        self._log_context = "CLS->AsyncGitClient"
+
+
+    def resolve(self, parsers, token=None):
+        """Class method that resolves the repository and release data of a list of GitParsers, blocking until every parser has been resolved."""
+        # Define this function for logging
+        log_msg = log_context(self._log_context)
+        if not parsers:
+            return
+        token = token if token is not None and isinstance(token, str) and len(token) > 0 else None
+        # Group the parsers by provider and repository, parsers without a supported remote, or in local mode, are resolved by their repo setter without a provider request.
+        pending = {}
+        for parser in parsers:
+            provider, repository = parser.provider_repository() if parser._git_source != 'local' else (None, None)
+            if provider is None:
+                parser.repo = token
+            else:
+                pending.setdefault((provider.api, provider.host, repository), (provider, repository, []))[2].append(parser)
+        if not pending:
+            return
+        self._log.info("{}: Resolving {} repositories for {} git parsers with up to {} concurrent requests", log_msg, len(pending), len(parsers), self._concurrency)
+        loop = asyncio.new_event_loop()
+        executor = ThreadPoolExecutor(max_workers=self._concurrency)
+        try:
+            loop.run_until_complete(self.resolve_all(loop, executor, pending, token))
+        finally:
+            executor.shutdown(wait=True)
+            loop.close()
+        self._http.evict()
+
+
+    async def resolve_all(self, loop, executor, pending, token):
+        """Class method coroutine that resolves every pending repository concurrently."""
+        # The semaphore and the pace locks are created inside the running loop, which they are bound to. Each host that is requested gets its own pace lock.
+        semaphore = asyncio.Semaphore(self._concurrency)
+        pace = {}
+        await asyncio.gather(*[
+            self.resolve_repository(loop, executor, semaphore, pace, provider, repository, repository_parsers, token)
+            for provider, repository, repository_parsers in pending.values()
+        ])
+
+
+    async def resolve_repository(self, loop, executor, semaphore, pace, provider, repository, parsers, token):
+        """Class method coroutine that requests the repository and latest release of one repository, and stores the result on every parser that points at it."""
+        # Define this function for logging
+        log_msg = log_context(self._log_context)
+        try:
+            repo_url, release_url, headers = provider.request_urls(repository, token)
+            repo_request, release_request = await asyncio.gather(
+                self.request(loop, executor, semaphore, pace, provider, repo_url, headers),
+                self.request(loop, executor, semaphore, pace, provider, release_url, headers)
+            )
+            for parser in parsers:
+                repo = parser.provider_result(provider, repo_request, release_request)
+                if repo:
+                    parser._repo = repo
+        except Exception as e:
+            self._log.warning("{}: Unable to resolve repository {}", log_msg, repository)
+            self._log.warning("{}: Exception: {}", log_msg, str(e))
+        for parser in parsers:
+            parser.local_fallback()
+
+
+    async def request(self, loop, executor, semaphore, pace, provider, url, headers):
+        """Class method coroutine that sends one request through the provider, once a concurrency slot is free and the rate limit allows it."""
+        async with semaphore:
+            await self.throttle(pace, url)
+            return await loop.run_in_executor(executor, provider.request, url, headers)
+
+
+    async def throttle(self, pace, url):
+        """Class method coroutine that waits before a request while the rate limit of the host of its URL is running low. Waits are taken one at a time
+        under the pace lock of the host, so that the requests left in its window are spread evenly over the time until it resets, while requests to other
+        hosts are not held up."""
+        # Define this function for logging
+        log_msg = log_context(self._log_context)
+        host = urlparse(url).netloc
+        if host not in pace:
+            pace[host] = asyncio.Lock()
+        async with pace[host]:
+            remaining, reset = self._http.rate_limit(url)
+            if remaining is None or remaining > self._rate_limit_reserve:
+                return
+            window = max(0.0, reset - time.time())
+            delay = window + RATE_LIMIT_RESET_MARGIN if remaining <= 0 else window / (remaining + 1)
+            if delay > RATE_LIMIT_MAX_WAIT:
+                self._log.warning("{}: Rate limit has {} requests remaining, waiting {:.1f} seconds for it is longer than the {:.0f} seconds allowed.", log_msg, remaining, delay, RATE_LIMIT_MAX_WAIT)
+                return
+            budget = self._http.remaining()
+            if budget is not None and delay >= budget:
+                self._log.warning("{}: Rate limit has {} requests remaining, waiting {:.1f} seconds for it would exceed the network budget.", log_msg, remaining, delay)
+                return
+            if delay > 0:
+                self._log.info("{}: Rate limit has {} requests remaining, slowing down by {:.2f} seconds", log_msg, remaining, delay)
+                await asyncio.sleep(delay)
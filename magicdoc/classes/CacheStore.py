@@ -0,0 +1,143 @@
+##############################################################################
+# CloudMage : MagicDoc Cache Store Class
+#=============================================================================
+# CloudMage MagicDoc Automatic Documentation Generator CLI Utility/Library
+#   - Content Addressed On-Disk Cache Class
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/28/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Base Python Modules
+import os, json, hashlib
+
+# Import MagicDoc Classes/Modules
+from magicdoc.classes.Log import log_context
+
+# Default location and size limit of the magicdoc cache directory.
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.magicdoc', 'cache')
+DEFAULT_CACHE_MAX_SIZE = 256 * 1024 * 1024
+
+
+#####################
+# Class Definition: #
+#####################
+class CacheStore(object):
+    """MagicDoc Cache Store Class
+    This class stores blobs on disk keyed by a hash of whatever inputs produced them. Entries are evicted least recently used first
+    once the total size of the store grows beyond max_size. Every lookup is counted as a hit or a miss for verbose output.
+    """
+
+    def __init__(self, log, directory, max_size=DEFAULT_CACHE_MAX_SIZE):
+        '''CacheStore Class Constructor'''
+
+        # Set class instantiation variables
+        self._log = log
+        self._directory = directory
+        self._max_size = max_size
+        self._log_context = "CLS->CacheStore"
+
+        # Set properties to track cache usage.
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+
+
+    @staticmethod
+    def key(*parts):
+        """Class method that returns the cache key for the provided parts. Parts may be str or bytes."""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part if isinstance(part, bytes) else str(part).encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+
+    def _entry(self, key):
+        """Class method that returns the file path of a cache entry, fanned out into sub-directories by key prefix."""
+        return os.path.join(self._directory, key[:2], key)
+
+
+    def get(self, key):
+        """Class method that returns the cached bytes for a key, or None on a miss. A hit refreshes the entry's mtime, which is used as its LRU timestamp."""
+        # Define this function for logging
+        log_msg = log_context(self._log_context)
+        try:
+            with open(self._entry(key), 'rb') as f:
+                value = f.read()
+            os.utime(self._entry(key))
+            self.hits += 1
+            self._log.debug("{}: Cache hit: {}", log_msg, key)
+            return value
+        except OSError:
+            self.misses += 1
+            self._log.debug("{}: Cache miss: {}", log_msg, key)
+            return None
+
+
+    def put(self, key, value):
+        """Class method that stores bytes under a key. Failures are logged and otherwise ignored, as the cache is never required for a run to succeed."""
+        # Define this function for logging
+        log_msg = log_context(self._log_context)
+        try:
+            os.makedirs(os.path.dirname(self._entry(key)), exist_ok=True)
+            # Write to a temporary file and then replace, so that concurrent readers never see a partial entry.
+            with open("{}.tmp{}".format(self._entry(key), os.getpid()), 'wb') as f:
+                f.write(value)
+            os.replace("{}.tmp{}".format(self._entry(key), os.getpid()), self._entry(key))
+            self._writes += 1
+        except OSError as e:
+            self._log.warning("{}: Unable to write cache entry {}: {}", log_msg, key, str(e))
+
+
+    def get_json(self, key):
+        """Class method that returns the decoded json object stored under a key, or None on a miss."""
+        value = self.get(key)
+        if value is None:
+            return None
+        try:
+            return json.loads(value.decode('utf-8'))
+        except ValueError:
+            # Count an unreadable entry as a miss, it will be replaced by the caller.
+            self.hits -= 1
+            self.misses += 1
+            return None
+
+
+    def put_json(self, key, value):
+        """Class method that stores a json serializable object under a key."""
+        self.put(key, json.dumps(value).encode('utf-8'))
+
+
+    def evict(self):
+        """Class method that removes the least recently used entries until the store is no larger than max_size. Only runs if this instance has written entries."""
+        # Define this function for logging
+        log_msg = log_context(self._log_context)
+        if not self._writes:
+            return
+        entries = []
+        total_size = 0
+        try:
+            for root, dirs, files in os.walk(self._directory):
+                for filename in files:
+                    stat = os.stat(os.path.join(root, filename))
+                    entries.append((stat.st_mtime, stat.st_size, os.path.join(root, filename)))
+                    total_size += stat.st_size
+            if total_size <= self._max_size:
+                return
+            self._log.info("{}: Cache size {} exceeds {}, evicting least recently used entries", log_msg, total_size, self._max_size)
+            for mtime, size, path in sorted(entries):
+                if total_size <= self._max_size:
+                    break
+                os.remove(path)
+                total_size -= size
+        except OSError as e:
+            self._log.warning("{}: Cache eviction failed: {}", log_msg, str(e))
+
+
+    def stats(self):
+        """Class method that returns a printable summary of the cache hit and miss counters."""
+        return "{} hits, {} misses".format(self.hits, self.misses)
@@ -1,8 +1,8 @@
 ##############################################################################
-# CloudMage : MagicDoc GitHub Repo Find/Parse/Request Class
+# CloudMage : MagicDoc Git Repo Find/Parse/Request Class
 #=============================================================================
 # CloudMage MagicDoc Automatic Documentation Generator CLI Utility/Library
-#   - Github Data Fetch Class
+#   - Git Repository Data Fetch Class
 # Author: Richard Nason rnason@cloudmage.io
 # Project Start: 2/9/2020
 # License: GNU GPLv3
@@ -11,11 +11,22 @@
 ###############
 # Imports:    #
 ###############
-# Import Pip Installed Modules:
-import requests
+# Pip installed modules (requests) are imported by the methods that use them, so that importing this class stays cheap.
 
 # Import Base Python Modules
-import json, os, inspect
+import json, os
+
+# Import MagicDoc Classes/Modules
+from magicdoc.classes.Log import log_context, function_name
+from magicdoc.classes.HttpClient import HttpClient
+from magicdoc.classes.GitProvider import GitProvider, GithubProvider
+from magicdoc.modules.gitrepo import FindGitDir, ReadRemotes, LatestTag
+
+# Where repository and release data is sourced from. local reads the git directory only, remote uses the provider API,
+# and auto uses the provider API with the latest local tag as the release fallback.
+GIT_SOURCES = ('local', 'remote', 'auto')
+# Number of repositories resolved per Github GraphQL query, well inside the API node limit.
+GITHUB_GRAPHQL_BATCH_SIZE = 50
 
 
 #####################
@@ -24,25 +35,28 @@ import json, os, inspect
 class GitParser(object):
     """MagicDoc Git Parser Class
     This class is designed to search a provided target directory path and attempt to find configured repository URLs from the directories git config.
-    If found, the repository name and user's namespace will be parsed and used to send requests to the repository to collect repository data and
-    latest release information for the targeted project.
+    If found, the repository name and user's namespace will be parsed and used to send requests to the repository provider (Github, GitLab or Bitbucket)
+    to collect repository data and latest release information for the targeted project.
     """
 
-    def __init__(self, log, path):
+    def __init__(self, log, path, github_api=None, http=None, git_source='auto', provider_apis=None, provider_stub_dir=None):
         '''GitParser Class Constructor'''
 
         # Set class instantiation variables
         self._log = log
         self._path = path
+        self._http = http if http is not None else HttpClient(log)
+        self._git_source = git_source if git_source in GIT_SOURCES else 'auto'
         self._log_context = "CLS->GitParser"
 
-        # Set Git platform provider API URLs
-        # TODO: Need to test these in order to support others besides github. Need exact URL paths to repo data, and releases
-        # self._github_api = 'https://api.github.com'
-        # self._gitlab_api = 'https://{}}/api/v4/projects'.format("REPO_BASE_URL")
-        # self._bitbucket_api = 'https://api.bitbucket.org/2.0/repositories/tutorials/tutorials.bitbucket.org'
-        
+        # Set Git platform provider API URLs, keyed by remote host. Hosts that are not listed use their provider's default API URL.
+        self._provider_apis = {'github.com': github_api} if github_api else {}
+        self._provider_apis.update(provider_apis or {})
+        self._provider_stub_dir = provider_stub_dir
+        self._providers = {}
+
         # Set properties to hold result sets.
+        self._git_dir = None
         self._config = None
         self._repo = None
         self._release = None
@@ -58,8 +72,7 @@ class GitParser(object):
     def config(self):
         """Getter for class property config method. This object property will return the self._config list containing potentially parsed URL data."""
         # Define this function for logging
-        this = inspect.stack()[0][3]
-        log_msg = "{}.{}".format(self._log_context, this)
+        log_msg = log_context(self._log_context)
         self._log.info("{}: Property requested".format(log_msg))
         if self._config is not None and isinstance(self._config, (list, dict)) and bool(self._config):
             return self._config
@@ -71,56 +84,31 @@ class GitParser(object):
 
     @config.setter
     def config(self, init=True):
-        """Setter for class property config method that will attempt to locate, open and parse the git config file in the target project path. List of Dicts returned."""
+        """Setter for class property config method that will attempt to locate the git repository containing the target project path, and parse the remotes from its git config. List of Dicts returned."""
         # Define this function for log messages and function call identification. 
-        this = inspect.stack()[0][3]
-        log_msg = "{}.{}".format(self._log_context, this)
+        this = function_name()
+        log_msg = log_context(self._log_context)
         self._log.info("{}: Refresh requested".format(log_msg))
         try:
-            # Search for a .git directory in the working directory search path, and if found parse to get the repo namespace and repo name.
-            local_git_config_path = os.path.join(self._path, '.git/config')
+            # Walk up from the working directory to the repository root, following .git files for worktrees and submodules.
+            self._log.info("{}: {} function call to search for repo data from target directory: {} ".format(log_msg, this, self._path))
+            local_git_dirs = FindGitDir(self._path)
             local_repo_results = []
-            self._log.info("{}: {} function call to search for repo data in target directory: {} ".format(log_msg, this, local_git_config_path))
-            if os.path.exists(local_git_config_path):
-                self._log.debug("{}: Search found the requested directory: {}".format(log_msg, local_git_config_path))
-                self._log.debug("{}: Attempting to parse the target project repository data".format(log_msg))
-                try:
-                    with open(local_git_config_path) as f:
-                        for count, line in enumerate(f):
-                            # Set Parse Variable
-                            local_parse_result = {}
-
-                            # For each line in the config, if url is found in the line, then attempt to parse it.
-                            if 'url' in line:
-                                k, v = line.partition("=")[::2]
-                                self._log.debug("{}: Url string match found in the target git config... Attempting to parse URL string: {}".format(log_msg, v.strip()))
-                                local_parse_result.update(url=v.strip())
-                                local_git_url = v.strip().split("/")
-                                self._log.debug("{}: Attempting to determine git platform provider from URL string.".format(log_msg))
-                                self._log.debug("{}: Splitting URL string by '/' yielded {} list elements. Parsing repository namespace and repo name from generated list.".format(log_msg, len(local_git_url)))
-                                # Parse out the repo name and namespace
-                                local_parse_result.update(namespace=local_git_url[-2].split(":")[-1])
-                                local_parse_result.update(name=local_git_url[-1].split(".")[0])
-                                # Parse out the git platform provider
-                                try:
-                                    if len(local_git_url) == 2:
-                                        local_parse_result.update(provider=local_git_url[-2].split(":")[0].split("@")[1])
-                                    elif len(local_git_url) > 3:
-                                        local_parse_result.update(provider=local_git_url[-3])
-                                except:
-                                    self._log.warning("{}: Unable to parse repository platform provider, omitting from result dictionary.".format(log_msg))
-                                self._log.debug("{}: Parse of URL string successful. Found: {} -> {}".format(log_msg, local_parse_result.get('namespace'), local_parse_result.get('name')))
-                                local_repo_results.append(local_parse_result)
-                except Exception as e:
-                    self._log.warning("{}: File open operation failed! Exception: {}".format(log_msg, str(e)))
+            if local_git_dirs is not None:
+                local_repo_root, local_git_dir, self._git_dir = local_git_dirs
+                self._log.debug("{}: Search found the repository root: {}, git directory: {}", log_msg, local_repo_root, local_git_dir)
+                self._log.debug("{}: Attempting to parse the target project repository data", log_msg)
+                local_repo_results = ReadRemotes(self._log, self._git_dir)
+                for local_parse_result in local_repo_results:
+                    self._log.debug("{}: Parse of URL string successful. Found: {} -> {} on {}", log_msg, local_parse_result.get('namespace'), local_parse_result.get('name'), local_parse_result.get('provider'))
             else:
-                self._log.warning("{}: Search could not find the requested directory: {}. Directory path does not exist.".format(log_msg, local_git_config_path))
+                self._log.warning("{}: Search could not find a git repository containing the directory: {}.".format(log_msg, self._path))
                 self._log.warning("{}: Git repository and release data will not be available during this execution cycle.".format(log_msg))
-            self._log.debug("{}: Git parse results: {}".format(log_msg, local_repo_results))
+            self._log.debug("{}: Git parse results: {}", log_msg, local_repo_results)
             self._config = local_repo_results
             self._log.debug("{}: Git parse results saved successfully!".format(log_msg))
         except Exception as e:
-            self._log.warning("{}: Failed to find or parse a git config in the target project directory: {}".format(log_msg, local_git_config_path))
+            self._log.warning("{}: Failed to find or parse a git config for the target project directory: {}".format(log_msg, self._path))
             self._log.warning("{}: Git repository and release data will not be available during this execution cycle.".format(log_msg))
             self._log.warning("{}: Exception: {}".format(log_msg, str(e)))
 
@@ -128,13 +116,11 @@ class GitParser(object):
     ############################################
     # Parse Git Config and Request Repo Data:  #
     ############################################
-    # TODO: This method will need to be restructured to handle other git providers such as gitlab and bitbucket in the near future.
     @property
     def repo(self):
         """Getter for class property repo method. This object property will return the self._git_repo dictionary if a successful request to the repo provider was completed."""
         # Define this function for logging
-        this = inspect.stack()[0][3]
-        log_msg = "{}.{}".format(self._log_context, this)
+        log_msg = log_context(self._log_context)
         self._log.info("{}: Property requested".format(log_msg))
         if self._repo is not None and isinstance(self._repo, dict) and bool(self._repo):
             return self._repo
@@ -149,8 +135,7 @@ class GitParser(object):
         """Setter for class property repo method that will attempt to orchestrate the creation of a valid request URL, the sending of that request,
         the parsing of the response, and finally setting the class repo property with valid response data."""
         # Define this function for log messages and function call identification. 
-        this = inspect.stack()[0][3]
-        log_msg = "{}.{}".format(self._log_context, this)
+        log_msg = log_context(self._log_context)
         self._log.info("{}: Refresh requested".format(log_msg))
         try:
             # Instantiate local variables:
@@ -158,6 +143,14 @@ class GitParser(object):
             git_repository_provider = False
             git_repository_request_processor = False
             git_authentication_token = token if token is not None and isinstance(token, str) and len(str(token)) > 0 else None
+            git_repositories_requested = set()
+
+            # Local source: describe the repository from its git config and tags without sending any request.
+            if self._git_source == 'local':
+                self._log.debug("{}: Git source is set to local, repository provider requests will not be sent.", log_msg)
+                self._repo = self.local_repo()
+                self._release = self.local_release()
+                return
 
             # Validate that config data is available to construct a proper request URL.
             if self._config is not None and isinstance(self._config, list) and bool(self._config) and len(self._config) > 0:
@@ -168,43 +161,45 @@ class GitParser(object):
                     git_repository = "{}/{}".format(config.get('namespace', 'not'), config.get('name', 'provided'))
                     self._log.debug("{}: Setting target git repository for target project to: {}".format(log_msg, git_repository))
                     git_repository_provider = config.get('provider')
-                    # TODO: Remove this when support for other repos is developed.
-                    if git_repository_provider != 'github.com' or 'github.com' not in git_repository_provider:
-                        continue
                     self._log.debug("{}: Setting target git repository provider to: {}".format(log_msg, git_repository_provider))
+                    # Remotes such as origin and upstream, or https and ssh urls, often point at the same repository. Only request each repository once.
+                    if (git_repository_provider, git_repository) in git_repositories_requested:
+                        self._log.debug("{}: Repository {} has already been requested, skipping duplicate remote.", log_msg, git_repository)
+                        continue
+                    git_repositories_requested.add((git_repository_provider, git_repository))
                     self._log.debug("{}: Attempting to determine repository processor...".format(log_msg))
-                    if git_repository_provider == 'github.com' or 'github.com' in git_repository_provider:
-                        self._log.debug("{}: Repository provider has been identified as {}".format(log_msg, git_repository_provider))
-                        self._log.debug("{}: Sending request data to {} request processor".format(log_msg, git_repository_provider))
-                        git_repository_request_processor = self.github_request(git_repository, token)
-                        if git_repository_request_processor is not None and isinstance(git_repository_request_processor, dict) and bool(git_repository_request_processor):
-                            self._log.debug("{}: Request processor has completed successfully".format(log_msg))
-                            self._log.debug("{}: Updating repository property.".format(log_msg))
-                            self._repo = git_repository_request_processor
-                        else:
-                            self._log.warning("{}: An error occurred attempting to process the git repository data request.".format(log_msg))
-                    else:
-                        self._log.warning("{}: Git repository request URL could not be constructed! Currently only github is supported. Support for other git repository providers is in development.".format(log_msg))
-                        self._log.warning("{}: Git repository data will not be availabe during this execution. Please enable debug mode for additional information!".format(log_msg))
+                    provider = self.provider(git_repository_provider)
+                    if provider is None:
+                        self._log.warning("{}: Git repository request URL could not be constructed! {} is not a supported repository provider, only Github, GitLab and Bitbucket are supported.".format(log_msg, git_repository_provider))
                         continue
+                    self._log.debug("{}: Sending request data to {} request processor".format(log_msg, provider.name))
+                    git_repository_request_processor = self.provider_request(provider, git_repository, token)
+                    if git_repository_request_processor is not None and isinstance(git_repository_request_processor, dict) and bool(git_repository_request_processor):
+                        self._log.debug("{}: Request processor has completed successfully".format(log_msg))
+                        self._log.debug("{}: Updating repository property.".format(log_msg))
+                        self._repo = git_repository_request_processor
+                        # Remotes are ordered origin first, the first repository that resolves describes the project.
+                        break
+                    else:
+                        self._log.warning("{}: An error occurred attempting to process the git repository data request.".format(log_msg))
             else:
                 self._log.warning("{}: Git config data was unavailable during this execution. Repository URL could not be constructed!".format(log_msg))
                 self._log.warning("{}: Git repository data will not be availabe during this execution. Please enable debug mode for additional information!".format(log_msg))
         except Exception as e:
-            self._log.warning("{}: Unable to parse Github response data".format(log_msg))
+            self._log.warning("{}: Unable to parse the repository provider response data".format(log_msg))
             self._log.warning("{}: Exception: {}.".format(log_msg, str(e)))
+        self.local_fallback()
+        self._http.evict()
 
 
     ############################################
     # Parse Git Config and Request Repo Data:  #
     ############################################
-    # TODO: This method will need to be restructured to handle other git providers such as gitlab and bitbucket in the near future.
     @property
     def release(self):
         """Getter for class property release method. This object property will return the self._git_release version string. This properties setter will be initiated from the repo property method.."""
         # Define this function for logging
-        this = inspect.stack()[0][3]
-        log_msg = "{}.{}".format(self._log_context, this)
+        log_msg = log_context(self._log_context)
         self._log.info("{}: Property requested".format(log_msg))
         if self._release is not None and isinstance(self._release, str):
             return self._release
@@ -218,141 +213,144 @@ class GitParser(object):
     def release(self, version):
         """Setter for class property release method. This method simply is used to set the self.release property sourced from the data collected during the repo setter method action."""
         # Define this function for log messages and function call identification. 
-        this = inspect.stack()[0][3]
-        log_msg = "{}.{}".format(self._log_context, this)
+        log_msg = log_context(self._log_context)
         self._log.info("{}: Update requested".format(log_msg))
         if version is not None and isinstance(version, str):
             self._release = version
 
     
     ############################################
-    # Github Request/Response Parser Methods:  #
+    # Local Repository Data Methods:           #
     ############################################
-    def github_request(self, repo, token=None):
-        """Class method to handle the construction of the github API URL that will be used to fetch the required repository/release data.
-        This method will also be responsible for sending the request and ensuring that the request response is valid."""
-        # Define this function for log messages and function call identification. 
-        this = inspect.stack()[0][3]
-        log_msg = "{}.{}".format(self._log_context, this)
-        self._log.info("{}: Github URL construction requested".format(log_msg))
-        try:
-            # Instantiate local variables
-            github_request_url = False
-            github_repo_request = False
-            github_release_request = False
-            github_request_headers = {}
-            github_response = None
-
-            # Construct Github repository URL
-            github_request_url = "https://api.github.com/repos/{}".format(repo)
-            self._log.info("{}: Github repository API URL has been set to: {}".format(log_msg, github_request_url))
-            if token is not None:
-                self._log.info("{}: Github authentication token has been provided and appears to be valid. Building request headers to include provided auth token...".format(log_msg))
-                github_request_headers.update({'Authorization': 'token {}'.format(token)})
-            # Send the request
-            self._log.debug("{}: Sending repository request to request handler for execution".format(log_msg))
-            github_repo_request = self.request_handler(github_request_url, github_request_headers)
-
-            # Construct Github releases URL
-            github_request_url = "https://api.github.com/repos/{}/releases/latest".format(repo)
-            self._log.info("{}: Github releases API URL has been set to: {}".format(log_msg, github_request_url))
-
-            # Send the request and then set the version number to the self._releases property
-            self._log.debug("{}: Sending releases request to request handler for execution.".format(log_msg))
-            github_release_request = self.request_handler(github_request_url, github_request_headers)
-            # TODO Validate this response further in the future.
-            self._release = github_release_request.get('tag_name', 'v0.0.0')
-            self._log.debug("{}: Setting Github release property to {}".format(log_msg, self._release))
-
-            # Send both requests for processing
-            self._log.debug("{}: Sending repository and release responses to response processor.".format(log_msg))
-            github_response = self.github_response(github_repo_request, github_release_request)
-            if github_response is not None and isinstance(github_response, dict) and bool(github_response):
-                self._log.debug("{}: Response processor has completed successfully.".format(log_msg))
-                return github_response
-            else:
-                self._log.warning("{}: Unable to parse Github repository response object".format(log_msg))
-                self._log.warning("{}: GitHub repository data will not be availabe for generating the repo documentation.".format(log_msg))
-                return {}
-        except Exception as e:
-            self._log.warning("{}: Unable to parse Github response data".format(log_msg))
-            self._log.warning("{}: Exception: {}.".format(log_msg, str(e)))
-            return {}
+    def local_release(self):
+        """Class method that returns the highest semantic version tag of the target project git repository, read from its tag refs without running git."""
+        if self._git_dir is None:
+            return None
+        return LatestTag(self._log, self._git_dir)
 
 
-    def github_response(self, repo_response, releases_response):
-        """Class method to handle the parsing Github API request responses and the construction of the caller response object."""
-        # Define this function for log messages and function call identification. 
-        this = inspect.stack()[0][3]
-        log_msg = "{}.{}".format(self._log_context, this)
-        self._log.info("{}: Github response parsing requested".format(log_msg))
+    def fallback_release(self):
+        """Class method that returns the release used when the provider did not return one. In auto mode that is the latest local tag, otherwise v0.0.0."""
+        release = self.local_release() if self._git_source == 'auto' else None
+        return release if release is not None else 'v0.0.0'
+
+
+    def local_fallback(self):
+        """Class method that falls back to the local repository data in auto mode, when the provider could not be reached, or the remote is not hosted on a supported provider."""
+        if self._git_source == 'auto':
+            if self._repo is None:
+                self._repo = self.local_repo()
+            if self._release is None:
+                self._release = self.local_release()
+
+
+    def local_repo(self):
+        """Class method that constructs the repository data that can be derived from the first parsed git remote, without a provider request."""
+        if not isinstance(self._config, list) or not self._config:
+            return None
+        config = self._config[0]
+        return {
+            'name': config.get('name'),
+            'full_name': "{}/{}".format(config.get('namespace'), config.get('name')),
+            'description': None,
+            'owner': config.get('namespace'),
+            'owner_url': "https://{}/{}".format(config.get('provider', 'github.com'), config.get('namespace'))
+        }
+
+
+    ############################################
+    # Provider Request/Response Methods:       #
+    ############################################
+    def provider(self, host):
+        """Class method that returns the repository provider for a remote host, sharing this parser's HttpClient, or None if the host is not supported."""
+        if host not in self._providers:
+            self._providers[host] = GitProvider.create(self._log, self._http, host, self._provider_apis, self._provider_stub_dir)
+        return self._providers[host]
+
+
+    def provider_repository(self):
+        """Class method that returns a tuple of the provider and namespace/name repository of the first parsed remote that a provider supports, or (None, None)."""
+        for config in self._config or []:
+            provider = self.provider(config.get('provider'))
+            if provider is not None:
+                return provider, "{}/{}".format(config.get('namespace'), config.get('name'))
+        return None, None
+
+
+    def provider_request(self, provider, repo, token=None):
+        """Class method to handle the construction of the provider API URLs that will be used to fetch the required repository/release data.
+        This method will also be responsible for sending the requests and ensuring that the request responses are valid."""
+        # Define this function for log messages and function call identification.
+        log_msg = log_context(self._log_context)
+        self._log.info("{}: {} URL construction requested".format(log_msg, provider.name))
         try:
-            # Instantiate local variables required for processing:
-            github_response = {}
-
-            # Process the repository response first
-            self._log.info("{}: Parsing Github repository response data...".format(log_msg))
-            # Construct Github Repo/Release response object.
-            if isinstance(repo_response, dict) and bool(repo_response):
-                github_response.update(name=repo_response.get('name'))
-                github_response.update(full_name=repo_response.get('full_name'))
-                github_response.update(description=repo_response.get('description'))
-                github_response.update(owner=repo_response.get('owner').get('login'))
-                github_response.update(owner_url=repo_response.get('owner').get('html_url'))
-                self._log.info("{}: Github response parsing completed successfully!".format(log_msg))
-                self._log.info(json.dumps(github_response, indent=4, sort_keys=True))
-                return github_response
-            else:
-                self._log.warning("{}: Unable to parse Github repository response object".format(log_msg))
-                self._log.warning("{}: GitHub repository data will not be availabe for generating the repo documentation.".format(log_msg))
-                return {}
-        except:
-            self._log.warning("{}: Unable to parse Github response data".format(log_msg))
+            repo_url, release_url, headers = provider.request_urls(repo, token)
+            self._log.info("{}: Repository API URL has been set to: {}".format(log_msg, repo_url))
+            self._log.info("{}: Releases API URL has been set to: {}".format(log_msg, release_url))
+            # Send both requests concurrently, they are independent of each other and share the pooled session connections.
+            self._log.debug("{}: Sending repository and releases requests to request handler for execution".format(log_msg))
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                repo_future = executor.submit(provider.request, repo_url, headers)
+                release_future = executor.submit(provider.request, release_url, headers)
+                return self.provider_result(provider, repo_future.result(), release_future.result())
+        except Exception as e:
+            self._log.warning("{}: Unable to parse {} response data".format(log_msg, provider.name))
             self._log.warning("{}: Exception: {}.".format(log_msg, str(e)))
             return {}
 
 
-    def request_handler(self, request, headers):
-        """Class Method to send an http/https request and validate that the response object is valid, once completed, the method will send the response back to the caller."""
-        # Define this function for log messages and function call identification. 
-        this = inspect.stack()[0][3]
-        log_msg = "{}.{}".format(self._log_context, this)
-        self._log.info("{}: HTTP/HTTPS request processor called!".format(log_msg))
-        try:
-            # Set local variables required to perform necessary method operations.
-            response = None
-            # Send the HTTP/HTTPS request
-            self._log.info("{}: Sending API request to: {}".format(log_msg, request))
-            r = requests.get(request, headers=headers)
-            self._log.info("{}: Request sent successfully!  Starting response validation...".format(log_msg))
-            # Validate that the request was successful and if so, then flag the response object for processing
-            if r.status_code == 200:
-                response = json.loads(r.text)
-                if isinstance(response, dict) and bool(response):
-                    self._log.info("{}: API response status: {} passed validation check. Sending success response object back to the instance caller".format(log_msg, r.status_code))
-                    self._log.debug(json.dumps(response, indent=4, sort_keys=True))
-                else:
-                    self._log.warning("{}: The response object does not appear to be valid json. Sending failure response back to caller...".format(log_msg))
-                    self._log.warning(json.dumps(response, indent=4, sort_keys=True))
-                    return {}
+    def provider_result(self, provider, repo_response, release_response):
+        """Class method that sets the release property from the latest release response, and returns the repository data parsed from the repository response, or an empty dictionary."""
+        # Define this function for log messages and function call identification.
+        log_msg = log_context(self._log_context)
+        self._release = provider.parse_release(release_response) or self.fallback_release()
+        self._log.debug("{}: Setting release property to {}".format(log_msg, self._release))
+        repo = provider.parse_repo(repo_response)
+        if repo:
+            self._log.info("{}: {} response parsing completed successfully!".format(log_msg, provider.name))
+            self._log.info(lambda: json.dumps(repo, indent=4, sort_keys=True))
+            return repo
+        self._log.warning("{}: Unable to parse {} repository response object".format(log_msg, provider.name))
+        self._log.warning("{}: Repository data will not be availabe for generating the repo documentation.".format(log_msg))
+        return {}
+
+
+    @staticmethod
+    def batch_request(parsers, token=None):
+        """
+        Class method that resolves the repository and latest release data of many GitParsers with Github GraphQL queries, one query per
+        GITHUB_GRAPHQL_BATCH_SIZE distinct repositories, instead of two REST requests per parser. The data is stored on each parser as if its repo
+        setter had run. The GraphQL API requires an authentication token, so without one nothing is requested.
+        Returns the list of parsers that were not resolved, including those hosted elsewhere, which callers resolve through their repo setter as usual.
+        """
+        if not parsers:
+            return []
+        log = parsers[0]._log
+        log_msg = log_context(parsers[0]._log_context)
+        if token is None:
+            log.info("{}: No authentication token was provided, Github GraphQL batch requests will not be sent.", log_msg)
+            return list(parsers)
+        # Group the parsers by Github API and repository, so that modules that live in the same repository are only requested once.
+        unresolved = []
+        pending = {}
+        for parser in parsers:
+            provider, repository = parser.provider_repository() if parser._git_source != 'local' else (None, None)
+            if not isinstance(provider, GithubProvider):
+                unresolved.append(parser)
             else:
-                self._log.warning("{}: API response status: {} failed validation check. Sending failure response object back to the instance caller".format(log_msg, r.status_code))
-                return {}
-        except Exception as e:
-            self._log.warning("{}: An error occurred when attempting to send the API request!".format(log_msg))
-            self._log.warning("{}: Exception: {}".format(str(e)))
-            return {}
-        return response
-
-
-# Code for later: Gitlab, Bitbucket API research.
-# elif 'gitlab' in git_repository_provider:
-#     git_repo_url = "https://{}/api/v4/projects/{}".format(git_repository_provider, git_repository)
-#     if token is not None and len(token) > 0 and isinstance(token, str):
-#         self._log.info("{}: Authentication token for git repository provider provider: {} provided... constructing request headers...".format(log_msg, git_repository_provider))
-#         request_headers = {'PRIVATE-TOKEN': '{}'.format(token)}
-# elif 'bitbucket' in git_repository_provider:
-#     git_repo_url = "https://bitbucket.org/api/2.0/repositories/{}".format(git_repository)
-#     if token is not None and len(token) > 0 and isinstance(token, str):
-#         self._log.info("{}: Authentication token for git repository provider provider: {} provided... constructing request headers...".format(log_msg, git_repository_provider))
-#         request_headers = {'Authorization': 'Bearer {}'.format(token)}
\ No newline at end of file
+                pending.setdefault(provider.api, (provider, {}))[1].setdefault(repository, []).append(parser)
+        for provider, repositories in pending.values():
+            log.info("{}: Resolving {} repositories from {} with Github GraphQL batch requests", log_msg, len(repositories), provider.api)
+            names = list(repositories)
+            for start in range(0, len(names), GITHUB_GRAPHQL_BATCH_SIZE):
+                chunk = names[start:start + GITHUB_GRAPHQL_BATCH_SIZE]
+                results = provider.graphql(chunk, token)
+                for repository in chunk:
+                    for parser in repositories[repository]:
+                        if repository not in results:
+                            unresolved.append(parser)
+                            continue
+                        parser._repo = results[repository].get('repo')
+                        parser._release = results[repository].get('release') or parser.fallback_release()
+        return unresolved
@@ -0,0 +1,359 @@
+##############################################################################
+# CloudMage : MagicDoc Git Provider Classes
+#=============================================================================
+# CloudMage MagicDoc Automatic Documentation Generator CLI Utility/Library
+#   - Git Repository Provider API Classes
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/28/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Base Python Modules
+import os, json
+from urllib.parse import quote
+
+# Import MagicDoc Classes/Modules
+from magicdoc.classes.Log import log_context
+
+# Default Github API base URL. This can be pointed at a local stub server with `magicdoc tf --github_api`.
+GITHUB_API_URL = 'https://api.github.com'
+# Fields requested for each repository in a batch GraphQL query.
+GITHUB_GRAPHQL_FIELDS = 'name nameWithOwner description owner { login url } latestRelease { tagName }'
+
+
+#####################
+# Class Definition: #
+#####################
+class GitProvider(object):
+    """MagicDoc Git Provider Class
+    This class is the interface that every git repository provider implements. A provider builds the repository and latest release API requests
+    for a namespace/name repository, and parses their responses into the repository data dictionary (name, full_name, description, owner and
+    owner_url) and release tag that magicdoc documents.
+
+    Every provider of a run sends its requests through the same HttpClient, so GitHub, GitLab and Bitbucket requests alike reuse one pooled
+    session, response cache, retry policy and network budget.
+    """
+
+    # Provider name, as matched against the remote host, and the path that its self-hosted API is served from, as matched against a configured API URL.
+    name = None
+    api_path = None
+
+    def __init__(self, log, http, host, api=None):
+        '''GitProvider Class Constructor'''
+
+        # Set class instantiation variables
+        self._log = log
+        self._http = http
+        self.host = host
+        self.api = api.rstrip('/') if api else self.default_api()
+        self._log_context = "CLS->{}".format(type(self).__name__)
+
+
+    @staticmethod
+    def create(log, http, host, apis=None, stub_dir=None):
+        """
+        Class method that returns the provider for a remote host, or None if no provider supports it. stub_dir replaces every provider with a LocalProvider
+        reading from that directory. apis maps hosts to API base URLs that replace the provider default, optionally prefixed with the provider name, such as
+        gitlab:https://git.example.com/api/v4. The named provider serves the host whatever its name, otherwise the provider is matched by the host name, and
+        then by the API path of the URL, so that self-hosted servers on any host name are supported.
+        """
+        # Define this function for logging
+        log_msg = log_context("CLS->GitProvider")
+        if stub_dir:
+            return LocalProvider(log, http, host, stub_dir)
+        providers = (GithubProvider, GitlabProvider, BitbucketProvider)
+        api = (apis or {}).get(host)
+        if api:
+            name, separator, url = api.partition(':')
+            for provider in providers:
+                if separator and name.strip().lower() == provider.name:
+                    return provider(log, http, host, url.strip())
+        for provider in providers:
+            if provider.matches(host):
+                return provider(log, http, host, api)
+        for provider in providers:
+            if api and provider.api_path and api.rstrip('/').endswith(provider.api_path):
+                return provider(log, http, host, api)
+        if api:
+            log.warning("{}: No git provider could be determined for host {} from its API URL {}, prefix the URL with the provider name, such as gitlab:{}", log_msg, host, api, api)
+        return None
+
+
+    @classmethod
+    def matches(cls, host):
+        """Class method that returns True if the provider serves repositories on the given remote host."""
+        return cls.name in (host or '').lower()
+
+
+    def default_api(self):
+        """Class method that returns the API base URL of the provider for the remote host."""
+        raise NotImplementedError
+
+
+    def request_urls(self, repository, token=None):
+        """Class method that returns a tuple of the repository API URL, latest release API URL and request headers for a namespace/name repository."""
+        raise NotImplementedError
+
+
+    def parse_repo(self, response):
+        """Class method that returns the repository data dictionary parsed from a repository response, or an empty dictionary."""
+        raise NotImplementedError
+
+
+    def parse_release(self, response):
+        """Class method that returns the latest release tag parsed from a release response, or None."""
+        raise NotImplementedError
+
+
+    def request(self, url, headers):
+        """Class Method to send an http/https request and validate that the response object is valid, once completed, the method will send the response back to the caller."""
+        # Define this function for log messages and function call identification.
+        log_msg = log_context(self._log_context)
+        self._log.info("{}: HTTP/HTTPS request processor called!", log_msg)
+        try:
+            # Send the HTTP/HTTPS request through the shared, pooled session.
+            self._log.info("{}: Sending API request to: {}", log_msg, url)
+            status_code, response = self._http.get_json(url, headers)
+            # Validate that the request was successful. Release responses may be lists, as not every provider has a latest release endpoint.
+            if status_code == 200 and isinstance(response, (dict, list)) and bool(response):
+                self._log.info("{}: API response status: {} passed validation check.", log_msg, status_code)
+                self._log.debug(lambda: json.dumps(response, indent=4, sort_keys=True))
+                return response
+            self._log.warning("{}: API response status: {} failed validation check. Sending failure response object back to the instance caller", log_msg, status_code)
+        except Exception as e:
+            self._log.warning("{}: An error occurred when attempting to send the API request!", log_msg)
+            self._log.warning("{}: Exception: {}", log_msg, str(e))
+        return {}
+
+
+#####################
+# Class Definition: #
+#####################
+class GithubProvider(GitProvider):
+    """MagicDoc Github Provider Class
+    Github and Github Enterprise repositories, through the REST API v3. Github Enterprise serves the API from https://<host>/api/v3.
+    Many repositories can also be resolved at once with a single GraphQL query.
+    """
+
+    name = 'github'
+    api_path = '/api/v3'
+
+    def default_api(self):
+        """Class method that returns the API base URL of the provider for the remote host."""
+        return GITHUB_API_URL if self.host == 'github.com' else "https://{}/api/v3".format(self.host)
+
+
+    def request_urls(self, repository, token=None):
+        """Class method that returns a tuple of the repository API URL, latest release API URL and request headers for a namespace/name repository."""
+        headers = {'Authorization': 'token {}'.format(token)} if token else {}
+        return "{}/repos/{}".format(self.api, repository), "{}/repos/{}/releases/latest".format(self.api, repository), headers
+
+
+    def parse_repo(self, response):
+        """Class method that returns the repository data dictionary parsed from a repository response, or an empty dictionary."""
+        if not isinstance(response, dict) or not response:
+            return {}
+        return {
+            'name': response.get('name'),
+            'full_name': response.get('full_name'),
+            'description': response.get('description'),
+            'owner': (response.get('owner') or {}).get('login'),
+            'owner_url': (response.get('owner') or {}).get('html_url')
+        }
+
+
+    def parse_release(self, response):
+        """Class method that returns the latest release tag parsed from a release response, or None."""
+        return response.get('tag_name') if isinstance(response, dict) else None
+
+
+    @property
+    def graphql_url(self):
+        """Getter for class property graphql_url method. This object property will return the Github GraphQL endpoint that belongs to the provider API URL."""
+        # Github Enterprise serves the REST API from /api/v3 and GraphQL from /api/graphql.
+        if self.api.endswith('/v3'):
+            return "{}/graphql".format(self.api[:-len('/v3')])
+        return "{}/graphql".format(self.api)
+
+
+    def graphql(self, repositories, token):
+        """Class method that sends a single Github GraphQL query for a list of namespace/name repositories, and returns a dictionary of repository -> repo and release data for those that were found."""
+        # Define this function for log messages and function call identification.
+        log_msg = log_context(self._log_context)
+        # Every repository is requested under an alias, r0, r1..., as GraphQL field names must be unique within a query.
+        query = "query {{ {} }}".format(" ".join(
+            "r{}: repository(owner: {}, name: {}) {{ {} }}".format(index, json.dumps(repository.split('/', 1)[0]), json.dumps(repository.split('/', 1)[1]), GITHUB_GRAPHQL_FIELDS)
+            for index, repository in enumerate(repositories)
+        ))
+        results = {}
+        try:
+            status_code, response = self._http.post_json(self.graphql_url, {'query': query}, {'Authorization': 'bearer {}'.format(token)})
+            if status_code != 200 or not isinstance(response, dict):
+                self._log.warning("{}: Github GraphQL request failed with status: {}", log_msg, status_code)
+                return results
+            # Repositories that could not be found are returned as null, alongside an entry in the errors list.
+            for error in response.get('errors') or []:
+                self._log.warning("{}: Github GraphQL error: {}", log_msg, error.get('message'))
+            data = response.get('data') or {}
+            for index, repository in enumerate(repositories):
+                node = data.get("r{}".format(index))
+                if not isinstance(node, dict):
+                    continue
+                results[repository] = {
+                    'repo': {
+                        'name': node.get('name'),
+                        'full_name': node.get('nameWithOwner'),
+                        'description': node.get('description'),
+                        'owner': (node.get('owner') or {}).get('login'),
+                        'owner_url': (node.get('owner') or {}).get('url')
+                    },
+                    'release': (node.get('latestRelease') or {}).get('tagName')
+                }
+            self._log.info("{}: Github GraphQL request resolved {} of {} repositories", log_msg, len(results), len(repositories))
+        except Exception as e:
+            self._log.warning("{}: Github GraphQL request failed!", log_msg)
+            self._log.warning("{}: Exception: {}", log_msg, str(e))
+        return results
+
+
+#####################
+# Class Definition: #
+#####################
+class GitlabProvider(GitProvider):
+    """MagicDoc Gitlab Provider Class
+    gitlab.com and self-hosted GitLab repositories, through the REST API v4. Projects are addressed by their url encoded path, so nested
+    subgroups work as is. GitLab has no latest release endpoint on older servers, so the newest entry of the release list is used.
+    """
+
+    name = 'gitlab'
+    api_path = '/api/v4'
+
+    def default_api(self):
+        """Class method that returns the API base URL of the provider for the remote host."""
+        return "https://{}/api/v4".format(self.host)
+
+
+    def request_urls(self, repository, token=None):
+        """Class method that returns a tuple of the repository API URL, latest release API URL and request headers for a namespace/name repository."""
+        headers = {'PRIVATE-TOKEN': token} if token else {}
+        project_url = "{}/projects/{}".format(self.api, quote(repository, safe=''))
+        # Releases are listed newest first.
+        return project_url, "{}/releases?per_page=1".format(project_url), headers
+
+
+    def parse_repo(self, response):
+        """Class method that returns the repository data dictionary parsed from a repository response, or an empty dictionary."""
+        if not isinstance(response, dict) or not response:
+            return {}
+        return {
+            'name': response.get('path') or response.get('name'),
+            'full_name': response.get('path_with_namespace'),
+            'description': response.get('description'),
+            'owner': (response.get('namespace') or {}).get('full_path'),
+            'owner_url': (response.get('namespace') or {}).get('web_url')
+        }
+
+
+    def parse_release(self, response):
+        """Class method that returns the latest release tag parsed from a release response, or None."""
+        if isinstance(response, list) and response and isinstance(response[0], dict):
+            return response[0].get('tag_name')
+        return None
+
+
+#####################
+# Class Definition: #
+#####################
+class BitbucketProvider(GitProvider):
+    """MagicDoc Bitbucket Provider Class
+    bitbucket.org repositories, through the REST API 2.0. Bitbucket has no releases, so the most recently created tag is reported as the latest release.
+    """
+
+    name = 'bitbucket'
+
+    @classmethod
+    def matches(cls, host):
+        """Class method that returns True if the provider serves repositories on the given remote host. Self-hosted Bitbucket Server has a different API and is not supported."""
+        return (host or '').lower() == 'bitbucket.org'
+
+
+    def default_api(self):
+        """Class method that returns the API base URL of the provider for the remote host."""
+        return 'https://api.bitbucket.org/2.0'
+
+
+    def request_urls(self, repository, token=None):
+        """Class method that returns a tuple of the repository API URL, latest release API URL and request headers for a namespace/name repository."""
+        headers = {'Authorization': 'Bearer {}'.format(token)} if token else {}
+        repository_url = "{}/repositories/{}".format(self.api, repository)
+        return repository_url, "{}/refs/tags?sort=-target.date&pagelen=1".format(repository_url), headers
+
+
+    def parse_repo(self, response):
+        """Class method that returns the repository data dictionary parsed from a repository response, or an empty dictionary."""
+        if not isinstance(response, dict) or not response:
+            return {}
+        owner = response.get('owner') or {}
+        return {
+            'name': response.get('slug') or response.get('name'),
+            'full_name': response.get('full_name'),
+            'description': response.get('description'),
+            'owner': owner.get('username') or owner.get('nickname') or owner.get('display_name'),
+            'owner_url': ((owner.get('links') or {}).get('html') or {}).get('href')
+        }
+
+
+    def parse_release(self, response):
+        """Class method that returns the latest release tag parsed from a release response, or None."""
+        values = response.get('values') if isinstance(response, dict) else None
+        if values and isinstance(values[0], dict):
+            return values[0].get('name')
+        return None
+
+
+#####################
+# Class Definition: #
+#####################
+class LocalProvider(GitProvider):
+    """MagicDoc Local Provider Class
+    Stub provider that serves repository data from json files instead of a provider API, for tests and offline runs. The data of the repository
+    namespace/name on a host is read from <directory>/<host>/<namespace>/<name>.json, which holds the repository data dictionary under "repo"
+    and the latest release tag under "release".
+    """
+
+    name = 'local'
+
+    def default_api(self):
+        """Class method that returns the API base URL of the provider for the remote host."""
+        return ''
+
+
+    def request_urls(self, repository, token=None):
+        """Class method that returns a tuple of the repository and release file paths, which are the same file, and empty request headers."""
+        path = os.path.join(self.api, self.host, *"{}.json".format(repository).split('/'))
+        return path, path, {}
+
+
+    def request(self, url, headers):
+        """Class method that returns the decoded json file at the provided path, or an empty dictionary if it can not be read."""
+        # Define this function for log messages and function call identification.
+        log_msg = log_context(self._log_context)
+        try:
+            with open(url) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            self._log.warning("{}: Unable to read provider stub file {}: {}", log_msg, url, str(e))
+            return {}
+
+
+    def parse_repo(self, response):
+        """Class method that returns the repository data dictionary read from a stub file, or an empty dictionary."""
+        return dict(response.get('repo') or {}) if isinstance(response, dict) else {}
+
+
+    def parse_release(self, response):
+        """Class method that returns the latest release tag read from a stub file, or None."""
+        return response.get('release') if isinstance(response, dict) else None
@@ -0,0 +1,182 @@
+##############################################################################
+# CloudMage : MagicDoc Terraform Graph Model Class
+#=============================================================================
+# CloudMage MagicDoc Automatic Documentation Generator CLI Utility/Library
+#   - Terraform Dependency Graph Model Class
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/28/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Base Python Modules
+import sys
+from array import array
+
+# Import MagicDoc Classes/Modules
+from magicdoc.classes.Log import log_context
+from magicdoc.modules.graph import ParseDot
+
+
+#####################
+# Class Definition: #
+#####################
+class GraphModel(object):
+    """MagicDoc Terraform Graph Model Class
+    This class holds a terraform dependency graph parsed once from its DOT definition, so that it can be queried without parsing the DOT text again.
+    Node addresses are interned and numbered with integer IDs from 0, and the edges are stored as compact arrays, one offset and one target array per
+    direction, in the layout of a compressed sparse row matrix. An edge points from a node to a node that it depends on, as in `terraform graph`.
+    Fan-in, fan-out, topological order and the longest dependency chain are all computed in time linear in the size of the graph.
+    """
+
+    def __init__(self, log, dot):
+        '''GraphModel Class Constructor'''
+
+        # Set class instantiation variables
+        self._log = log
+        self._log_context = "CLS->GraphModel"
+
+        # Set properties to hold the parsed graph.
+        # List of node ID -> address, dictionary of address -> node ID and list of node ID -> DOT shape.
+        self.names = []
+        self.ids = {}
+        self.shapes = []
+        # Dependencies of node n are targets[offsets[n]:offsets[n + 1]], and its dependents are sources[in_offsets[n]:in_offsets[n + 1]].
+        self.offsets = array('l', [0])
+        self.targets = array('l')
+        self.in_offsets = array('l', [0])
+        self.sources = array('l')
+
+        # Parse the DOT definition into the model.
+        self.load(dot)
+
+
+    def load(self, dot):
+        """Class method that parses a DOT definition, interns its node addresses, and builds the forward and reverse adjacency arrays."""
+        # Define this function for logging
+        log_msg = log_context(self._log_context)
+        nodes, edges = ParseDot(dot)
+        for node, shape in sorted(nodes.items()):
+            name = sys.intern(self.address(node))
+            if name not in self.ids:
+                self.ids[name] = len(self.names)
+                self.names.append(name)
+                self.shapes.append(shape)
+        edge_ids = sorted(set((self.ids[self.address(source)], self.ids[self.address(target)]) for source, target in edges))
+        self.offsets, self.targets = self.adjacency(edge_ids, 0, 1)
+        self.in_offsets, self.sources = self.adjacency(edge_ids, 1, 0)
+        self._log.info("{}: Graph model contains {} nodes and {} edges", log_msg, len(self.names), len(self.targets))
+
+
+    @staticmethod
+    def address(node):
+        """Class method that returns the address of a DOT node ID, without the [root] module prefix that terraform graph adds."""
+        return node[len('[root] '):] if node.startswith('[root] ') else node
+
+
+    def adjacency(self, edge_ids, key, value):
+        """Class method that builds one direction of the adjacency arrays with a counting sort of the edges, returning the offset and neighbour arrays."""
+        offsets = array('l', [0]) * (len(self.names) + 1)
+        for edge in edge_ids:
+            offsets[edge[key] + 1] += 1
+        for node in range(len(self.names)):
+            offsets[node + 1] += offsets[node]
+        neighbours = array('l', [0]) * len(edge_ids)
+        position = array('l', offsets)
+        for edge in edge_ids:
+            neighbours[position[edge[key]]] = edge[value]
+            position[edge[key]] += 1
+        return offsets, neighbours
+
+
+    ############################################
+    # Graph Queries:                           #
+    ############################################
+    @property
+    def node_count(self):
+        """Getter for class property node_count method. This object property will return the number of nodes in the graph."""
+        return len(self.names)
+
+
+    @property
+    def edge_count(self):
+        """Getter for class property edge_count method. This object property will return the number of edges in the graph."""
+        return len(self.targets)
+
+
+    def dependencies(self, node):
+        """Class method that returns the IDs of the nodes that a node, given by ID or address, depends on."""
+        node = self.ids[node] if isinstance(node, str) else node
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+
+    def dependents(self, node):
+        """Class method that returns the IDs of the nodes that depend on a node, given by ID or address."""
+        node = self.ids[node] if isinstance(node, str) else node
+        return self.sources[self.in_offsets[node]:self.in_offsets[node + 1]]
+
+
+    def fan_out(self, node=None):
+        """Class method that returns the number of dependencies of a node given by ID or address, or a list of the fan-out of every node by ID."""
+        if node is None:
+            return [self.offsets[n + 1] - self.offsets[n] for n in range(len(self.names))]
+        node = self.ids[node] if isinstance(node, str) else node
+        return self.offsets[node + 1] - self.offsets[node]
+
+
+    def fan_in(self, node=None):
+        """Class method that returns the number of dependents of a node given by ID or address, or a list of the fan-in of every node by ID."""
+        if node is None:
+            return [self.in_offsets[n + 1] - self.in_offsets[n] for n in range(len(self.names))]
+        node = self.ids[node] if isinstance(node, str) else node
+        return self.in_offsets[node + 1] - self.in_offsets[node]
+
+
+    def topological_order(self):
+        """
+        Class method that returns the node IDs in dependency order, every node after all of the nodes that it depends on, which is the order that terraform
+        can create them in. Nodes that are part of a dependency cycle, or depend on one, can not be ordered and are left out with a warning.
+        """
+        # Define this function for logging
+        log_msg = log_context(self._log_context)
+        pending = array('l', self.fan_out())
+        order = [node for node in range(len(self.names)) if pending[node] == 0]
+        # Kahn's algorithm over the reverse edges, a node is ready once every one of its dependencies has been ordered.
+        for node in order:
+            for dependent in self.dependents(node):
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    order.append(dependent)
+        if len(order) < len(self.names):
+            self._log.warning("{}: {} graph nodes are part of, or depend on, a dependency cycle and were left out of the topological order", log_msg, len(self.names) - len(order))
+        return order
+
+
+    def longest_chain(self):
+        """
+        Class method that returns the addresses of the longest dependency chain in the graph, starting with the node that has the deepest dependencies
+        and ending with a node that has none. Nodes that can not be ordered because of a dependency cycle are not considered.
+        """
+        depth = array('l', [0]) * len(self.names)
+        step = array('l', [-1]) * len(self.names)
+        deepest = None
+        for node in self.topological_order():
+            for dependency in self.dependencies(node):
+                if depth[dependency] + 1 > depth[node]:
+                    depth[node] = depth[dependency] + 1
+                    step[node] = dependency
+            if deepest is None or depth[node] > depth[deepest]:
+                deepest = node
+        chain = []
+        while deepest is not None and deepest != -1:
+            chain.append(self.names[deepest])
+            deepest = step[deepest]
+        return chain
+
+
+    def ranked(self, counts, limit=10):
+        """Class method that returns a list of (address, count) tuples of the nodes with the highest of a list of per node counts, such as fan_in()."""
+        nodes = sorted(range(len(self.names)), key=lambda node: (-counts[node], self.names[node]))
+        return [(self.names[node], counts[node]) for node in nodes[:limit]]
@@ -0,0 +1,259 @@
+##############################################################################
+# CloudMage : MagicDoc HTTP Client Class
+#=============================================================================
+# CloudMage MagicDoc Automatic Documentation Generator CLI Utility/Library
+#   - Pooled HTTP/HTTPS Client Class
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/28/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Pip installed modules (requests) are imported the first time a session is requested, so that importing this class stays cheap.
+
+# Import Base Python Modules
+import json, time, random, threading
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+# Import MagicDoc Classes/Modules
+from magicdoc.classes.Log import log_context
+from magicdoc.classes.CacheStore import CacheStore
+
+# Number of pooled connections kept open per host.
+DEFAULT_POOL_SIZE = 8
+# Response status codes that are stored in the response cache. A missing release is as worth remembering as a found one.
+CACHEABLE_STATUS_CODES = (200, 404)
+# Response status codes that are retried, rate limiting and transient server errors.
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# Default connect and read timeouts in seconds, number of retries, and total seconds that a run may spend on network requests.
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 10.0
+DEFAULT_RETRIES = 2
+DEFAULT_NETWORK_BUDGET = 30.0
+# Exponential retry backoff, in seconds, before jitter is applied.
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+# Rate limit headers with the requests left in the window and the epoch second it resets, as sent by Github and by GitLab.
+RATE_LIMIT_REMAINING_HEADERS = ('X-RateLimit-Remaining', 'RateLimit-Remaining')
+RATE_LIMIT_RESET_HEADERS = ('X-RateLimit-Reset', 'RateLimit-Reset')
+# Seconds waited past the reported reset, as the reset is rounded to whole seconds and the server clock may run ahead.
+RATE_LIMIT_RESET_MARGIN = 1.0
+# Longest number of seconds waited for a rate limit to reset, also when the network budget is unlimited. Requests to a host whose rate limit resets
+# later are not retried, and callers fall back to the data they use when the provider is unavailable.
+RATE_LIMIT_MAX_WAIT = 60.0
+
+
+#####################
+# Class Definition: #
+#####################
+class HttpClient(object):
+    """MagicDoc HTTP Client Class
+    This class sends http/https requests through a single requests.Session that is shared by every instance in the process, so that
+    repeated requests to the same host reuse pooled keep-alive connections instead of paying for a new TCP and TLS handshake each time.
+    The session is safe to share between the threads that the git parser uses to send requests concurrently.
+
+    If a CacheStore is provided, json responses are cached by URL along with their ETag and Last-Modified headers. Within ttl seconds of being
+    fetched a cached response is returned without sending a request at all, after that it is revalidated with a conditional request,
+    and a 304 Not Modified response, which does not count against the Github rate limit, serves the cached body.
+
+    Every request has connect and read timeouts, and 429 and 5xx responses or connection errors are retried with jittered exponential backoff,
+    honouring any Retry-After header. All requests made through one instance share a network budget, once it is spent requests are no longer
+    sent and callers fall back to the data they use when the provider is unavailable.
+
+    The rate limit headers of the latest response from each host are kept per host and read with rate_limit(url), for callers that schedule many requests
+    to slow down before the limit of that host runs out, so that a host running low on requests does not slow down requests to the others.
+    A 403 response with no requests remaining is how Github reports an exhausted rate limit, it is retried once the limit resets, within the network budget,
+    if that is no more than RATE_LIMIT_MAX_WAIT seconds away.
+    """
+
+    # Process wide session, created on first use, and the lock that makes sure threads requesting it at the same time create only one.
+    _session = None
+    _session_lock = threading.Lock()
+
+    def __init__(self, log, pool_size=DEFAULT_POOL_SIZE, cache=None, ttl=0, connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT, retries=DEFAULT_RETRIES, budget=DEFAULT_NETWORK_BUDGET):
+        '''HttpClient Class Constructor'''
+
+        # Set class instantiation variables
+        self._log = log
+        self._pool_size = pool_size
+        self._cache = cache
+        self._ttl = ttl
+        self._connect_timeout = connect_timeout
+        self._read_timeout = read_timeout
+        self._retries = retries
+        self._budget = budget
+        # The budget starts with the first request that is sent.
+        self._deadline = None
+        # Dictionary of host -> tuple of the requests remaining and the epoch second the rate limit resets, set once a response from the host reports them.
+        self.rate_limits = {}
+        self._log_context = "CLS->HttpClient"
+
+
+    @property
+    def session(self):
+        """Getter for class property session method. This object property will return the shared requests.Session, creating it on first request."""
+        if HttpClient._session is None:
+            with HttpClient._session_lock:
+                # Another thread may have created the session while this one waited for the lock.
+                if HttpClient._session is None:
+                    log_msg = log_context(self._log_context)
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    self._log.debug("{}: Creating shared HTTP session with a connection pool size of {}", log_msg, self._pool_size)
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self._pool_size, pool_maxsize=self._pool_size)
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    session.headers.update({'User-Agent': 'magicdoc'})
+                    HttpClient._session = session
+        return HttpClient._session
+
+
+    def get_json(self, url, headers=None):
+        """Class method that sends a GET request and returns a tuple of the response status code and the decoded json body, or None if the body is not json.
+        Responses are served from, and revalidated against, the response cache when one was provided."""
+        # Define this function for logging
+        log_msg = log_context(self._log_context)
+        headers = dict(headers or {})
+        cached = None
+        if self._cache is not None:
+            # Authenticated responses may differ from anonymous ones, so the request headers, which carry the credentials of every provider, are part of the (hashed) cache key.
+            cache_key = CacheStore.key('http', url, json.dumps(sorted(headers.items())))
+            cached = self._cache.get_json(cache_key)
+        if cached is not None:
+            if time.time() - cached.get('fetched', 0) < self._ttl:
+                self._log.info("{}: Serving cached response for: {}", log_msg, url)
+                return cached.get('status'), cached.get('body')
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached.get('etag')
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached.get('last_modified')
+        r = self.send(url, headers)
+        if r is None:
+            return None, None
+        if r.status_code == 304 and cached is not None:
+            self._log.info("{}: Cached response for {} has not been modified", log_msg, url)
+            cached.update(fetched=time.time())
+            self._cache.put_json(cache_key, cached)
+            return cached.get('status'), cached.get('body')
+        try:
+            body = json.loads(r.text)
+        except ValueError:
+            return r.status_code, None
+        if self._cache is not None and r.status_code in CACHEABLE_STATUS_CODES:
+            self._cache.put_json(cache_key, {
+                'url': url,
+                'status': r.status_code,
+                'body': body,
+                'etag': r.headers.get('ETag'),
+                'last_modified': r.headers.get('Last-Modified'),
+                'fetched': time.time()
+            })
+        return r.status_code, body
+
+
+    def post_json(self, url, body, headers=None):
+        """Class method that sends a json POST request and returns a tuple of the response status code and the decoded json body, or None if the body is not json. POST responses are never cached."""
+        r = self.send(url, headers, method='POST', body=body)
+        if r is None:
+            return None, None
+        try:
+            return r.status_code, json.loads(r.text)
+        except ValueError:
+            return r.status_code, None
+
+
+    def remaining(self):
+        """Class method that returns the number of seconds left in the network budget, or None if the budget is unlimited."""
+        if not self._budget:
+            return None
+        if self._deadline is None:
+            self._deadline = time.monotonic() + self._budget
+        return self._deadline - time.monotonic()
+
+
+    def retry_delay(self, attempt, retry_after=None):
+        """Class method that returns the number of seconds to wait before the next attempt. A Retry-After header, in seconds or as an HTTP date, takes precedence over the jittered backoff."""
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                try:
+                    return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+                except (TypeError, ValueError):
+                    pass
+        return min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)) * random.uniform(0.5, 1.5)
+
+
+    def send(self, url, headers=None, method='GET', body=None):
+        """Class method that sends a request with timeouts and retries, and returns the response, or None if no response was received within the retries and the network budget.
+        A body is sent json encoded."""
+        # Define this function for logging
+        log_msg = log_context(self._log_context)
+        import requests
+        response = None
+        for attempt in range(self._retries + 1):
+            remaining = self.remaining()
+            if remaining is not None and remaining <= 0:
+                self._log.warning("{}: Network budget of {} seconds has been spent, request to {} was not sent.", log_msg, self._budget, url)
+                return response
+            timeout = (self._connect_timeout, self._read_timeout) if remaining is None else (min(self._connect_timeout, remaining), min(self._read_timeout, remaining))
+            retry_after = None
+            try:
+                self._log.info("{}: Sending {} request to: {}", log_msg, method, url)
+                response = self.session.request(method, url, headers=headers, json=body, timeout=timeout)
+                self._log.info("{}: Response status: {}", log_msg, response.status_code)
+                rate_limited = self.update_rate_limit(url, response.headers) and response.status_code == 403
+                if response.status_code not in RETRY_STATUS_CODES and not rate_limited:
+                    return response
+                retry_after = response.headers.get('Retry-After')
+                if rate_limited and not retry_after:
+                    reset_wait = max(0.0, self.rate_limit(url)[1] - time.time()) + RATE_LIMIT_RESET_MARGIN
+                    if reset_wait > RATE_LIMIT_MAX_WAIT:
+                        self._log.warning("{}: Rate limit for {} resets in {:.0f} seconds, longer than the {:.0f} seconds that a request waits for it, giving up.", log_msg, url, reset_wait, RATE_LIMIT_MAX_WAIT)
+                        return response
+                    retry_after = str(reset_wait)
+            except requests.RequestException as e:
+                self._log.warning("{}: Request to {} failed: {}", log_msg, url, str(e))
+            if attempt == self._retries:
+                break
+            delay = self.retry_delay(attempt, retry_after)
+            remaining = self.remaining()
+            if remaining is not None and delay >= remaining:
+                self._log.warning("{}: Retrying {} in {:.1f} seconds would exceed the network budget, giving up.", log_msg, url, delay)
+                break
+            self._log.info("{}: Retrying {} in {:.1f} seconds, attempt {} of {}", log_msg, url, delay, attempt + 2, self._retries + 1)
+            time.sleep(delay)
+        return response
+
+
+    def rate_limit(self, url):
+        """Class method that returns a tuple of the requests remaining and the epoch second the rate limit resets for the host of a URL, or (None, None) if no response from the host has reported them."""
+        return self.rate_limits.get(urlparse(url).netloc, (None, None))
+
+
+    def update_rate_limit(self, url, headers):
+        """Class method that records the rate limit headers of a response against the host of its URL, and returns True if the response reports that no requests are remaining."""
+        # Define this function for logging
+        log_msg = log_context(self._log_context)
+        try:
+            remaining = int(next(headers.get(name) for name in RATE_LIMIT_REMAINING_HEADERS if headers.get(name) is not None))
+            reset = float(next((headers.get(name) for name in RATE_LIMIT_RESET_HEADERS if headers.get(name) is not None), time.time()))
+        except (StopIteration, TypeError, ValueError):
+            return False
+        host = urlparse(url).netloc
+        self.rate_limits[host] = (remaining, reset)
+        self._log.debug("{}: Rate limit for {}: {} requests remaining, resets in {:.0f} seconds", log_msg, host, remaining, reset - time.time())
+        return remaining <= 0
+
+
+    def evict(self):
+        """Class method that logs the response cache usage and trims the response cache to its size limit."""
+        # Define this function for logging
+        log_msg = log_context(self._log_context)
+        if self._cache is not None:
+            self._log.info("{}: Response cache: {}", log_msg, self._cache.stats())
+            self._cache.evict()
@@ -17,6 +17,25 @@ import click
 # Import Base Python Modules
 import sys
 
+# Cache of constructed log context prefixes keyed by (context, code object).
+_LOG_CONTEXTS = {}
+
+
+def function_name():
+    """Return the name of the calling function. Only the caller's frame is read, so unlike inspect.stack() no stack or source context is materialized."""
+    return sys._getframe(1).f_code.co_name
+
+
+def log_context(arg_context):
+    """Return the `context.function` log prefix for the calling function, for example `CLS->TFMagicDoc.variables`.
+    The prefix is built once per calling function and then served from a cache keyed by the function's code object."""
+    code = sys._getframe(1).f_code
+    try:
+        return _LOG_CONTEXTS[(arg_context, code)]
+    except KeyError:
+        return _LOG_CONTEXTS.setdefault((arg_context, code), "{}.{}".format(arg_context, code.co_name))
+
+
 class Log():
     """
     CLI Log class to allow easy logging throughout a click CLI application taking advantage of clicks context passing.
@@ -98,11 +117,11 @@ class Log():
         click.secho(arg_msg, file=sys.stderr, fg='yellow')
         click.secho("{}".format("=" * this_msg_length), fg='yellow')
         # Print environment metadata info
-        self.info("{}: Invoking command: magicdoc tf {}".format(arg_env, arg_cmd))
-        self.info("{}: Instantiating `magicdoc tf {}` environment...".format(arg_env, arg_cmd))
+        self.info("{}: Invoking command: magicdoc tf {}", arg_env, arg_cmd)
+        self.info("{}: Instantiating `magicdoc tf {}` environment...", arg_env, arg_cmd)
         # Print command argument info
         if arg_args is None:
-            self.info("{}: Command Args: None".format(arg_env, arg_cmd))
+            self.info("{}: Command Args: None", arg_env, arg_cmd)
         else:
             if isinstance(arg_args, dict) and bool(arg_args):
                 for k, v in arg_args.items():
@@ -125,30 +144,45 @@ class Log():
             click.echo()
 
 
-    def debug(self, arg_msg):
-        """Print a debug message to the shell"""
+    def enabled(self, arg_level):
+        """Log method that will return True if messages of the given level would currently be printed"""
+        if arg_level.lower() == "error":
+            return self._error
+        return self.verbose and getattr(self, "_{}".format(arg_level.lower()))
+
+
+    @staticmethod
+    def render(arg_msg, arg_args=()):
+        """Log method that will build the final message text. A callable message is called, and format args are applied to the message with str.format."""
+        if callable(arg_msg):
+            arg_msg = arg_msg()
+        return arg_msg.format(*arg_args) if arg_args else arg_msg
+
+
+    def debug(self, arg_msg, *arg_args):
+        """Print a debug message to the shell. The message is only formatted with arg_args, or called if callable, when debug messages are enabled"""
         this_msg_offset = 3
         if self.verbose and self._debug:
-            click.secho("{}:{}{}".format("DEBUG", " " * this_msg_offset, arg_msg), file=sys.stderr, fg='magenta')
+            click.secho("{}:{}{}".format("DEBUG", " " * this_msg_offset, self.render(arg_msg, arg_args)), file=sys.stderr, fg='magenta')
 
 
-    def info(self, arg_msg):
-        """Print a info message to the shell"""
+    def info(self, arg_msg, *arg_args):
+        """Print a info message to the shell. The message is only formatted with arg_args, or called if callable, when info messages are enabled"""
         this_msg_offset = 4
         if self.verbose and self._info:
-            click.secho("{}:{}{}".format("INFO", " " * this_msg_offset, arg_msg), file=sys.stderr, fg='cyan')
+            click.secho("{}:{}{}".format("INFO", " " * this_msg_offset, self.render(arg_msg, arg_args)), file=sys.stderr, fg='cyan')
 
 
-    def warning(self, arg_msg):
-        """Print a warning message to the shell"""
+    def warning(self, arg_msg, *arg_args):
+        """Print a warning message to the shell. The message is only formatted with arg_args, or called if callable, when warning messages are enabled"""
         this_msg_offset = 1
         if self.verbose and self._warning:
-            click.secho("{}:{}{}".format("WARNING", " " * this_msg_offset, arg_msg), file=sys.stderr, fg='bright_red')
+            click.secho("{}:{}{}".format("WARNING", " " * this_msg_offset, self.render(arg_msg, arg_args)), file=sys.stderr, fg='bright_red')
 
 
-    def error(self, arg_msg):
+    def error(self, arg_msg, *arg_args):
         """Print a error message to the shell"""
         this_msg_offset = 3
         click.echo()
         click.secho("ATTENTION:", fg='red')
-        click.secho("{}:{}{}".format("ERROR", " " * this_msg_offset, arg_msg), file=sys.stderr, fg='red')
+        click.secho("{}:{}{}".format("ERROR", " " * this_msg_offset, self.render(arg_msg, arg_args)), file=sys.stderr, fg='red')
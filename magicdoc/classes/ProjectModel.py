@@ -0,0 +1,113 @@
+##############################################################################
+# CloudMage : MagicDoc Terraform Project Model Class
+#=============================================================================
+# CloudMage MagicDoc Automatic Documentation Generator CLI Utility/Library
+#   - Terraform Project Model Class
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/28/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Base Python Modules
+import os
+
+# Import MagicDoc Classes/Modules
+from magicdoc.classes.Log import log_context
+
+
+#####################
+# Class Definition: #
+#####################
+class ProjectModel(object):
+    """MagicDoc Terraform Project Model Class
+    This class holds the parsed content of every terraform file in a project, and merges the top level blocks of those files
+    into a single model of the project variables, outputs, locals, providers, module calls, resources and data sources.
+    Variables and outputs are kept per module, those of the root module by name and those of nested modules by module directory and name.
+    The model is built from documents that have already been parsed, so every file is read and parsed exactly once per run.
+    """
+
+    def __init__(self, log, documents):
+        '''ProjectModel Class Constructor'''
+
+        # Set class instantiation variables
+        self._log = log
+        self._log_context = "CLS->ProjectModel"
+        # Ordered dictionary of relative file path -> parsed hcl document.
+        self.documents = documents
+
+        # Set properties to hold the merged project blocks.
+        # Variables and outputs of the root module, the files directly in the project directory, by name.
+        self.variables = {}
+        self.outputs = {}
+        # Variables and outputs of modules in project sub-directories, by (module directory, name), so that they never replace a root module declaration.
+        self.module_variables = {}
+        self.module_outputs = {}
+        self.locals = {}
+        self.providers = {}
+        self.modules = {}
+        self.resources = {}
+        self.data = {}
+
+        # Merge every parsed document into the model.
+        self.merge()
+
+
+    def merge(self):
+        """Class method that merges the top level blocks of every parsed document into the project model. Each named block records the file it was declared in."""
+        # Define this function for logging
+        log_msg = log_context(self._log_context)
+        self._log.info("{}: Merging {} parsed terraform documents".format(log_msg, len(self.documents)))
+        for tf_file, document in self.documents.items():
+            if not isinstance(document, dict):
+                continue
+            module_dir = os.path.dirname(tf_file)
+            for block in self.blocks(document.get('variable')):
+                for k, v in block.items():
+                    if module_dir == '':
+                        self.variables[k] = dict(v or {}, file=tf_file)
+                    else:
+                        self.module_variables[(module_dir, k)] = dict(v or {}, file=tf_file)
+            for block in self.blocks(document.get('output')):
+                for k, v in block.items():
+                    if module_dir == '':
+                        self.outputs[k] = dict(v or {}, file=tf_file)
+                    else:
+                        self.module_outputs[(module_dir, k)] = dict(v or {}, file=tf_file)
+            for block in self.blocks(document.get('locals')):
+                self.locals.update(block)
+            for block in self.blocks(document.get('provider')):
+                for k, v in block.items():
+                    self.providers.setdefault(k, []).extend(dict(item, file=tf_file) for item in self.blocks(v))
+            for block in self.blocks(document.get('module')):
+                for k, v in block.items():
+                    self.modules[k] = dict(v or {}, file=tf_file)
+            for block in self.blocks(document.get('resource')):
+                for resource_type, resources in block.items():
+                    for k, v in resources.items():
+                        self.resources.setdefault(resource_type, {})[k] = dict(v or {}, file=tf_file)
+            for block in self.blocks(document.get('data')):
+                for data_type, sources in block.items():
+                    for k, v in sources.items():
+                        self.data.setdefault(data_type, {})[k] = dict(v or {}, file=tf_file)
+        self._log.debug("{}: Model contains {} variables, {} outputs, {} locals, {} providers, {} module calls, {} resources and {} data sources".format(
+            log_msg, len(self.variables), len(self.outputs), len(self.locals), len(self.providers), len(self.modules),
+            sum(len(v) for v in self.resources.values()), sum(len(v) for v in self.data.values())
+        ))
+
+
+    @staticmethod
+    def blocks(value):
+        """Class method that normalises a parsed block value into a list of dictionaries, as repeated blocks may be parsed as a list."""
+        if isinstance(value, dict):
+            return [value]
+        elif isinstance(value, list):
+            return [item for item in value if isinstance(item, dict)]
+        return []
+
+
+    def subset(self, include):
+        """Class method that returns a new ProjectModel built from only the documents whose file path passes the provided include function."""
+        return ProjectModel(self._log, {k: v for k, v in self.documents.items() if include(k)})
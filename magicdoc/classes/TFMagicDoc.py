@@ -11,13 +11,24 @@
 ###############
 # Imports:    #
 ###############
-# Import Pip Installed Modules:
-from python_terraform import *
-import hcl, yaml, requests
-from graphviz import Source
+# Pip installed modules (hcl, yaml) are imported by the methods that use them, so that
+# importing this class stays cheap for commands that never parse, load a config or run terraform.
 
 # Import Base Python Modules
-import os, sys, shutil, json, inspect
+import os, sys, shutil, json, tempfile
+
+# Import MagicDoc Classes/Modules
+from magicdoc.classes.Log import log_context
+from magicdoc.classes.CacheStore import CacheStore, DEFAULT_CACHE_DIR
+from magicdoc.classes.ProjectModel import ProjectModel
+from magicdoc.modules.parse import ParseFiles
+from magicdoc.modules.scan import ScanDir, LoadManifest, SaveManifest, DEFAULT_PRUNE_DIRS, MANIFEST_PATH
+# The GraphModel class and the graph and process modules are imported by the methods that use them, so that the graph and subprocess
+# machinery is only loaded by commands that generate a graph or run terraform.
+
+# Define Global Variables
+# Seconds that each terraform command may run for, unless a terraform timeout is set. init downloads providers and modules, so it gets the longest.
+TERRAFORM_TIMEOUTS = {'init': 600, 'graph': 120, 'version': 30}
 
 #####################
 # Class Definition: #
@@ -26,7 +37,7 @@ class TFMagicDoc(object):
     """MagicDoc Terraform Documentation Class"""
 
 
-    def __init__(self, log, path, exclude_dir=None, config=None, no_recursion=False):
+    def __init__(self, log, path, exclude_dir=None, config=None, no_recursion=False, prune_dirs=None, no_cache=False, cache_dir=None, jobs=1):
         '''TFMagicDoc Class Constructor'''
 
         # Set class instantiation variables
@@ -35,32 +46,47 @@ class TFMagicDoc(object):
         self._exclude_dir = exclude_dir
         self._config_file = config
         self._config = {}
+        self._config_loaded = False
         self._no_recursion = no_recursion
+        self._prune_dirs = tuple(DEFAULT_PRUNE_DIRS) + tuple(prune_dirs or ())
+        self._no_cache = no_cache
+        self._cache_dir = cache_dir if cache_dir is not None else DEFAULT_CACHE_DIR
+        self._jobs = jobs
         self._log_context = "CLS->TFMagicDoc"
 
         # Set properties to hold result sets.
         self._files = {}
+        self._files_skipped = 0
+        self._model = None
+        self._include_examples = False
+        # Variables and outputs are memoized per include_examples setting, and cleared whenever the file set changes.
         self._variables = {}
-        self._outputs = []
+        self._outputs = {}
         self._graph = None
+        self._graph_generated = False
+        # The first of the graph module GRAPH_ENGINES.
+        self._graph_engine = 'native'
+        # None keeps the graph module GRAPH_MAX_NODES default.
+        self._graph_max_nodes = None
+        self._graph_model = None
         self._graph_image = None
+        self._terraform_version = None
 
         # Set dependency binary checks
         self._terraform_binary = shutil.which('terraform')
         self._graphviz_dot_binary = shutil.which('dot')
 
         # Set properties to track terraform command execution and object state.
-        # Terraform Object
-        self._terraform = None
-        # Terraform Init State. If this instance created the init, then this will be set, otherwise it will be left to none.
-        self._terraform_init_executed = None
-
-        # Set object files property setter by calling itself and passing a value.
-        # Load Config if available
-        if self._config_file is not None and self._config_file.endswith(('.yaml', '.yml')) and os.path.exists(os.path.join(self._path, self._config_file)):
-            self.config = True
-            self.update_variables()
+        # Seconds that every terraform command may run for, None uses the TERRAFORM_TIMEOUTS of each command.
+        self._terraform_timeout = None
+        # Local provider mirror directory that sandbox inits install providers from, None installs providers from their registries.
+        self._provider_mirror = None
+        # Sandbox copy of the project that terraform commands run in, and the environment variables that point terraform at its data directory and plugin cache.
+        self._terraform_workdir = None
+        self._terraform_env = {}
+
         # Execute Files Setter, this object is needed for all other setters, and so should be ran at the time of instance instantiation.
+        # The config, variables, outputs and graph properties are computed lazily the first time that they are requested.
         self.files = True
 
 
@@ -71,9 +97,10 @@ class TFMagicDoc(object):
     def config(self):
         """Getter for class property config method. This object property will return the project config.yaml file from the workdir if found. This config holds additional details used in building the documentation."""
         # Define this function for logging
-        this = inspect.stack()[0][3]
-        log_msg = "{}.{}".format(self._log_context, this)
-        self._log.info("{}: Property requested".format(log_msg))
+        log_msg = log_context(self._log_context)
+        self._log.info("{}: Property requested", log_msg)
+        if not self._config_loaded:
+            self.config = True
         if self._config is not None and isinstance(self._config, dict) and bool(self._config):
             return self._config
         else:
@@ -90,24 +117,25 @@ class TFMagicDoc(object):
     def config(self, init=False):
         """Setter for class property config method that will capture the provided config file, parse it, and construct the config dictionary object."""
         # Define this function for logging
-        this = inspect.stack()[0][3]
-        log_msg = "{}.{}".format(self._log_context, this)
+        log_msg = log_context(self._log_context)
+        import yaml
+        self._config_loaded = True
         if self._config_file is not None and init:
             # Instantiate the results object to hold the parsed config file.
-            self._log.info("{}: {}.config load requested".format(log_msg, log_msg))
-            self._log.info("{}: Config file: {}".format(log_msg, str(os.path.join(self._path, self._config_file))))
+            self._log.info("{}: {}.config load requested", log_msg, log_msg)
+            self._log.info("{}: Config file: {}", log_msg, str(os.path.join(self._path, self._config_file)))
             try:
                 if os.path.exists(os.path.join(self._path, self._config_file)):
-                    self._log.debug("{}: Config file: {} found in project directory! Attempting to load:".format(log_msg, self._config_file))
+                    self._log.debug("{}: Config file: {} found in project directory! Attempting to load:", log_msg, self._config_file)
                     if self._config_file.endswith(('.yaml', '.yml')):
-                        self._log.debug("{}: Config file {} passed file type check. File extention match: [*.yaml, *.yml], Processing file".format(log_msg, self._config_file))
+                        self._log.debug("{}: Config file {} passed file type check. File extention match: [*.yaml, *.yml], Processing file", log_msg, self._config_file)
                         self._log.write("Loading terraform project config file: {}".format(os.path.join(self._path, self._config_file)))
                         # Attempt to open the file, err on exception
                         try:
                             with open(os.path.join(self._path, self._config_file)) as f:
                                 self._config = yaml.load(f, Loader=yaml.FullLoader)
-                                self._log.info("{}: Config file loaded successfully from given file path: {}.".format(log_msg, os.path.join(self._config_file, self._path)))
-                                self._log.debug(json.dumps(self._config, indent=4, sort_keys=True))
+                                self._log.info("{}: Config file loaded successfully from given file path: {}.", log_msg, os.path.join(self._config_file, self._path))
+                                self._log.debug(lambda: json.dumps(self._config, indent=4, sort_keys=True))
                         except Exception as e:
                             self._log.error("Failed to open: [{}]".format(tf_filepath))
                             self._log.error("Exception: {}".format(str(e)))
@@ -128,7 +156,7 @@ class TFMagicDoc(object):
                 self._log.write("A properly formatted project config can be created using the `magicdoc tf config init` command.", 'yellow')
                 pass
         else:
-            self._log.debug("{}: Config file not found in project directory or is of invalid type: {}".format(log_msg, self._config_file))
+            self._log.debug("{}: Config file not found in project directory or is of invalid type: {}", log_msg, self._config_file)
 
 
     ############################################
@@ -138,9 +166,8 @@ class TFMagicDoc(object):
     def files(self):
         """Getter for class property files method. This object property will return a list of files from the provided path that ends with either the .tf or .tfvar extentions"""
         # Define this function for logging
-        this = inspect.stack()[0][3]
-        log_msg = "{}.{}".format(self._log_context, this)
-        self._log.info("{}: Property requested".format(log_msg))
+        log_msg = log_context(self._log_context)
+        self._log.info("{}: Property requested", log_msg)
         if self._files is None:
             self._log.write("Search resulted in 0 [*.tf, *.tfvar] files found in {}".format(self._path))
             sys.exit()
@@ -150,192 +177,273 @@ class TFMagicDoc(object):
 
     @files.setter
     def files(self, init=True):
-        """Setter for class property files method that iterates through a given file path and collects a list of terraform files. This method will also ignore files that start with .terraform."""
+        """Setter for class property files method that scans a given file path and collects a list of terraform files. Directories in the prune list such as .terraform and .git are never descended into."""
         # Define this function for logging
-        this = inspect.stack()[0][3]
-        log_msg = "{}.{}".format(self._log_context, this)
+        log_msg = log_context(self._log_context)
         # Instantiate the results object to hold the file search results.
-        self._log.info("{}: Refresh requested".format(log_msg))
-        self._log.info("{}: Exclude all sub-directories from search: {}".format(log_msg, str(self._no_recursion)))
-        self._log.info("{}: Sub-directory to exclude from search: {}".format(log_msg, str(self._exclude_dir)))
+        self._log.info("{}: Refresh requested", log_msg)
+        self._log.info("{}: Exclude all sub-directories from search: {}", log_msg, str(self._no_recursion))
+        self._log.info("{}: Sub-directory to exclude from search: {}", log_msg, str(self._exclude_dir))
+        self._log.info("{}: Directories pruned from search: {}", log_msg, str(self._prune_dirs))
         self._log.write("Scanning project directory for terraform .tf and .tfvar files...")
-        file_search_results = {'list_tf_files': [], 'list_tfvar_files': []}
+        # The manifest is only reusable if it was written using the same search settings.
+        file_search_settings = {'prune_dirs': sorted(self._prune_dirs), 'exclude_dir': self._exclude_dir, 'no_recursion': self._no_recursion}
         try:
-            self._log.debug("{}: Gathering list of all Terraform files ending in [.tf, .tfvars] file extensions from: {}".format(log_msg, self._path))
-            for root, dirs, files in os.walk(self._path):
-                self._log.debug("{}: Searching directory: {}".format(log_msg, self._path))
-                # Strip the current directory designations
-                file_search_path = root.replace(self._path, "")
-                self._log.debug("{}: Setting file search path: {}".format(log_msg, file_search_path))
-                for filename in files:
-                    self._log.debug("{}: Checking file: {}".format(log_msg, filename))
-                    if filename.endswith('.tf') and not filename.startswith('.terraform'):
-                        if self._exclude_dir is not None and self._exclude_dir in filename:
-                            self._log.debug("{}: Terraform .tf file: {} located in excluded subdirectory {}. [Skipping...]: {}".format(log_msg, filename, self._exclude_dir))
-                        else:
-                            self._log.debug("{}: Terraform .tf file match found: {}".format(log_msg, filename))
-                            file_search_results.get('list_tf_files').append(os.path.join(file_search_path, filename))
-                    elif filename.endswith('.tfvars') and not filename.startswith('.terraform'):
-                        if self._exclude_dir is not None and self._exclude_dir in filename:
-                            self._log.debug("{}: Terraform .tfvar file: {} located in excluded subdirectory {}. [Skipping...]: {}".format(log_msg, filename, self._exclude_dir))
-                        else:
-                            self._log.debug("{}: Terraform .tfvar file match found: {}".format(log_msg, filename))
-                            file_search_results.get('list_tfvar_files').append(os.path.join(file_search_path, filename))
-                # If recursion is set to false, then break, as the first pass gathers only the current directory.
-                if self._no_recursion:
-                    self._log.info("{}: Recursion disabled, only parsing parent directory results".format(log_msg))
-                    break
+            file_search_manifest = None if self._no_cache else LoadManifest(self._log, self._path, file_search_settings)
+            if file_search_manifest is not None:
+                self._log.info("{}: File manifest cache is current, skipping the directory scan", log_msg)
+                file_search_results, file_search_skipped = file_search_manifest
+            else:
+                if not self._no_cache:
+                    # Create the cache directory before scanning so that creating it does not change a recorded directory mtime.
+                    try:
+                        os.makedirs(os.path.join(self._path, os.path.dirname(MANIFEST_PATH)), exist_ok=True)
+                    except OSError as e:
+                        self._log.warning("{}: Unable to create file manifest cache directory: {}", log_msg, str(e))
+                self._log.debug("{}: Gathering list of all Terraform files ending in [.tf, .tfvars] file extensions from: {}", log_msg, self._path)
+                file_search_results, file_search_skipped, file_search_dirs = ScanDir(self._log, self._path, self._prune_dirs, self._exclude_dir, self._no_recursion)
+                if not self._no_cache:
+                    SaveManifest(self._log, self._path, file_search_settings, file_search_results, file_search_skipped, file_search_dirs)
+            self._files_skipped = file_search_skipped
+            self._log.info("{}: {} directory entries were pruned from the search", log_msg, file_search_skipped)
             # If no results were found then don't set the files property attribute.
             if not bool(file_search_results.get('list_tf_files')) and not bool(file_search_results.get('list_tfvar_files')):
-                self._log.info("{}: Search for [*.tf, *.tfvar] files in {} yielded no results.".format(log_msg, self._path))
+                self._log.info("{}: Search for [*.tf, *.tfvar] files in {} yielded no results.", log_msg, self._path)
             else:
                 # Log and return the result list.
-                self._log.info("{}: Search for [*.tf, *.tfvar] files from {} completed successfully!".format(log_msg, self._path))
-                self._log.info("{}: {} .tf files found: {}".format(log_msg, len(file_search_results.get('list_tf_files')), file_search_results.get('list_tf_files')))
-                self._log.info("{} {} .tfvar files found: {}".format(log_msg, len(file_search_results.get('list_tfvar_files')), file_search_results.get('list_tfvar_files')))
-                self._log.debug("{}: Saving file search results to object".format(log_msg))
-                self._log.debug(json.dumps(file_search_results, indent=4, sort_keys=True))
+                self._log.info("{}: Search for [*.tf, *.tfvar] files from {} completed successfully!", log_msg, self._path)
+                self._log.info("{}: {} .tf files found: {}", log_msg, len(file_search_results.get('list_tf_files')), file_search_results.get('list_tf_files'))
+                self._log.info("{} {} .tfvar files found: {}", log_msg, len(file_search_results.get('list_tfvar_files')), file_search_results.get('list_tfvar_files'))
+                self._log.debug("{}: Saving file search results to object", log_msg)
+                self._log.debug(lambda: json.dumps(file_search_results, indent=4, sort_keys=True))
                 self._files = file_search_results
+                # A new file set invalidates any previously parsed project model, and everything computed from it.
+                self._model = None
+                self._variables = {}
+                self._outputs = {}
+                self._graph = None
+                self._graph_generated = False
         except Exception as e:
             self._log.error("Search for [*.tf, *.tfvar] files in {} failed!".format(self._path))
             self._log.error("Exception: {}".format(str(e)))
             sys.exit()
 
 
+    ############################################
+    # Parse Terraform Project Model:           #
+    ############################################
+    @property
+    def model(self):
+        """Getter for class property model method. This object property will return the ProjectModel built from a single parse of every project .tf file, parsing the files on first request."""
+        # Define this function for logging
+        log_msg = log_context(self._log_context)
+        self._log.info("{}: Property requested", log_msg)
+        if self._model is None:
+            self.model = True
+        return self._model
+
+
+    @model.setter
+    def model(self, init=True):
+        """Setter for class property model method that reads and parses every collected .tf file exactly once, and builds the unified project model from the parsed documents.
+        Parsed documents are cached by a hash of the file contents and parser version, so unchanged files are never parsed twice."""
+        # Define this function for logging
+        log_msg = log_context(self._log_context)
+        self._log.info("{}: Refresh requested", log_msg)
+        self._log.write("Parsing project terraform files...")
+        import hcl
+        parse_cache = None if self._no_cache else CacheStore(self._log, os.path.join(self._cache_dir, 'hcl'))
+        documents = {}
+        parse_queue = []
+        # Read every file and resolve what we can from the parse cache, queueing the rest to be parsed.
+        for tf_file in self.files.get('list_tf_files', []):
+            tf_filepath = os.path.join(self._path, tf_file)
+            self._log.debug("{}: Reading file: [{}]", log_msg, tf_filepath)
+            try:
+                with open(tf_filepath, 'rb') as f:
+                    tf_content = f.read()
+            except Exception as e:
+                self._log.error("Failed to open: [{}]".format(tf_filepath))
+                self._log.error("Exception: {}".format(str(e)))
+                continue
+            parse_key = CacheStore.key('hcl', hcl.__version__, tf_content) if parse_cache is not None else None
+            document = parse_cache.get_json(parse_key) if parse_cache is not None else None
+            # Reserve the file's slot so that the documents stay in file order once the queued files are parsed.
+            documents[tf_file] = document
+            if document is None:
+                parse_queue.append((tf_file, parse_key, tf_content.decode('utf-8', errors='replace')))
+        # Parse the queued files, in parallel if requested, and merge the results back in file order.
+        parse_results = ParseFiles(self._log, [item[2] for item in parse_queue], self._jobs)
+        for (tf_file, parse_key, tf_content), (document, error) in zip(parse_queue, parse_results):
+            if error is not None:
+                self._log.error("Failed to parse: [{}]".format(os.path.join(self._path, tf_file)))
+                self._log.error("Exception: {}".format(error))
+                del documents[tf_file]
+                continue
+            self._log.debug("{}: Successfully parsed file: [{}]", log_msg, tf_file)
+            documents[tf_file] = document
+            if parse_cache is not None:
+                parse_cache.put_json(parse_key, document)
+        if parse_cache is not None:
+            self._log.info("{}: Parse cache: {}", log_msg, parse_cache.stats())
+            parse_cache.evict()
+        self._model = ProjectModel(self._log, documents)
+
+
+    def include_file(self, tf_file, include_examples=False):
+        """Class method that determines if a project file is in scope. Files in an example(s) directory are excluded unless include_examples is set, and files in the excluded directory are always excluded."""
+        if ('example' in tf_file or 'examples' in tf_file) and not include_examples:
+            return False
+        if self._exclude_dir is not None and self._exclude_dir in os.path.join(self._path, tf_file):
+            return False
+        return True
+
+
+    def scoped_declarations(self, model, kind, include_examples):
+        """
+        Class method that returns a dictionary of the variables or outputs, as given by kind, of a project model by name. Those of the root module come first.
+        If include_examples is set, those declared in module sub-directories are added after them, in directory order, each name once, so that a sub-directory
+        declaration never replaces a root module declaration. Otherwise sub-directory declarations are left out, and a warning reports how many were.
+        """
+        # Define this function for logging
+        log_msg = log_context(self._log_context)
+        declarations = dict(getattr(model, kind))
+        module_declarations = getattr(model, 'module_{}'.format(kind))
+        if not include_examples:
+            if module_declarations:
+                self._log.warning("{}: {} {} declared in module sub-directories were not collected, include example sub-directories to collect them.", log_msg, len(module_declarations), kind)
+            return declarations
+        for (module_dir, k), v in sorted(module_declarations.items()):
+            if k in declarations:
+                self._log.debug("{}: {} {} declared in: [{}] is already declared in: [{}], keeping the first declaration.", log_msg, kind[:-1].capitalize(), k, v.get('file'), declarations[k].get('file'))
+                continue
+            declarations[k] = v
+        return declarations
+
+
+    @property
+    def include_examples(self):
+        """Getter for class property include_examples method. This object property will return whether files in example(s) directories are included in the variables and outputs properties."""
+        return self._include_examples
+
+
+    @include_examples.setter
+    def include_examples(self, include_examples):
+        """Setter for class property include_examples method. Previously collected variables and outputs stay memoized for each setting."""
+        self._include_examples = bool(include_examples)
+
+
     ##############################################
     # Construct Terraform Module Variable Lists: #
     ##############################################
     @property
     def variables(self):
-        """Getter for class property variables method. This object property will return a dictionary of variables from the provided file list."""
+        """Getter for class property variables method. This object property will return a dictionary of variables for the current include_examples setting, collecting them on first request."""
         # Define this function for logging
-        this = inspect.stack()[0][3]
-        log_msg = "{}.{}".format(self._log_context, this)
-        self._log.info("{}: Property requested".format(log_msg))
-        if self._variables is None:
-            self._log.write("Specified project has no variables or unable to gather variables from: {}".format(self._path))
-            sys.exit()
-        else:
-            return self._variables
+        log_msg = log_context(self._log_context)
+        self._log.info("{}: Property requested", log_msg)
+        if self._include_examples not in self._variables:
+            self._variables[self._include_examples] = self.collect_variables(self._include_examples)
+        return self._variables.get(self._include_examples)
 
 
     @variables.setter
     def variables(self, include_examples):
+        """Setter for class property variables method. Kept for compatibility, this only sets the include_examples setting that the variables will be collected for."""
+        self.include_examples = include_examples
+
+
+    def collect_variables(self, include_examples):
         """
-        Setter for class property variables method that iterates through the collected terraform files,
-        locates any variables.tf files, parses the files, and returns a dict object of the collected file contents.
+        Class method that collects every variable declared in the root module terraform files, the files directly in the project directory,
+        from the parsed project model, and returns a dict object of the required and optional variables.
         
-        Files will be ignored if found in a directory named 'example' or 'examples' unless the include_examples flag was set as true.
+        If the include_examples flag was set as true, the variables of nested modules and example directories are collected too, after those of the root module,
+        and a variable that is already declared is never replaced. Otherwise files in sub-directories are ignored.
         """
         # Instantiate the results object to hold the variables search results.
         # Define this function for logging
-        this = inspect.stack()[0][3]
-        log_msg = "{}.{}".format(self._log_context, this)
-        self._log.info("{}: Refresh requested".format(log_msg))
-        self._log.info("{}: Include example sub-directories in search: {}".format(log_msg, str(include_examples)))
+        log_msg = log_context(self._log_context)
+        self._log.info("{}: Refresh requested", log_msg)
+        self._log.info("{}: Include example sub-directories in search: {}", log_msg, str(include_examples))
         self._log.write("Scanning project directory for defined module variables...")
 
         # Intantiate variable results dictionary object.
         variable_results = {'required_vars': [], 'required_vars_maxlength': 0, 'optional_vars': [], 'optional_vars_maxlength': 0}
         try:
-            # Iterate through the project files and look for any files named variables.tf, if found, parse the files and construct an object for each variable that will be stored into the class dictionary object.
-            self._log.info("{}: Parsing terraform variable files.".format(log_msg))
-            for tf_file in self.files.get('list_tf_files'):
-                tf_filepath = os.path.join(self._path, tf_file)
-                tf_filename = tf_file.lower()
-                self._log.debug("{}: Scanning file: [{}]".format(log_msg, tf_file))
-                # If example or exampes is in the file path, then exclude unless include all was passed true.
-                if 'variables.tf' in tf_file:
-                    if ('example' in tf_file or 'examples' in tf_file) and not include_examples:
-                        self._log.debug("{}: {} located in example subdirectory. [Skipping file parse...]".format(log_msg, tf_file))
-                        continue
-                    # if a passed exclude directory name was passed and its in the file path then exclude unless include all was passed true.
-                    elif self._exclude_dir is not None and self._exclude_dir in tf_filename:
-                        self._log.debug("{}: {} located in excluded directory: {}. [Skipping file parse...]".format(log_msg, self._exclude_dir))
-                        continue
-                    else:
-                        self._log.debug("{}: Parsing file: [{}]".format(log_msg, tf_filepath))
-                        try:
-                            with open(tf_filepath, 'r') as f:
-                                tf_variables = hcl.load(f)
-                                self._log.debug("{}: Successfully loaded file: [{}]".format(log_msg, tf_filepath))
-                        except Exception as e:
-                            self._log.error("Failed to open: [{}]".format(tf_filepath))
-                            self._log.error("Exception: {}".format(str(e)))
-                        self._log.debug("{}: {} flagged for parsing!".format(log_msg, tf_file))
-                        self._log.debug(json.dumps(tf_variables, indent=4, sort_keys=True))
-                        # For each variable in the variables.tf file:
-                        # Put the variable into either the required, or optional respective list based on the existence or absence of a default value.
-                        self._log.info("{}: Parsing project variables defined in: {}.".format(log_msg, tf_filepath))
-
-                        # Parse each variable and place into the result variable in expected format.
-                        for k, v in tf_variables.get('variable').items():
-                            if v.get('default') == None:
-                                self._log.debug("{} Setting variable: {} as {}".format(log_msg, k, 'Required'))
-                                # Check the variable name len and update maxlength, then create and store the variable object.
-                                if len(k) > int(variable_results.get('required_vars_maxlength')):
-                                    self._log.debug("{}: Var: {} length: {} is longer then {}... setting required variable offset to: {}".format(log_msg, k, len(k), variable_results.get('required_vars_maxlength'), len(k)))
-                                    variable_results.update(required_vars_maxlength=len(k))
-                                # Create the variable obj and add it to the result set object.
-                                variable_results.get('required_vars').append({
-                                    'name': k,
-                                    'type': v.get('type', 'string'),
-                                    'description': v.get('description', "No Description Provided"),
-                                    'example_value': "Required Value",
-                                    'general_details': {'description': v.get('description', "No Description Provided"), 'notes': "", 'images': ""},
-                                    'variable_details': {'description': "", 'notes': "", 'images': ""},
-                                    'usage_details': {'description': "", 'notes': "", 'images': ""},
-                                    'additional': {'description': "", 'notes': "", 'images': ""}
-                                })
-                                self._log.debug("{}: Adding {} to required_vars list.".format(log_msg, k))
-                            # If the variable has a default value, then it must be an optional.
-                            else:
-                                self._log.debug("{} Setting variable: {} as {}".format(log_msg, k, 'Optional'))
-                                # Check the variable name len and update maxlength, then create and store the variable object.
-                                if len(k) > int(variable_results.get('optional_vars_maxlength')):
-                                    self._log.debug("{}: {} length: {} is longer then {}... setting optional variable offset to: {}".format(log_msg, k, len(k), variable_results.get('optional_vars_maxlength'), len(k)))
-                                    variable_results.update(optional_vars_maxlength=len(k))
-                                # Create the variable obj and add it to the result set object.
-                                variable_results.get('optional_vars').append({
-                                    'name': k,
-                                    'type': v.get('type', 'string'),
-                                    'description': v.get('description', "No Description Provided"),
-                                    'default': v.get('default', "Example Value"),
-                                    'example_value': "Example Value",
-                                    'general_details': {'description': v.get('description', "No Description Provided"), 'notes': "", 'images': ""},
-                                    'variable_details': {'description': "", 'notes': "", 'images': ""},
-                                    'usage_details': {'description': "", 'notes': "", 'images': ""},
-                                    'additional': {'description': "", 'notes': "", 'images': ""}
-                                })
-                                self._log.debug("{}: Adding {} to optional_vars list.".format(log_msg, k))
-            # If no results were found then don't set the variables property attribute.
+            # Take the variables from the files of the parsed project model that are in scope, and construct an object for each variable that will be stored into the class dictionary object.
+            self._log.info("{}: Collecting terraform variables from the project model.", log_msg)
+            model = self.model.subset(lambda tf_file: self.include_file(tf_file, include_examples))
+
+            # Parse each variable and place into the result variable in expected format.
+            for k, v in self.scoped_declarations(model, 'variables', include_examples).items():
+                self._log.debug("{}: Variable: {} declared in: [{}]", log_msg, k, v.get('file'))
+                if v.get('default') == None:
+                    self._log.debug("{} Setting variable: {} as {}", log_msg, k, 'Required')
+                    # Check the variable name len and update maxlength, then create and store the variable object.
+                    if len(k) > int(variable_results.get('required_vars_maxlength')):
+                        self._log.debug("{}: Var: {} length: {} is longer then {}... setting required variable offset to: {}", log_msg, k, len(k), variable_results.get('required_vars_maxlength'), len(k))
+                        variable_results.update(required_vars_maxlength=len(k))
+                    # Create the variable obj and add it to the result set object.
+                    variable_results.get('required_vars').append({
+                        'name': k,
+                        'type': v.get('type', 'string'),
+                        'description': v.get('description', "No Description Provided"),
+                        'example_value': "Required Value",
+                        'general_details': {'description': v.get('description', "No Description Provided"), 'notes': "", 'images': ""},
+                        'variable_details': {'description': "", 'notes': "", 'images': ""},
+                        'usage_details': {'description': "", 'notes': "", 'images': ""},
+                        'additional': {'description': "", 'notes': "", 'images': ""}
+                    })
+                    self._log.debug("{}: Adding {} to required_vars list.", log_msg, k)
+                # If the variable has a default value, then it must be an optional.
+                else:
+                    self._log.debug("{} Setting variable: {} as {}", log_msg, k, 'Optional')
+                    # Check the variable name len and update maxlength, then create and store the variable object.
+                    if len(k) > int(variable_results.get('optional_vars_maxlength')):
+                        self._log.debug("{}: {} length: {} is longer then {}... setting optional variable offset to: {}", log_msg, k, len(k), variable_results.get('optional_vars_maxlength'), len(k))
+                        variable_results.update(optional_vars_maxlength=len(k))
+                    # Create the variable obj and add it to the result set object.
+                    variable_results.get('optional_vars').append({
+                        'name': k,
+                        'type': v.get('type', 'string'),
+                        'description': v.get('description', "No Description Provided"),
+                        'default': v.get('default', "Example Value"),
+                        'example_value': "Example Value",
+                        'general_details': {'description': v.get('description', "No Description Provided"), 'notes': "", 'images': ""},
+                        'variable_details': {'description': "", 'notes': "", 'images': ""},
+                        'usage_details': {'description': "", 'notes': "", 'images': ""},
+                        'additional': {'description': "", 'notes': "", 'images': ""}
+                    })
+                    self._log.debug("{}: Adding {} to optional_vars list.", log_msg, k)
+            # Log the collection results.
             if not bool(variable_results.get('required_vars')) and not bool(variable_results.get('optional_vars')):
-                self._log.info("{}: Search for project variables files in {} yielded no results.".format(log_msg, tf_filepath))
+                self._log.info("{}: Search for project variables in {} yielded no results.", log_msg, self._path)
             else:
                 # Log and return the result list.
                 self._log.debug(' ')
-                self._log.info("{}: Variable list processing completed successfully.".format(log_msg))
-                self._log.info("{}: {} Required variables identified".format(log_msg, len(variable_results.get('required_vars'))))
-                self._log.info("{}: {} Optional variables identified".format(log_msg, len(variable_results.get('optional_vars'))))
-                self._log.debug(json.dumps(variable_results.get('required_vars'), indent=4, sort_keys=True))
-                self._log.debug(json.dumps(variable_results.get('optional_vars'), indent=4, sort_keys=True))
-                self._log.debug("{}: Saving variable search results to object".format(log_msg))
-                self._variables = variable_results
+                self._log.info("{}: Variable list processing completed successfully.", log_msg)
+                self._log.info("{}: {} Required variables identified", log_msg, len(variable_results.get('required_vars')))
+                self._log.info("{}: {} Optional variables identified", log_msg, len(variable_results.get('optional_vars')))
+                self._log.debug(lambda: json.dumps(variable_results.get('required_vars'), indent=4, sort_keys=True))
+                self._log.debug(lambda: json.dumps(variable_results.get('optional_vars'), indent=4, sort_keys=True))
+            # Patch the collected variables with any additional documentation details from the project config.
+            self.update_variables(variable_results)
+            return variable_results
         except Exception as e:
             self._log.error("Terraform project variable parsing operation failed!")
             self._log.error("Exception: {}".format(str(e)))
             sys.exit()
 
 
-    def update_variables(self):
+    def update_variables(self, variables):
         """
         This Method will patch the terraform variables with additional information from a loaded config file for the project documentation render.
         """
         # Instantiate the results object to hold the variables search results.
         # Define this function for logging
-        this = inspect.stack()[0][3]
-        log_msg = "{}.{}".format(self._log_context, this)
-        self._log.info("{}: Refresh requested".format(log_msg))
+        log_msg = log_context(self._log_context)
+        self._log.info("{}: Refresh requested", log_msg)
 
         def set_config_details(variables_list, config_variable_dict):
             """Try and update the terraform variable to include additional documentation details"""
@@ -387,16 +495,18 @@ class TFMagicDoc(object):
         # Try and process the variables list
         try:
             # Iterate through the project files and look for any files named variables.tf, if found, parse the files and construct an object for each variable that will be stored into the class dictionary object.
-            self._log.info("{}: Validating terraform variable dictionary.".format(log_msg))
-            if self._variables is not None and isinstance(self._variables, dict) and bool(self._variables):
+            self._log.info("{}: Validating terraform variable dictionary.", log_msg)
+            if not self._config_loaded:
+                self.config = True
+            if variables is not None and isinstance(variables, dict) and bool(variables):
                 if self._config is not None and isinstance(self._config, dict) and bool(self._config):
                     if isinstance(self._config.get('Variables'), dict) and bool(self._config.get('Variables')):
                         # Parse each variable and place into the result variable in expected format.
                         tf_required_variable_config_data = self._config.get('Variables').get('Required')
-                        set_config_details(self._variables.get('required_vars'), tf_required_variable_config_data)
+                        set_config_details(variables.get('required_vars'), tf_required_variable_config_data)
                         
                         tf_optional_variable_config_data = self._config.get('Variables').get('Optional')
-                        set_config_details(self._variables.get('optional_vars'), tf_optional_variable_config_data)
+                        set_config_details(variables.get('optional_vars'), tf_optional_variable_config_data)
         except Exception as e:
             self._log.write("Unable to update terraform variables with config data: {}".format(str(e)), 'error')
 
@@ -406,84 +516,61 @@ class TFMagicDoc(object):
     ############################################
     @property
     def outputs(self):
-        """Getter for class property outputs method. This object property will return a dictionary of outputs from the provided file list."""
+        """Getter for class property outputs method. This object property will return a list of outputs for the current include_examples setting, collecting them on first request."""
         # Define this function for logging
-        this = inspect.stack()[0][3]
-        log_msg = "{}.{}".format(self._log_context, this)
-        self._log.info("{}: Property requested".format(log_msg))
-        if self._outputs is None:
-            self._log.write("Specified project has no outputs or unable to gather outputs from: {}".format(self._path))
-            sys.exit()
-        else:
-            return self._outputs
+        log_msg = log_context(self._log_context)
+        self._log.info("{}: Property requested", log_msg)
+        if self._include_examples not in self._outputs:
+            self._outputs[self._include_examples] = self.collect_outputs(self._include_examples)
+        return self._outputs.get(self._include_examples)
 
 
     @outputs.setter
     def outputs(self, include_examples):
+        """Setter for class property outputs method. Kept for compatibility, this only sets the include_examples setting that the outputs will be collected for."""
+        self.include_examples = include_examples
+
+
+    def collect_outputs(self, include_examples):
         """
-        Setter for class property outputs method that iterates through the collected terraform files,
-        locates any outputs.tf files, parses the files, and returns a dict object of the collected file contents.
+        Class method that collects every output declared in the root module terraform files, the files directly in the project directory,
+        from the parsed project model, and returns a list object of the collected outputs.
         
-        Files will be ignored if found in a directory named 'example' or 'examples' unless the include_examples flag was set as true.
+        If the include_examples flag was set as true, the outputs of nested modules and example directories are collected too, after those of the root module,
+        and an output that is already declared is never replaced. Otherwise files in sub-directories are ignored.
         """
         # Define this function for logging
-        this = inspect.stack()[0][3]
-        log_msg = "{}.{}".format(self._log_context, this)
+        log_msg = log_context(self._log_context)
         # Instantiate the results object to hold the outputs search results.
-        self._log.info("{}: Refresh requested".format(log_msg))
-        self._log.info("{}: Include example sub-directories in search: {}".format(log_msg, str(include_examples)))
+        self._log.info("{}: Refresh requested", log_msg)
+        self._log.info("{}: Include example sub-directories in search: {}", log_msg, str(include_examples))
         self._log.write("Scanning project directory for defined module outputs...")
 
         # Intantiate outputs results dictionary object.
         outputs_results = []
         try:
-            self._log.info("{}: Parsing terraform output files.".format(log_msg))
-            for tf_file in self.files.get('list_tf_files'):
-                tf_filepath = os.path.join(self._path, tf_file)
-                tf_filename = tf_file.lower()
-                self._log.debug("{}: Scanning file: [{}]".format(log_msg, tf_file))
-                # If example or exampes is in the file path, then exclude unless include all was passed true.
-                if 'outputs.tf' in tf_file:
-                    if ('example' in tf_file or 'examples' in tf_file) and not include_examples:
-                        self._log.debug("{}: {} located in example subdirectory. [Skipping file parse...]".format(log_msg, tf_file))
-                        continue
-                    # if a passed exclude directory name was passed and its in the file path then exclude unless include all was passed true.
-                    elif self._exclude_dir is not None and self._exclude_dir in tf_filename:
-                        self._log.debug("{}: {} located in excluded directory: {}. [Skipping file parse...]".format(log_msg, self._exclude_dir))
-                        continue
-                    else:
-                        self._log.debug("{}: Parsing file: [{}]".format(log_msg, tf_filepath))
-                        try:
-                            with open(tf_filepath, 'r') as f:
-                                tf_outputs = hcl.load(f)
-                                self._log.debug("{}: Successfully loaded file: [{}]".format(log_msg, tf_filepath))
-                        except Exception as e:
-                            self._log.error("Failed to open: [{}]".format(tf_filepath))
-                            self._log.error("Exception: {}".format(str(e)))
-                        self._log.debug("{}: {} flagged for parsing!".format(log_msg, tf_file))
-                        self._log.debug(json.dumps(tf_outputs, indent=4, sort_keys=True))
-                        # For each output in the outputs.tf file:
-                        self._log.info("{}: Parsing project outputs defined in: {}.".format(log_msg, tf_filepath))
-                        # Parse each output and place into the result variable in expected format.
-                        for k, v in tf_outputs.get('output').items():
-                            # Create an output object and add it the self.tf_outputs list object.
-                            self._log.debug("{} Parsing output: {} with value: {}".format(log_msg, k, v.get('value', "")))
-                            outputs_results.append({
-                                'name': k,
-                                'value': v.get('value')
-                            })
-                            self._log.debug("{}: Adding {} to outputs list.".format(log_msg, k))
-            # If no results were found then don't set the variables property attribute.
+            self._log.info("{}: Collecting terraform outputs from the project model.", log_msg)
+            model = self.model.subset(lambda tf_file: self.include_file(tf_file, include_examples))
+
+            # Parse each output and place into the result variable in expected format.
+            for k, v in self.scoped_declarations(model, 'outputs', include_examples).items():
+                # Create an output object and add it the self.tf_outputs list object.
+                self._log.debug("{} Parsing output: {} declared in: [{}] with value: {}", log_msg, k, v.get('file'), v.get('value', ""))
+                outputs_results.append({
+                    'name': k,
+                    'value': v.get('value')
+                })
+                self._log.debug("{}: Adding {} to outputs list.", log_msg, k)
+            # Log the collection results.
             if not bool(outputs_results) or len(outputs_results) == 0:
-                self._log.info("{}: Search for project output files in {} yielded no results.".format(log_msg, tf_filepath))
+                self._log.info("{}: Search for project outputs in {} yielded no results.", log_msg, self._path)
             else:
                 # Log and return the result list.
                 self._log.debug(' ')
-                self._log.info("{}: Output list processing completed successfully.".format(log_msg))
-                self._log.info("{}: {} Outputs identified".format(log_msg, len(outputs_results)))
+                self._log.info("{}: Output list processing completed successfully.", log_msg)
+                self._log.info("{}: {} Outputs identified", log_msg, len(outputs_results))
                 self._log.debug(outputs_results)
-                self._log.debug("{}: Saving output search results to object".format(log_msg))
-                self._outputs = outputs_results
+            return outputs_results
         except Exception as e:
             self._log.error("Terraform project output parsing operation failed!")
             self._log.error("Exception: {}".format(str(e)))
@@ -497,9 +584,10 @@ class TFMagicDoc(object):
     def graph(self):
         """Getter for class property graph method. This object property will return a terraform graph dot definition if one was able to be generated."""
         # Define this function for logging
-        this = inspect.stack()[0][3]
-        log_msg = "{}.{}".format(self._log_context, this)
-        self._log.info("{}: Property requested".format(log_msg))
+        log_msg = log_context(self._log_context)
+        self._log.info("{}: Property requested", log_msg)
+        if not self._graph_generated:
+            self.graph = False
         if self._graph is None:
             self._log.write("Specified project was unable to generate a graph object from: {}".format(self._path))
             return None
@@ -511,177 +599,373 @@ class TFMagicDoc(object):
     @graph.setter
     def graph(self, overwrite=False):
         """
-        Setter for class property graph method that will run a terraform init on the targeted directory, and then use that init environment to
-        generate a dot graph definition that can later be rendered for the use.
+        Setter for class property graph method that will generate a dot graph definition of the project root module that can later be rendered for the use.
+        The native engine builds the graph from the references in the parsed project files, without terraform or network access. The terraform engine
+        will run a terraform init on a sandbox copy of the targeted directory, and then use that init environment to run terraform graph.
         """
         # Define this function for logging
-        this = inspect.stack()[0][3]
-        log_msg = "{}.{}".format(self._log_context, this)
+        log_msg = log_context(self._log_context)
         # Instantiate the results object to hold the outputs search results.
-        self._log.info("{}: Refresh requested".format(log_msg))
-        self._log.info("{}: Overwrite Existing Init: {}".format(log_msg, overwrite))
+        self._log.info("{}: Refresh requested", log_msg)
+        self._log.info("{}: Graph engine: {}", log_msg, self._graph_engine)
+        self._log.info("{}: Overwrite Existing Init: {}", log_msg, overwrite)
+        self._graph_generated = True
         self._log.info("")
+        if self._graph_engine == 'native':
+            from magicdoc.modules.graph import BuildGraph
+            try:
+                # Like terraform graph, only the root module, the .tf files directly in the project directory, is graphed.
+                self._graph = BuildGraph(self._log, self.model.subset(lambda tf_file: os.path.dirname(tf_file) == ''))
+                self._log.debug(self._graph)
+            except Exception as e:
+                self._log.warning("Failed to build the native graph structure object for the target project directory: {}", self._path)
+                self._log.warning("{}", str(e))
+            return
         # Intantiate outputs results dictionary object.
         graph_results = []
-        try: 
-            # Call the Terraform init method
+        # Terraform graph output is cached by the fingerprint of the configuration that produced it, unless a refresh was requested.
+        graph_cache = None if self._no_cache else CacheStore(self._log, os.path.join(self._cache_dir, 'graph'))
+        if graph_cache is not None and not overwrite:
+            graph_key = self.graph_fingerprint(graph_cache)
+            cached_graph = graph_cache.get(graph_key) if graph_key is not None else None
+            if cached_graph is not None:
+                self._log.info("{}: Terraform configuration is unchanged since the graph was last generated, using the cached graph", log_msg)
+                self._graph = cached_graph.decode('utf-8')
+                return
+        try:
+            # Call the Terraform init method, which initializes a sandbox copy of the project.
             self.terraform_init(overwrite)
 
-            # Run a Terraform Graph action to generate the graph dot structure
+            # Run a Terraform Graph action in the sandbox to generate the graph dot structure
             try:
-                self._log.debug("{}: Attempting to generate `terraform graph` dot structure in target project directory: {}".format(log_msg, self._path))
-                if self._terraform is not None:
-                    self._log.debug("{}.graph current value: {}".format(log_msg, self._graph))
-                    self._log.debug("{}: Executing `terraform graph` in target project directory: {}".format(log_msg, self._path))
-                    graph_results = self._terraform.cmd('graph')
-                    self._graph = graph_results[1]
-                    self._log.debug("{}: Terraform graph dot structure object was created successfully!".format(log_msg))
+                if self._terraform_workdir is not None:
+                    self._log.debug("{}.graph current value: {}", log_msg, self._graph)
+                    self._log.debug("{}: Executing `terraform graph` in the sandbox copy of the target project directory: {}", log_msg, self._terraform_workdir)
+                    graph_results = self.terraform('graph', capture=True, cwd=self._terraform_workdir, env=self._terraform_env)
+                    self._graph = graph_results[1] if graph_results[0] == 0 and graph_results[1] else None
+                    self._log.debug("{}: Terraform graph dot structure object was created successfully!", log_msg)
                     self._log.debug(self._graph)
                     self._log.debug("")
+                    # The project itself is never changed by the sandbox init, so the fingerprint is the same as before the init.
+                    if graph_cache is not None and graph_results[0] == 0 and self._graph:
+                        graph_key = self.graph_fingerprint(graph_cache)
+                        if graph_key is not None:
+                            graph_cache.put(graph_key, self._graph.encode('utf-8'))
+                            graph_cache.evict()
+            except Exception as e:
+                self._log.warning("Failed to perform `terraform graph` execution on the target project directory: {}", self._path)
+                self._log.warning("{}", str(e))
+        except Exception as e:
+            self._log.warning("Failed to generate terraform graph structure object on target project directory: {}", self._path)
+            self._log.warning("{}", str(e))
+        finally:
+            # Remove the sandbox copy of the project, also when a command timed out or was interrupted.
+            self.terraform_init_cleanup(True)
+
+
+    def graph_fingerprint(self, cache=None):
+        """
+        Class method that returns the cache key of the terraform graph of the project, a hash of the path and content of every project .tf file,
+        the .terraform.lock.hcl dependency lock file and the terraform version. Returns None if terraform is not installed.
+        """
+        terraform_version = self.terraform_version(cache)
+        if terraform_version is None:
+            return None
+        fingerprint = ['graph', terraform_version]
+        for tf_file in sorted(self.files.get('list_tf_files', [])) + ['.terraform.lock.hcl']:
+            try:
+                with open(os.path.join(self._path, tf_file), 'rb') as f:
+                    fingerprint.extend([tf_file, f.read()])
+            except OSError:
+                fingerprint.extend([tf_file, b''])
+        return CacheStore.key(*fingerprint)
+
+
+    def terraform_version(self, cache=None):
+        """
+        Class method that returns the first line of the `terraform version` output, or None if terraform is not installed.
+        The version is cached by the path, size and mtime of the terraform binary, so terraform is only run again once it is upgraded.
+        """
+        # Define this function for logging
+        log_msg = log_context(self._log_context)
+        if self._terraform_version is None and self._terraform_binary is not None:
+            try:
+                binary_stat = os.stat(self._terraform_binary)
+                version_key = CacheStore.key('terraform_version', self._terraform_binary, binary_stat.st_size, binary_stat.st_mtime)
+                cached_version = cache.get(version_key) if cache is not None else None
+                if cached_version is not None:
+                    self._terraform_version = cached_version.decode('utf-8')
+                else:
+                    version_result = self.terraform('version', capture=True)
+                    self._terraform_version = (version_result[1].splitlines() or [''])[0].strip() or None
+                    if self._terraform_version is not None and cache is not None:
+                        cache.put(version_key, self._terraform_version.encode('utf-8'))
+                self._log.debug("{}: Terraform version: {}", log_msg, self._terraform_version)
             except Exception as e:
-                log.warning("Failed to perform `terraform graph` execution on the target project directory: {}".format(self._path))
-                log.warning("{}".format(str(e)))
+                self._log.warning("{}: Unable to determine the terraform version: {}", log_msg, str(e))
+        return self._terraform_version
+
+
+    @property
+    def graph_engine(self):
+        """Getter for class property graph_engine method. This object property will return the engine used to generate the graph, native or terraform."""
+        return self._graph_engine
+
+
+    @graph_engine.setter
+    def graph_engine(self, engine):
+        """Setter for class property graph_engine method. Changing the engine discards any graph generated by the previous engine."""
+        from magicdoc.modules.graph import GRAPH_ENGINES
+        if engine in GRAPH_ENGINES and engine != self._graph_engine:
+            self._graph_engine = engine
+            self._graph = None
+            self._graph_generated = False
+
+
+    @property
+    def graph_model(self):
+        """
+        Getter for class property graph_model method. This object property will return a GraphModel of the project graph, parsed once from the graph dot
+        definition so that fan-in, fan-out, topological order and longest chain queries do not parse it again. Returns None if no graph could be generated.
+        """
+        graph = self.graph
+        if graph is None:
+            return None
+        # The model is rebuilt only when the graph that it was parsed from has been regenerated.
+        if self._graph_model is None or self._graph_model[0] is not graph:
+            from magicdoc.classes.GraphModel import GraphModel
+            self._graph_model = (graph, GraphModel(self._log, graph))
+        return self._graph_model[1]
+
 
-            # TODO: Move this to its own method!!!
-            # If this method executed the terraform init then clean up the .terraform directory.
-            if self._terraform_init_executed is not None and self._terraform_init_executed:
-                self.terraform_init_cleanup(self._terraform_init_executed)
+    @property
+    def graph_max_nodes(self):
+        """Getter for class property graph_max_nodes method. This object property will return the most nodes that the simplified graph keeps, 0 keeps every node and None the GRAPH_MAX_NODES default."""
+        return self._graph_max_nodes
+
+
+    @graph_max_nodes.setter
+    def graph_max_nodes(self, max_nodes):
+        """Setter for class property graph_max_nodes method."""
+        self._graph_max_nodes = max(0, int(max_nodes))
+
+
+    @property
+    def simplified_graph(self):
+        """
+        Getter for class property simplified_graph method. This object property will return the graph dot definition reduced for rendering, without the
+        provider and other bookkeeping nodes, with every module collapsed into one node, without edges implied by longer paths, and with at most
+        graph_max_nodes nodes. Returns None if no graph could be generated.
+        """
+        graph = self.graph
+        if graph is None:
+            return None
+        from magicdoc.modules.graph import SimplifyGraph, GRAPH_MAX_NODES
+        try:
+            return SimplifyGraph(self._log, graph, GRAPH_MAX_NODES if self._graph_max_nodes is None else self._graph_max_nodes)
+        except Exception as e:
+            self._log.warning("Failed to simplify the terraform graph, the full graph will be used: {}", str(e))
+            return graph
+
+
+    def render_graph_image(self, formats=None, image_dir='images', basename='tf_graph'):
+        """
+        Class method to render the simplified terraform graph dot object to images, one per requested format, and save them in the provided path/images directory.
+        The formats are rendered in parallel dot processes, and renders are cached by a hash of the dot text so that an unchanged graph is never re-rendered.
+        Formats default to the graph module GRAPH_IMAGE_FORMATS. On success the tfdiagram attribute is set to the project relative path of the first
+        rendered format, which the readme template displays.
+        """
+        from magicdoc.modules.graph import RenderImages, GRAPH_IMAGE_FORMATS
+        formats = GRAPH_IMAGE_FORMATS if formats is None else formats
+        # Define this function for logging
+        log_msg = log_context(self._log_context)
+        self._log.info("{}: Graph image render requested", log_msg)
+        if self._graphviz_dot_binary is None:
+            self._log.warning("Terraform graph image render failed because the Graphviz dot executable was not found in the system path. Install the Graphviz dot binary to render the graph on future executions.")
+            return None
+        self._log.debug("{}: Graphviz dot binary found in path {}", log_msg, self._graphviz_dot_binary)
+        graph = self.simplified_graph
+        if graph is None:
+            return None
+        image_cache = None if self._no_cache else CacheStore(self._log, os.path.join(self._cache_dir, 'images'))
+        images = RenderImages(self._log, self._graphviz_dot_binary, graph, formats, image_cache)
+        if not images:
+            return None
+        image_dir_path = os.path.join(self._path, image_dir)
+        try:
+            # Make sure the Image Directory exists, if not then create it.
+            os.makedirs(image_dir_path, exist_ok=True)
+            self._graph_image = {}
+            for image_format in formats:
+                if image_format not in images:
+                    continue
+                image_file = "{}.{}".format(basename, image_format)
+                image_path = os.path.join(image_dir_path, image_file)
+                # Leave an unchanged image untouched, so that its mtime and the project git status stay clean.
+                try:
+                    with open(image_path, 'rb') as f:
+                        image_changed = f.read() != images[image_format]
+                except OSError:
+                    image_changed = True
+                if image_changed:
+                    with open(image_path, 'wb') as f:
+                        f.write(images[image_format])
+                    self._log.debug("{}: Terraform graph image written to: {}", log_msg, image_path)
+                self._graph_image[image_format] = "{}/{}".format(image_dir, image_file)
+            self.tfdiagram = next(iter(self._graph_image.values()))
+            self._log.info("{}: Terraform graph images: {}", log_msg, self._graph_image)
         except Exception as e:
-            log.warning("Failed to generate terraform graph structure object on target project directory: {}".format(self._path))
-            log.warning("{}".format(str(e)))
-
-
-    # def render_graph_image(self):
-    #     '''Class method to convert a terraform graph dot object to a png image, and save it in the provided path/images directory.'''
-    # # Define this function for logging
-    #   this = inspect.stack()[0][3]
-    #   log_msg = "{}.{}".format(self._log_context, this)    
-    #   graphviz_binary = shutil.which('dot')
-    #     if graphviz_binary is not None:
-    #         log.debug("Graphviz dot binary found in path {}".format(graphviz_binary))
-    #         try:
-    #             log.debug("Attempting to convert tf_graph object to png image...")
-    #             # File Save Directory and Graph FileName values
-    #             # TODO: Make this into a config variable
-    #             tf_graph_file_basename = "tf_graph"
-    #             image_dir = "images"
-    #             image_dir_path = os.path.join(self._path, image_dir)
-    #             log.debug("Image path ")
-
-    #             # Make sure the Image Directory exists, if not then create it.
-    #             try:
-    #                 if not os.path.exists(image_dir_path):
-    #                     log.info("{} directory not found, attempting to create directory".format(image_dir_path))
-    #                     os.makedirs(image_dir_path)
-    #             except Exception as e:
-    #                 log.error("Failed to create directory {}: {}".format(image_dir_path, str(e)))
-
-    #             try:
-    #                 log.debug("Attempting to build terraform graph png from graph dot object...")
-    #                 terraform_dot = Source(self.tf_graph, directory=image_dir_path, filename=tf_graph_file_basename, format='png')
-    #                 terraform_dot.render()
-    #                 self.tf_graph_image = "{}.png".format(os.path.join(image_dir, tf_graph_file_basename))
-    #                 log.debug("Terraform graph image created successfully in path: {}".format(os.path.join(image_dir_path, tf_graph_file_basename)))
-    #             except Exception as e:
-    #                 log.error("Failed to render terraform graph image with exception: {}".format(str(e)))
-    #         except Exception as e:
-    #             log.error("Failed to create terraform graph image from the provided terraform graph object with exception: {}".format(str(e)))
-    #         finally:
-    #             return self.tf_graph_image
-    #     else:
-    #         log.warning("Terraform graph image render failed because the Graphviz dot executable was not found in the system path. Install the Graphviz dot binary to render the graph on future executions.")
+            self._log.error("Failed to create terraform graph image from the provided terraform graph object with exception: {}".format(str(e)))
+            return None
+        return self.tfdiagram
 
 
     ##############################################
-    # Instantiate Terraform Object:              #
+    # Run Terraform Commands:                    #
     ##############################################
-    def _terraform_instance(self):
-        """Class method that creates a terraform object that can be used to perform actions against the target project directory using terraform."""
+    @property
+    def terraform_timeout(self):
+        """Getter for class property terraform_timeout method. This object property will return the seconds that every terraform command may run for, or None for the per command defaults."""
+        return self._terraform_timeout
+
+
+    @terraform_timeout.setter
+    def terraform_timeout(self, timeout):
+        """Setter for class property terraform_timeout method. A timeout of 0 lets terraform commands run for as long as they take."""
+        self._terraform_timeout = timeout
+
+
+    def terraform(self, command, *args, capture=False, cwd=None, env=None):
+        """
+        Class method that runs a terraform command in the target project directory, or the cwd directory, with any extra env environment variables, and
+        returns a tuple of its return code and captured stdout.
+        Output is streamed to the log line by line as terraform produces it, and with capture set stdout is returned instead of logged. The command is
+        stopped once it runs past the terraform timeout, raising subprocess.TimeoutExpired, and on Ctrl-C.
+        """
+        from magicdoc.modules.process import RunCommand, DEFAULT_TIMEOUT
         # Define this function for logging
-        this = inspect.stack()[0][3]
-        log_msg = "{}.{}".format(self._log_context, this)
-        # Instantiate the TF Object
-        self._log.info("{}: Terraform object instantiation requested!".format(log_msg))
-        if self._terraform is None:
-            self._log.debug("{}: Attempting to instantiate Terraform object instance against the project directory: {}".format(log_msg, self._path))
-            try:
-                self._terraform = Terraform(working_dir=self._path)
-                self._log.debug("{}: Terraform Object instantiation completed successfully: {}".format(log_msg))
-                self._log.debug("")
-            except Exception as e:
-                log.warning("Attempt to instantiate a terraform object in the target directory failed.")
-                log.warning("Exception: {}".format(str(e)))
-        else:
-            self._log.debug("{}: Existing Terraform object already exists... [Skipping...]: {}".format(log_msg))
+        log_msg = log_context(self._log_context)
+        timeout = self._terraform_timeout if self._terraform_timeout is not None else TERRAFORM_TIMEOUTS.get(command, DEFAULT_TIMEOUT)
+        self._log.debug("{}: Running `terraform {}` with a timeout of {} seconds", log_msg, command, timeout)
+        # CHECKPOINT_DISABLE stops terraform from checking for a newer version over the network, and TF_INPUT stops it from waiting for input that never comes.
+        command_env = dict(os.environ, CHECKPOINT_DISABLE='1', TF_IN_AUTOMATION='1', TF_INPUT='0', **(env or {}))
+        return RunCommand(self._log, [self._terraform_binary, command] + list(args), cwd or self._path, timeout, command_env, capture)
+
 
-    
     #########################################################
     # Perform Terraform Init Execution and Cleanup Methods: #
     #########################################################
+    @property
+    def provider_mirror(self):
+        """Getter for class property provider_mirror method. This object property will return the local provider mirror directory that sandbox inits install providers from, or None."""
+        return self._provider_mirror
+
+
+    @provider_mirror.setter
+    def provider_mirror(self, mirror):
+        """Setter for class property provider_mirror method."""
+        self._provider_mirror = mirror
+
+
     def terraform_init(self, overwrite=False):
-        """Class method that performs a terraform init on the working directory.
-        If an existing .terraform directory exists then overwrite must be set to True in order to refresh the init, otherwise, the
-        init will be skipped.
+        """
+        Class method that performs a terraform init on a sandbox copy of the working directory, so that the project and its .terraform directory are never touched.
+        The copy is made in a new work directory under <cache_dir>/terraform/sandbox/<project key>, and is removed again by terraform_init_cleanup. Each work
+        directory has its own terraform data directory, so that runs against the same project at the same time never share, or remove, the data directory of
+        another. Providers are installed through the plugin cache shared by every project in <cache_dir>/terraform/plugins, so that they are downloaded once
+        and repeat inits only link them. With a provider mirror set, providers are only installed from that directory. As every init starts from a new data
+        directory, there is never an existing init to overwrite, and overwrite is only kept for callers that pass it.
         """
         # Define this function for logging
-        this = inspect.stack()[0][3]
-        log_msg = "{}.{}".format(self._log_context, this)
-        self._log.info("{}: Terraform init action requested!".format(log_msg))
-        self._log.debug("{}: Overwrite existing init: {}".format(log_msg, overwrite))
-        self._log.debug("{}: Terraform Binary Installed: {}".format(log_msg, self._terraform_binary))
-        # Call this instances object creation method. If an object is already set, then the method will use the existing object.
-        self._terraform_instance()
+        log_msg = log_context(self._log_context)
+        self._log.info("{}: Terraform init action requested!", log_msg)
+        self._log.debug("{}: Overwrite existing init: {}", log_msg, overwrite)
+        self._log.debug("{}: Terraform Binary Installed: {}", log_msg, self._terraform_binary)
         try:
             if self._terraform_binary is not None:
-                if self._terraform is not None:
-                    self._log.debug("{}: Attempting to run `terraform init` on the target project directory: {}".format(log_msg, self._path))
-                    # TODO: Need to check if this will reflect new changes or if an existing .terraform directory should be removed and recreated..
-                    # TODO: If the finding is that the directory should be removed, then need to be state file aware to ensure that if local state
-                    # is being used that the state is not removed, altered or affected by this at all. Default location of the state file is located
-                    # in terraform.tfstate so just need to exact match .terraform and not do a like terraform when removing the directory.
-                    init_exists = True if os.path.exists(os.path.join(self._path, '.terraform')) else False
-                    if not init_exists or (init_exists and overwrite):
-                        if init_exists:
-                            self._log.debug("{}: A directory named .terraform already exists in the target project directory... Overwrite requested...: {}".format(log_msg))
-                        else:
-                            self._log.debug("{}: Search for .terraform directory in the target project path yielded no results. One will be created...".format(log_msg))
-                        self._log.write("{}: Executing `terraform init` on target project directory: {}".format(log_msg, self._path), 'yellow')
-                        return_code, stdout, stderr = self._terraform.cmd('init', capture_output=False)
-                        self._log.write("{}: Execution of `terraform init` completed successfully against the target directory: {}".format(log_msg, self._path), 'yellow')
-                        self._terraform_init_executed = True
-                    else:
-                        self._log.debug("{}: Project directory already contains a .terraform directory and Overwrite set to: {}. Aborting the init!".format(log_msg, overwrite))
+                sandbox_dir = os.path.join(self._cache_dir, 'terraform', 'sandbox', CacheStore.key('sandbox', os.path.abspath(self._path)))
+                plugin_cache_dir = os.path.join(self._cache_dir, 'terraform', 'plugins')
+                os.makedirs(sandbox_dir, exist_ok=True)
+                os.makedirs(plugin_cache_dir, exist_ok=True)
+                # Set before anything is copied, so that a partial copy is cleaned up if the init fails, times out or is interrupted.
+                work_root = tempfile.mkdtemp(prefix='work-', dir=sandbox_dir)
+                self._terraform_workdir = work_root
+                self._terraform_workdir = self.terraform_sandbox_copy(work_root)
+                self._terraform_env = {'TF_DATA_DIR': os.path.join(work_root, 'data'), 'TF_PLUGIN_CACHE_DIR': plugin_cache_dir}
+                if self._provider_mirror is not None:
+                    cli_config = os.path.join(work_root, 'terraformrc')
+                    with open(cli_config, 'w') as f:
+                        f.write("provider_installation {{\n  filesystem_mirror {{\n    path = {}\n  }}\n}}\n".format(json.dumps(self._provider_mirror)))
+                    self._terraform_env['TF_CLI_CONFIG_FILE'] = cli_config
+                    self._log.debug("{}: Providers will be installed from the local mirror: {}", log_msg, self._provider_mirror)
+                self._log.write("{}: Executing `terraform init` on a sandbox copy of the target project directory: {}".format(log_msg, self._path), 'yellow')
+                return_code = self.terraform('init', '-input=false', '-no-color', cwd=self._terraform_workdir, env=self._terraform_env)[0]
+                if return_code == 0:
+                    self._log.write("{}: Execution of `terraform init` completed successfully against the sandbox copy of the target directory: {}".format(log_msg, self._path), 'yellow')
                 else:
-                    self._log.warning("A valid terraform instance could not be found. Terraform Init operation cannot proceed.")
+                    self._log.warning("`terraform init` exited with return code {} in the sandbox copy of the target project directory: {}", return_code, self._path)
             else:
                 self._log.write("{}: Terraform does not appear to be installed in this environment. Terraform Init operation cannot proceed.".format(log_msg))
                 self._log.write("{}: Terraform can be downloaded from https://www.terraform.io/downloads.html.".format(log_msg))
         except Exception as e:
-            log.warning("Failed to perform `terraform init` execution on the target project directory: {}".format(self._path))
-            log.warning("{}".format(str(e)))
+            self._log.warning("Failed to perform `terraform init` execution on the target project directory: {}", self._path)
+            self._log.warning("{}", str(e))
+
+
+    def terraform_sandbox_copy(self, work_root):
+        """
+        Class method that copies the project into a sandbox work directory and returns the path of the copy. Pruned directories, such as .terraform and .git,
+        and terraform state files are left out. Local module sources that point outside of the project, such as ../modules/vpc, are linked into the sandbox
+        at the same relative location, so that they resolve from the copy as they do from the project. An override file switches the copy to the local
+        backend, so that the init never configures, or needs credentials for, a remote state backend.
+        """
+        # Define this function for logging
+        log_msg = log_context(self._log_context)
+        project_dir = os.path.abspath(self._path)
+        outside_dirs = []
+        for module in self.model.modules.values():
+            source = module.get('source')
+            if isinstance(source, str) and source.startswith(('./', '../')):
+                module_dir = os.path.normpath(os.path.join(project_dir, os.path.dirname(module.get('file', '')), source))
+                if os.path.commonpath([project_dir, module_dir]) != project_dir and os.path.isdir(module_dir):
+                    outside_dirs.append(module_dir)
+        base_dir = os.path.commonpath([project_dir] + outside_dirs)
+        work_dir = os.path.join(work_root, 'project', os.path.relpath(project_dir, base_dir))
+        ignore = shutil.ignore_patterns(*(tuple(self._prune_dirs) + ('*.tfstate', '*.tfstate.backup')))
+        shutil.copytree(project_dir, os.path.normpath(work_dir), ignore=ignore)
+        # Parents are linked before the modules inside them, which then already resolve through the parent link.
+        for module_dir in sorted(set(outside_dirs), key=len):
+            module_link = os.path.join(work_root, 'project', os.path.relpath(module_dir, base_dir))
+            if not os.path.lexists(module_link):
+                os.makedirs(os.path.dirname(module_link), exist_ok=True)
+                os.symlink(module_dir, module_link, target_is_directory=True)
+                self._log.debug("{}: Linked module directory outside of the project into the sandbox: {}", log_msg, module_dir)
+        with open(os.path.join(work_dir, 'magicdoc_override.tf'), 'w') as f:
+            f.write('terraform {\n  backend "local" {}\n}\n')
+        self._log.debug("{}: Project copied to the sandbox work directory: {}", log_msg, work_dir)
+        return os.path.normpath(work_dir)
 
 
     def terraform_init_cleanup(self, confirm=False):
-        """Class method that performs a terraform init directory cleanup on the working directory.
-        If an existing .terraform directory exists and confirm is true, then the directory will be removed from the directory path.
+        """Class method that removes the sandbox copy of the project made by terraform_init. The project directory itself is never changed.
+        Its terraform data directory is removed along with it, the shared plugin cache is kept, so that the next init can reuse the providers.
         """
         # Define this function for logging
-        this = inspect.stack()[0][3]
-        log_msg = "{}.{}".format(self._log_context, this)
-        self._log.info("{}: Terraform init cleanup action requested!".format(log_msg))
-        self._log.debug("{}: Confirm .terraform directory cleanup: {}".format(log_msg, confirm))
+        log_msg = log_context(self._log_context)
+        self._log.info("{}: Terraform init cleanup action requested!", log_msg)
+        self._log.debug("{}: Confirm sandbox cleanup: {}", log_msg, confirm)
+        if not confirm or self._terraform_workdir is None:
+            return
+        # The work directory is <sandbox>/work-<id>/project/<project path relative to its linked modules>, the whole work-<id> directory is removed.
+        work_root = os.path.normpath(self._terraform_workdir)
+        while os.path.basename(work_root) and not os.path.basename(work_root).startswith('work-'):
+            work_root = os.path.dirname(work_root)
         try:
-            if confirm:
-                self._log.debug("{}: Cleaning up the .terraform directory in target project directory: {}".format(log_msg, self._path))
-                tf_init_cleanup_directory = os.path.join(self._path, '.terraform')
-                if os.path.exists(tf_init_cleanup_directory) and tf_init_cleanup_directory.endswith('.terraform') and 'tfstate' not in tf_init_cleanup_directory:
-                    shutil.rmtree(tf_init_cleanup_directory)
-                    self._log.debug("{}: Init cleanup completed successfully in the target project directory. Removed directory: {}".format(log_msg, tf_init_cleanup_directory))
-                else:
-                    self._log.debug("{}: Init cleanup failed to locate the .terraform directory in the target project directory: {}".format(log_msg, self._path))
-            else:
-                self._log.warning("Request to clean the .terraform directory in the target project path must be called setting the confirm property to True. Aborting Cleanup..")
-                self._log.warning("{}".format(str(e)))
+            if os.path.basename(work_root).startswith('work-'):
+                # Linked module directories are removed as links, rmtree never follows them into the real modules.
+                shutil.rmtree(work_root)
+                self._log.debug("{}: Init cleanup completed successfully. Removed sandbox directory: {}", log_msg, work_root)
         except Exception as e:
-            self._log.warning("Failed to remove the .terraform directory in the target project directory path: {}".format(self._path))
-            self._log.warning("{}".format(str(e)))
+            self._log.warning("Failed to remove the sandbox copy of the target project directory: {}", work_root)
+            self._log.warning("{}", str(e))
+        self._terraform_workdir = None
@@ -15,15 +15,17 @@
 import click
 
 # Import Base Python Modules
-import os, sys, json, ntpath, inspect, imp
+import os, sys, json, ntpath
 
 # MagicDoc Imports
-from magicdoc.classes.TFMagicDoc import TFMagicDoc
+# TFMagicDoc is imported by the Environment.tf property the first time that a subcommand requests it.
+import magicdoc
+from magicdoc.classes.Log import log_context, function_name
 from magicdoc.commands.tf_commands import show as tf_show
 from magicdoc.commands.tf_commands import create as tf_create
 
 # Set the Module Path for the Templates directory
-MODULE_PATH = imp.find_module('magicdoc')[1]
+MODULE_PATH = os.path.dirname(os.path.abspath(magicdoc.__file__))
 LOG_CONTEXT = "CMD->tf"
 
 # CLI Environment Class
@@ -41,6 +43,22 @@ class Environment(object):
         self.verbose = False
         self.verbose_level = None
         self.no_recursion = False
+        self.prune_dirs = ()
+        self.no_cache = False
+        self.cache_dir = None
+        self.jobs = 1
+        self.github_api = None
+        self.http_ttl = 0
+        self.git_source = 'auto'
+        self.connect_timeout = None
+        self.read_timeout = None
+        self.http_retries = None
+        self.network_budget = None
+        self.provider_apis = {}
+        self.provider_stub_dir = None
+        self.terraform_timeout = None
+        self.provider_mirror = None
+        self._http = None
         self.workdir = os.getcwd()
         self.exclude_dir = None
         self.template_dir = None
@@ -51,7 +69,7 @@ class Environment(object):
         self.changelog_template = 'magicdoc_changelog.j2'
         self.gitignore_template = 'magicdoc_gitignore.j2'
         self.project_config = None
-        self.tf = None
+        self._tf = None
         self.terminal_colors = [
             'black', 'red', 'green', 'yellow', 'blue', 'magenta', 'cyan', 'white', 'bright_black',
             'bright_red', 'bright_green', 'bright_yellow', 'bright_blue', 'bright_magenta',
@@ -61,6 +79,51 @@ class Environment(object):
         self.log = self.Log(self.verbose, self.verbose_level)
 
 
+    @property
+    def tf(self):
+        """Environment property that instantiates the TFMagicDoc object the first time a command requests it.
+        Commands that never touch the terraform project, such as env and show git, never pay for the config load and file scan."""
+        if self._tf is None:
+            log_msg = log_context(LOG_CONTEXT)
+            self.log.info("{}: Instantiating Terraform MagicDoc object on first request...".format(log_msg))
+            from magicdoc.classes.TFMagicDoc import TFMagicDoc
+            self._tf = TFMagicDoc(self.log, self.workdir, self.exclude_dir, self.project_config, self.no_recursion, self.prune_dirs, self.no_cache, self.cache_dir, self.jobs)
+            self._tf.terraform_timeout = self.terraform_timeout
+            self._tf.provider_mirror = self.provider_mirror
+            self.log.info("{}: Environment: Terraform MagicDoc object instantiated successfully".format(log_msg))
+        return self._tf
+
+
+    @tf.setter
+    def tf(self, tf):
+        """Environment setter that allows a prepared TFMagicDoc object to be assigned to the environment."""
+        self._tf = tf
+
+
+    def git_parser(self, path=None):
+        """Environment method that returns a GitParser for the work directory, or the provided path, configured from the environment settings."""
+        from magicdoc.classes.GitParser import GitParser
+        return GitParser(self.log, path or self.workdir, github_api=self.github_api, http=self.http, git_source=self.git_source, provider_apis=self.provider_apis, provider_stub_dir=self.provider_stub_dir)
+
+
+    @property
+    def http(self):
+        """Environment property that returns the HttpClient shared by every request of the run, so that the response cache and network budget span the whole run."""
+        if self._http is None:
+            from magicdoc.classes.HttpClient import HttpClient
+            from magicdoc.classes.CacheStore import CacheStore, DEFAULT_CACHE_DIR
+            http_cache = None if self.no_cache else CacheStore(self.log, os.path.join(self.cache_dir or DEFAULT_CACHE_DIR, 'http'))
+            http_settings = {'connect_timeout': self.connect_timeout, 'read_timeout': self.read_timeout, 'retries': self.http_retries, 'budget': self.network_budget}
+            self._http = HttpClient(self.log, cache=http_cache, ttl=self.http_ttl, **{k: v for k, v in http_settings.items() if v is not None})
+        return self._http
+
+
+    @property
+    def tf_loaded(self):
+        """Environment property that reports whether the TFMagicDoc object has been instantiated, without instantiating it."""
+        return self._tf is not None
+
+
     # Environment method available to any command to format a map or object styled terraform variable into the proper format.
     def format_as_map(self, arg_value, arg_indent=0, arg_offset=0):
         """Command Function that will print the desired output in a terraform map style format"""
@@ -155,13 +218,97 @@ pass_environment = click.make_pass_decorator(Environment, ensure=True)
     '--no_recursion', '-nr', is_flag=True, show_envvar=True,
     help='Disable recursion, This will exclude searching any sub-directory found in the workdir.'
 )
+@click.option(
+    '--prune_dir', '-p', show_envvar=True,
+    multiple=True,
+    help='Directory name to prune from the search path in addition to .terraform, .git, .venv and node_modules. May be passed multiple times.'
+)
+@click.option(
+    '--no_cache', '-nc', is_flag=True, show_envvar=True,
+    help='Bypass the magicdoc caches. The workdir is always scanned and every terraform file is always parsed.'
+)
+@click.option(
+    '--cache_dir', '-cd', show_envvar=True,
+    type=click.Path(file_okay=False, resolve_path=True),
+    default=None,
+    help='Specify the directory used to cache parsed terraform files. Defaults to ~/.magicdoc/cache.'
+)
+@click.option(
+    '--jobs', '-j', show_envvar=True,
+    type=click.IntRange(min=0),
+    default=1,
+    help='Number of processes used to parse terraform files. 0 uses one process per CPU.'
+)
+@click.option(
+    '--github_api', '-ga', show_envvar=True,
+    default=None,
+    help='Specify the base URL of the Github API. Defaults to https://api.github.com.'
+)
+@click.option(
+    '--http_ttl', '-ht', show_envvar=True,
+    type=click.IntRange(min=0),
+    default=0,
+    help='Number of seconds that cached Github responses are used without being revalidated. Defaults to 0, always revalidate.'
+)
+@click.option(
+    '--git_source', '-gs', show_envvar=True,
+    type=click.Choice(['local', 'remote', 'auto'], case_sensitive=False),
+    default='auto',
+    help='Source of git repository and release data. local reads the git tags only, remote uses the Github API, auto falls back to the git tags.'
+)
+@click.option(
+    '--connect_timeout', '-ct', show_envvar=True,
+    type=click.FloatRange(min=0.1),
+    default=None,
+    help='Seconds to wait for a connection to the Github API. Defaults to 5.'
+)
+@click.option(
+    '--read_timeout', '-rt', show_envvar=True,
+    type=click.FloatRange(min=0.1),
+    default=None,
+    help='Seconds to wait for a Github API response. Defaults to 10.'
+)
+@click.option(
+    '--http_retries', '-hr', show_envvar=True,
+    type=click.IntRange(min=0),
+    default=None,
+    help='Number of times that failed, rate limited (429, or 403 with no rate limit remaining) or 5xx Github API requests are retried. Defaults to 2.'
+)
+@click.option(
+    '--network_budget', '-nb', show_envvar=True,
+    type=click.FloatRange(min=0),
+    default=None,
+    help='Total seconds that a run may spend on Github API requests before falling back to local or default data. 0 disables the budget. Defaults to 30.'
+)
+@click.option(
+    '--provider_api', '-pa', show_envvar=True,
+    multiple=True,
+    help='Specify the API base URL of a git provider host as HOST=URL, or as HOST=PROVIDER:URL to name its provider (github, gitlab or bitbucket), such as a self-hosted GitLab. May be passed multiple times.'
+)
+@click.option(
+    '--provider_stub_dir', '-ps', show_envvar=True,
+    type=click.Path(exists=True, file_okay=False, resolve_path=True),
+    default=None,
+    help='Read repository data from <dir>/<host>/<namespace>/<name>.json files instead of sending git provider requests. Intended for tests.'
+)
+@click.option(
+    '--terraform_timeout', '-tt', show_envvar=True,
+    type=click.FloatRange(min=0),
+    default=None,
+    help='Seconds that each terraform command may run for before it is stopped. 0 disables the timeout. Defaults to 600 for init, 120 for graph and 30 for version.'
+)
+@click.option(
+    '--provider_mirror', '-pm', show_envvar=True,
+    type=click.Path(exists=True, file_okay=False, resolve_path=True),
+    default=None,
+    help='Install terraform providers only from this local filesystem mirror directory when initializing the graph sandbox, instead of from their registries.'
+)
 @pass_environment
-def cli(ctx, verbose: bool, verbose_level: str, directory: str, exclude_dir: str, config: str, no_recursion: bool):
+def cli(ctx, verbose: bool, verbose_level: str, directory: str, exclude_dir: str, config: str, no_recursion: bool, prune_dir: tuple, no_cache: bool, cache_dir: str, jobs: int, github_api: str, http_ttl: int, git_source: str, connect_timeout: float, read_timeout: float, http_retries: int, network_budget: float, provider_api: tuple, provider_stub_dir: str, terraform_timeout: float, provider_mirror: str):
     """Terraform based project commands and utilities"""
     # DEFINE_SELF: Assign function identifier, log and declare the cmd environment.
     log = ctx.log
-    this = inspect.stack()[0][3]
-    log_msg = "{}.{}".format(LOG_CONTEXT, this)
+    log_msg = log_context(LOG_CONTEXT)
     
     # Set Verbose and Verbose Level Settings. Note that the verbose_level log attribute is calling getter/setter methods.
     ctx.verbose = verbose
@@ -199,11 +346,67 @@ def cli(ctx, verbose: bool, verbose_level: str, directory: str, exclude_dir: str
 
     # Set Non-Recursion Flag.
     ctx.no_recursion = no_recursion
-    log.args("Environment: Directory Recursion Set", ctx.no_recursion)
-
-    # REQUIRED_OBJECTS: Instantiate a TFMagicDoc instance and assign the object to the context object.
-    ctx.tf = TFMagicDoc(ctx.log, ctx.workdir, ctx.exclude_dir, ctx.project_config, ctx.no_recursion)
-    log.info("{}: Environment: Terraform MagicDoc object instantiated successfully".format(log_msg))
+    log.args("Environment: Directory Recursion Set", ctx.no_recursion, arg_lower_nl=False)
+
+    # Set Additional Pruned Directories.
+    ctx.prune_dirs = tuple(prune_dir)
+    log.args("Environment: Pruned Directories Set", ctx.prune_dirs, arg_lower_nl=False)
+
+    # Set Cache Bypass Flag.
+    ctx.no_cache = no_cache
+    log.args("Environment: Cache Bypass Set", ctx.no_cache, arg_lower_nl=False)
+
+    # Set Cache Directory Path.
+    if cache_dir is not None:
+        ctx.cache_dir = cache_dir
+    log.args("Environment: Cache Directory Set", ctx.cache_dir, arg_lower_nl=False)
+
+    # Set Parser Process Count.
+    ctx.jobs = jobs
+    log.args("Environment: Parser Jobs Set", ctx.jobs, arg_lower_nl=False)
+
+    # Set Github API URL.
+    if github_api is not None:
+        ctx.github_api = github_api
+    log.args("Environment: Github API Set", ctx.github_api, arg_lower_nl=False)
+
+    # Set Github Response Cache TTL.
+    ctx.http_ttl = http_ttl
+    log.args("Environment: Github Response Cache TTL Set", ctx.http_ttl, arg_lower_nl=False)
+
+    # Set Git Data Source.
+    ctx.git_source = git_source.lower()
+    log.args("Environment: Git Source Set", ctx.git_source, arg_lower_nl=False)
+
+    # Set Network Timeouts, Retries and Budget. Unset values use the HttpClient defaults.
+    ctx.connect_timeout = connect_timeout
+    ctx.read_timeout = read_timeout
+    ctx.http_retries = http_retries
+    ctx.network_budget = network_budget
+    log.args("Environment: Network Timeouts Set", "connect: {}, read: {}".format(ctx.connect_timeout, ctx.read_timeout), arg_lower_nl=False)
+    log.args("Environment: Network Retries Set", ctx.http_retries, arg_lower_nl=False)
+    log.args("Environment: Network Budget Set", ctx.network_budget, arg_lower_nl=False)
+
+    # Set Git Provider API URLs and Stub Directory.
+    for host_api in provider_api:
+        host, separator, api = host_api.partition('=')
+        if not separator or not host.strip() or not api.strip():
+            raise click.BadParameter("Expected HOST=URL or HOST=PROVIDER:URL, got: {}".format(host_api), param_hint="'--provider_api'")
+        ctx.provider_apis[host.strip()] = api.strip()
+    ctx.provider_stub_dir = provider_stub_dir
+    log.args("Environment: Git Provider APIs Set", ctx.provider_apis, arg_lower_nl=False)
+    log.args("Environment: Git Provider Stub Directory Set", ctx.provider_stub_dir, arg_lower_nl=False)
+
+    # Set the Terraform Command Timeout. Unset uses the default of each terraform command.
+    ctx.terraform_timeout = terraform_timeout
+    log.args("Environment: Terraform Timeout Set", ctx.terraform_timeout, arg_lower_nl=False)
+
+    # Set the Terraform Provider Mirror used by the graph sandbox init.
+    ctx.provider_mirror = provider_mirror
+    log.args("Environment: Terraform Provider Mirror Set", ctx.provider_mirror)
+
+    # REQUIRED_OBJECTS: The TFMagicDoc instance is created by the ctx.tf property the first time that a subcommand requests it.
+    log.info("{}: Environment: Terraform MagicDoc object instantiation deferred until requested".format(log_msg))
     pass
 
 
@@ -217,8 +420,8 @@ def env(ctx):
     """Display Information about the tf subcommand environment."""
     # DEFINE_SELF: Assign function identifier, log and declare the cmd environment.
     log = ctx.obj.log
-    this = inspect.stack()[0][3]
-    log_msg = "{}.{}".format(LOG_CONTEXT, this)
+    this = function_name()
+    log_msg = log_context(LOG_CONTEXT)
 
     # CLS: Clear the screen for the command unless in verbose mode.
     log.clear()
@@ -233,8 +436,8 @@ def env(ctx):
     env_log = "Instantiated" if isinstance(log, object) else "Undefined"
     env_recursion = "Disabled" if ctx.obj.no_recursion else "Enabled"
     env_project_config = "Found" if ctx.obj.project_config is not None and os.path.exists(ctx.obj.project_config) else "Not Found"
-    env_tf = "Instantiated" if isinstance(ctx.obj.tf, object) else "Undefined"
-    env_tf_files = "Found" if bool(ctx.obj.tf.files) else "Not Found"
+    # env never loads the project data, the terraform object is only instantiated by the commands that read it.
+    env_tf = "Instantiated" if ctx.obj.tf_loaded else "Deferred (env does not load project data)"
     env_module_config_template = "Found" if ctx.obj.template_dir is not None and os.path.exists(os.path.join(ctx.obj.template_dir, 'magicdoc_tf_module_config.j2')) else "Not Found"
     env_module_readme_template = "Found" if ctx.obj.template_dir is not None and os.path.exists(os.path.join(ctx.obj.template_dir, 'magicdoc_tf_module_readme.j2')) else "Not Found"
     env_root_config_template = "Found" if ctx.obj.template_dir is not None and os.path.exists(os.path.join(ctx.obj.template_dir, 'magicdoc_tf_root_config.j2')) else "Not Found"
@@ -262,7 +465,7 @@ def env(ctx):
     click.secho(log.verbose_level, fg='green')
 
     click.secho("Log Object State:                ", fg='blue', nl=False)
-    click.secho(env_tf, fg='green')
+    click.secho(env_log, fg='green')
     
     click.secho("Search Sub-Directories:          ", fg='blue', nl=False)
     click.secho(env_recursion, fg='green')
@@ -281,9 +484,6 @@ def env(ctx):
 
     click.secho("Terraform Object State:          ", fg='blue', nl=False)
     click.secho(env_tf, fg='green')
-    
-    click.secho("Terraform Data State:            ", fg='blue', nl=False)
-    click.secho(env_tf_files, fg='green')
     click.echo()
 
     click.secho("Default Jinja Templates:", fg='yellow')
@@ -12,15 +12,14 @@
 # Imports:
 ###############
 # Import Pip Installed Modules:
+# yaml and cloudmage.jinjautils are imported by the commands that render templates, so that loading the CLI stays cheap.
 import click
-import yaml
 
 # Import Base Python Modules
-import os, sys, json, inspect, ntpath
+import os, sys, json, ntpath
 
 # Import MagicDoc Classes/Modules
-from cloudmage.jinjautils import JinjaUtils
-from magicdoc.classes.GitParser import GitParser
+from magicdoc.classes.Log import log_context, function_name
 from magicdoc.modules.tree import DirTree
 
 # Define Global Variables
@@ -56,8 +55,8 @@ def config(ctx, type, filename):
     """Create a magicdoc project configuration file."""
     # DEFINE_SELF: Assign function identifier, log and declare the cmd environment.
     log = ctx.obj.log
-    this = inspect.stack()[0][3]
-    log_msg = "{}.{}".format(LOG_CONTEXT, this)
+    this = function_name()
+    log_msg = log_context(LOG_CONTEXT)
 
     # LOCAL_ENV_VARIABLES: Define any local environments that the command function requires.
     filename = filename if filename is not None and len(filename) > 0 else "magicdoc.yaml"
@@ -74,6 +73,7 @@ def config(ctx, type, filename):
     log.write("Attempting to Gather Terraform Project Data...", arg_upper_nl=False, arg_lower_nl=True, arg_termcolor='blue')
 
     # Gather TF Files
+    from cloudmage.jinjautils import JinjaUtils
     files = ctx.obj.tf.files
 
     if len(files.get('list_tf_files', [])) <= 0:
@@ -82,8 +82,8 @@ def config(ctx, type, filename):
         click.echo()
         sys.exit()
     else:
-        # Gather TF Variables
-        ctx.obj.tf.variables = include_examples=False
+        # Gather TF Variables, these are collected lazily on first read and reused by the template render.
+        ctx.obj.tf.include_examples = False
         variables = ctx.obj.tf.variables
 
         # construct the object that will be provided to the config template
@@ -91,7 +91,7 @@ def config(ctx, type, filename):
         # tf.update(files=files, variables=variables)
 
         # Gather git config data if available
-        git = GitParser(log, ctx.obj.workdir)
+        git = ctx.obj.git_parser()
 
         try:
             if git.config is not None and isinstance(git.config, (list)) and len(git.config) > 0:
@@ -154,13 +154,19 @@ def config(ctx, type, filename):
     default=None,
     help='Provide Git Repository Authentication Token.'
 )
+@click.option(
+    '--graph_max_nodes', '-gm', show_envvar=True,
+    type=click.IntRange(min=0),
+    default=None,
+    help='Most nodes that the rendered module diagram keeps, the most connected nodes are kept. 0 keeps every node. Defaults to 150.'
+)
 @click.pass_context
-def doc(ctx, type, auth):
+def doc(ctx, type, auth, graph_max_nodes):
     """Create a terraform module or project README.md file."""
     # DEFINE_SELF: Assign function identifier, log and declare the cmd environment.
     log = ctx.obj.log
-    this = inspect.stack()[0][3]
-    log_msg = "{}.{}".format(LOG_CONTEXT, this)
+    this = function_name()
+    log_msg = log_context(LOG_CONTEXT)
 
     # CLS: Clear the screen for the command unless in verbose mode.
     log.clear()
@@ -174,6 +180,8 @@ def doc(ctx, type, auth):
     log.write("Attempting to Gather Terraform Project Data...", arg_upper_nl=False, arg_lower_nl=True, arg_termcolor='blue')
 
     # Gather TF Files
+    import yaml
+    from cloudmage.jinjautils import JinjaUtils
     files = ctx.obj.tf.files
 
     if len(files.get('list_tf_files', [])) <= 0:
@@ -187,18 +195,22 @@ def doc(ctx, type, auth):
         # Check if git data exists, if so then make the call to obtain git data, if not then provide a mock object
         try:
             # Gather git config data if available, otherwise provide a mock data structure as Jinja will expect the data keys to exist.
-            git = GitParser(log, ctx.obj.workdir)
+            git = ctx.obj.git_parser()
             try:
                 if git.config is not None and isinstance(git.config, (list)) and len(git.config) > 0:
                     # TODO: Always assign the first list element, this will be addressed in the official gitutils packages
                     # git._config = git.config[0]
                     git.repo = auth
-                    log.debug("{}: Git repository data has successfully been processed.".format(log_msg))
+                    # If the provider could not be reached within the network budget, continue with the default repository scaffolding.
+                    if git._repo is None:
+                        git._repo = {'name': 'example_repo', 'fullname': 'example_namespace/example_repo', 'description': 'Git repository data was not available when creating this document.', 'owner': 'example_owner', 'owner_url': 'https://github.com/users/example_owner'}
+                        log.warning("{}: Git repository data was unavailable, default data scaffolding has been processed.", log_msg)
+                    log.debug("{}: Git repository data has successfully been processed.", log_msg)
                 else:
                     git._config = {'url': 'https://github.com/example/example', 'namespace': 'example_namespace', 'name': 'example_repo', 'provider': 'github.com'}
                     git._repo = {'name': 'example_repo', 'fullname': 'example_namespace/example_repo', 'description': 'Git repository data was not available when creating this document.', 'owner': 'example_owner', 'owner_url': 'https://github.com/users/example_owner'}
                     git._release = 'v0.0.0'
-                    log.warning("{}: Git repository data was unavailable, default data scaffolding has been processed.".format(log_msg))
+                    log.warning("{}: Git repository data was unavailable, default data scaffolding has been processed.", log_msg)
             except Exception as e:
                 log.error("{}: An error occurred attempting to set git data: {}".format(log_msg, str(e)))
                 git = {}
@@ -209,13 +221,12 @@ def doc(ctx, type, auth):
                 )
             # Generate the terraform variable and output data
             try:
-                # Gather TF Variables by calling object variables setter
-                ctx.obj.tf.variables = include_examples=False
-                log.debug("{}: Terraform variables dataset created successfully.".format(log_msg))
-
-                # Gather TF Outputs by calling object outputs setter
-                ctx.obj.tf.outputs = include_examples=False
-                log.debug("{}: Terraform outputs dataset created successfully.".format(log_msg))
+                # Gather TF Variables and Outputs. Both are memoized, so the config and readme renders below reuse them without re-parsing.
+                ctx.obj.tf.include_examples = False
+                variables = ctx.obj.tf.variables
+                log.debug("{}: Terraform variables dataset created successfully, {} required and {} optional variables.", log_msg, len(variables.get('required_vars')), len(variables.get('optional_vars')))
+                outputs = ctx.obj.tf.outputs
+                log.debug("{}: Terraform outputs dataset created successfully, {} outputs.", log_msg, len(outputs))
             except Exception as e:
                 log.write("MagicDoc failed to gather the necessary terraform data to construct the requested document! Check your syntax, and retry. Enable verbose mode to find the source of the error that prevented the data collection.", 'error', arg_upper_nl=True, arg_lower_nl=True)
                 log.error("{}: failed to gather the necessary terraform data to construct the requested document!", log_msg)
@@ -239,10 +250,10 @@ def doc(ctx, type, auth):
 
                     # Insert the generated config file into the tf object.
                     ctx.obj.tf._config = yaml.load(Config.rendered)
-                    log.debug("{}: The following project config dataset has been constructed for this documentation creation instance:".format(log_msg))
+                    log.debug("{}: The following project config dataset has been constructed for this documentation creation instance:", log_msg)
                     log.debug(ctx.obj.tf._config)
             except:
-                log.warning("{}: Magicdoc failed to created a one time config instance, constructing default schema.".format(log_msg))
+                log.warning("{}: Magicdoc failed to created a one time config instance, constructing default schema.", log_msg)
                 tf_mock_config = {}
                 tf_mock_config.update(Git={'Repository': 'https://github.com/example/example', 'Version': 'v.0.0.0'})
                 tf_mock_config.update(ReadMe={
@@ -257,17 +268,20 @@ def doc(ctx, type, auth):
                 })
                 tf_mock_config.update(Variables={'Required': {'Image': ""}, 'Optional': {'Image': ""}})
                 ctx.obj.tf._config = tf_mock_config
-                log.warning("{}: Magicdoc successfully created default config instance that will be used to process the create readme request.".format(log_msg))
+                log.warning("{}: Magicdoc successfully created default config instance that will be used to process the create readme request.", log_msg)
 
             # Once Scans have been done print a console newline for display organization purposes
             click.echo()
 
-            # Gather TF Graph Data
-            # ctx.obj.tf.graph = overwrite
-            # graph = ctx.obj.tf.graph
-
-            # Generate the Terraform Project Graph
-            # Create the Graph
+            # Generate the Terraform Project Graph, and render it to the images directory for the readme Module Diagram section.
+            try:
+                if graph_max_nodes is not None:
+                    ctx.obj.tf.graph_max_nodes = graph_max_nodes
+                if ctx.obj.tf.render_graph_image() is not None:
+                    log.debug("{}: Terraform graph image rendered to: {}", log_msg, ctx.obj.tf.tfdiagram)
+            except Exception as e:
+                log.warning("{}: Terraform graph image could not be rendered, the readme will not include a module diagram.", log_msg)
+                log.warning("{}: Exception: {}", log_msg, str(e))
 
             # Create Directory Structure Tree
             tree = DirTree(ctx.obj.log, ctx.obj.workdir)
@@ -283,11 +297,11 @@ def doc(ctx, type, auth):
             log.write("Generating Terraform {} Readme Documentation...".format(type.title()), arg_termcolor='green', arg_lower_nl=False)
 
             # Instantiate a jinja instance so that we can produce the project config file.
-            log.debug("{}: Attempting to generate document with the following datasets:".format(log_msg))
-            log.debug("{}: Dumping git object that will be passed to JinjaUtils -> {}".format(log_msg, dir(git)))
-            log.debug("{}: Dumping tf object that will be passed to JinjaUtils -> {}".format(log_msg, dir(ctx.obj.tf)))
-            log.debug("{}: Dumping tf config object that will be passed to JinjaUtils -> {}".format(log_msg, ctx.obj.tf.config))
-            log.debug("{}: Dumping tree object that will be passed to JinjaUtils -> {}".format(log_msg, tree))
+            log.debug("{}: Attempting to generate document with the following datasets:", log_msg)
+            log.debug(lambda: "{}: Dumping git object that will be passed to JinjaUtils -> {}".format(log_msg, dir(git)))
+            log.debug(lambda: "{}: Dumping tf object that will be passed to JinjaUtils -> {}".format(log_msg, dir(ctx.obj.tf)))
+            log.debug(lambda: "{}: Dumping tf config object that will be passed to JinjaUtils -> {}".format(log_msg, ctx.obj.tf.config))
+            log.debug("{}: Dumping tree object that will be passed to JinjaUtils -> {}", log_msg, tree)
             tf_readme_template = ctx.obj.module_readme_template if type.lower() == "module" else ctx.obj.root_readme_template
             ReadMe = JinjaUtils(log=log)
             ReadMe.template_directory = ctx.obj.template_dir
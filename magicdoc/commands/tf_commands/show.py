@@ -15,11 +15,11 @@
 import click
 
 # Import Base Python Modules
-import os, sys, json, ntpath, inspect
+import os, sys, json, ntpath
 
 # Import MagicDoc Classes/Modules
+from magicdoc.classes.Log import log_context, function_name
 from magicdoc.modules.tree import DirTree
-from magicdoc.classes.GitParser import GitParser
 
 # Define Global Variables
 LOG_CONTEXT = "CMD->tf_show"
@@ -47,8 +47,8 @@ def files(ctx):
     """Display the terraform target project file lists."""
     # DEFINE_SELF: Assign function identifier, log and declare the cmd environment.
     log = ctx.obj.log
-    this = inspect.stack()[0][3]
-    log_msg = "{}.{}".format(LOG_CONTEXT, this)
+    this = function_name()
+    log_msg = log_context(LOG_CONTEXT)
 
     # LOCAL_ENV_VARIABLES: Define any local environments that the command function requires.
     files = ctx.obj.tf.files
@@ -69,6 +69,7 @@ def files(ctx):
         click.secho("Terraform file search target directory location: {}".format(ctx.obj.workdir), fg='blue')
         click.secho("  -> {} terraform file(s) found in target directory.".format(len(files.get('list_tf_files', []))), fg='bright_blue')
         click.secho("  -> {} tfvar file(s) found in target directory.".format(len(files.get('list_tfvar_files', []))), fg='bright_blue')
+        click.secho("  -> {} directory entries pruned from the search.".format(ctx.obj.tf._files_skipped), fg='bright_blue')
         click.echo()
 
         # List TF Files:
@@ -77,12 +78,12 @@ def files(ctx):
         for filename in files.get('list_tf_files', []):
             file_path, file_name = ntpath.split(filename)
             file_path = file_path.replace("/", "")
-            log.debug("{}: Using file path: {}".format(log_msg, str(file_path)))
-            log.debug("{}: Using file name: {}".format(log_msg, str(file_name)))
+            log.debug("{}: Using file path: {}", log_msg, str(file_path))
+            log.debug("{}: Using file name: {}", log_msg, str(file_name))
             if file_path != "":
                 click.secho("{}/".format(file_path), fg='bright_red', nl=False)
             click.secho(file_name, fg='cyan')
-        log.debug("{}: Listing .tf file results completed!".format(log_msg))
+        log.debug("{}: Listing .tf file results completed!", log_msg)
         click.echo()
 
         # List TFVar Files:
@@ -91,12 +92,12 @@ def files(ctx):
         for filename in files.get('list_tfvar_files', []):
             file_path, file_name = ntpath.split(filename)
             file_path = file_path.replace("/", "")
-            log.debug("{}: Using file path: {}".format(log_msg, str(file_path)))
-            log.debug("{}: Using file name: {}".format(log_msg, str(file_name)))
+            log.debug("{}: Using file path: {}", log_msg, str(file_path))
+            log.debug("{}: Using file name: {}", log_msg, str(file_name))
             if file_path != "":
                 click.secho("{}/".format(file_path), fg='bright_red', nl=False)
             click.secho(file_name, fg='cyan')
-        log.debug("{}: Listing .tfvar file results completed!".format(log_msg))
+        log.debug("{}: Listing .tfvar file results completed!", log_msg)
         click.echo()
     except Exception as e:
         log.write("MagicDoc failed to parse the terraform project files object! Check your syntax, and retry. If you feel this is a bug please submit an issue on the project repository.", 'error', arg_upper_nl=True, arg_lower_nl=True)
@@ -121,8 +122,8 @@ def variables(ctx, include_examples: bool):
     """Display Terraform Project Variables."""
     # DEFINE_SELF: Assign function identifier, log and declare the cmd environment.
     log = ctx.obj.log
-    this = inspect.stack()[0][3]
-    log_msg = "{}.{}".format(LOG_CONTEXT, this)
+    this = function_name()
+    log_msg = log_context(LOG_CONTEXT)
 
     # CLS: Clear the screen for the command unless in verbose mode.
     log.clear()
@@ -138,9 +139,9 @@ def variables(ctx, include_examples: bool):
     # COMMAND SYNTAX: Define the command sequence.
     try:
         # LOCAL_ENV_VARIABLES: Define any local environments that the command function requires.
-        # Trigger the property setter to populate the variables object, then assign it for usage.
-        click.secho("Parsing variables.tf files for Terraform variables...", fg='green')
-        ctx.obj.tf.variables = include_examples
+        # Select the include_examples setting, the variables are collected lazily when the property is first read.
+        click.secho("Parsing terraform files for Terraform variables...", fg='green')
+        ctx.obj.tf.include_examples = include_examples
         variables = ctx.obj.tf.variables
 
         click.secho("Terraform variable search target directory location: {}".format(ctx.obj.workdir), fg='blue')
@@ -153,28 +154,28 @@ def variables(ctx, include_examples: bool):
         click.secho("=====================================", fg='yellow')
         for var in variables.get('required_vars', []):
             offset = variables.get('required_vars_maxlength', 0) - len(var.get('name', ""))
-            log.debug("{}: Setting required variable offset to: {}".format(log_msg, offset))
-            log.debug("{}: Printing defined required variable: {}!".format(log_msg, var.get('name', "")))
+            log.debug("{}: Setting required variable offset to: {}", log_msg, offset)
+            log.debug("{}: Printing defined required variable: {}!", log_msg, var.get('name', ""))
             # Check variable type and fix formatting
-            log.debug("{}: Checking variable type and adjusting display format".format(log_msg))
+            log.debug("{}: Checking variable type and adjusting display format", log_msg)
             click.secho("{}{} = ".format(var.get('name', ""), " " * offset), fg='blue', nl=False)
             # Print example value in list, set, or tuple format:
             if var.get('type', 'string').startswith(('list', 'set', 'tuple')):
-                log.debug("{}: Variable type set to list, set, or tuple... adjusting example format".format(log_msg))
+                log.debug("{}: Variable type set to list, set, or tuple... adjusting example format", log_msg)
                 ctx.obj.format_as_list(['Required_Value_1', 'Required_Value_2'])
             # Print example value in map or object format:
             elif var.get('type', 'string').startswith(('map', 'object')):
-                log.debug("{}: Variable type set to map, or object... adjusting example format".format(log_msg))
+                log.debug("{}: Variable type set to map, or object... adjusting example format", log_msg)
                 ctx.obj.format_as_map({'Required_Variable_1': 'Required_Value_1', 'Required_Variable_2': 'Required_Value_2'})
             # Print example value in number format:
             elif var.get('type', 'string').startswith('number'):
-                log.debug("{}: Variable type set to number... adjusting example format".format(log_msg))
+                log.debug("{}: Variable type set to number... adjusting example format", log_msg)
                 click.secho(100, fg='bright_red')
             # Just print in normal string format.
             else:
-                log.debug("{}: Variable type is set to string or undefined.. printing in raw string value format".format(log_msg))
+                log.debug("{}: Variable type is set to string or undefined.. printing in raw string value format", log_msg)
                 click.secho("'Required Value'", fg='green')
-        log.debug("{}: Listing required variable results completed!".format(log_msg))
+        log.debug("{}: Listing required variable results completed!", log_msg)
         click.echo()
 
         # List TF Optional Variables:
@@ -182,27 +183,27 @@ def variables(ctx, include_examples: bool):
         click.secho("=====================================", fg='yellow')
         for var in variables.get('optional_vars', []):
             offset = variables.get('optional_vars_maxlength', 0) - len(var.get('name', ""))
-            log.debug("{}: Setting optional variable offset to: {}".format(log_msg, offset))
-            log.debug("{}: Printing defined optional variable: {}!".format(log_msg, var.get('name', "")))
-            log.debug("{}: Checking variable type and adjusting display format".format(log_msg))
+            log.debug("{}: Setting optional variable offset to: {}", log_msg, offset)
+            log.debug("{}: Printing defined optional variable: {}!", log_msg, var.get('name', ""))
+            log.debug("{}: Checking variable type and adjusting display format", log_msg)
             click.secho("{}{} = ".format(var.get('name', ""), " " * offset), fg='blue', nl=False)
             # Print example value in list, set, or tuple format:
             if var.get('type', 'string').startswith(('list', 'set', 'tuple')):
-                log.debug("{}: Variable type set to list, set, or tuple... adjusting example format".format(log_msg))
+                log.debug("{}: Variable type set to list, set, or tuple... adjusting example format", log_msg)
                 ctx.obj.format_as_list(var.get('default', ['Example_Value_1', 'Example_Value_2']))
             # Print example value in map or object format:
             elif var.get('type', 'string').startswith(('map', 'object')):
-                log.debug("{}: Variable type set to map, or object... adjusting example format".format(log_msg))
+                log.debug("{}: Variable type set to map, or object... adjusting example format", log_msg)
                 ctx.obj.format_as_map(var.get('default', {'Example_Key_1': 'Example_Value_1', 'Example_Key_2': 'Example_Value_2'}))
             # Print example value in number format:
             elif var.get('type', 'string').startswith('number'):
-                log.debug("{}: Variable type set to number... adjusting example format".format(log_msg))
+                log.debug("{}: Variable type set to number... adjusting example format", log_msg)
                 click.secho("{}".format(var.get('default', 100)), fg='bright_red')
             # Just print in normal string format.
             else:
-                log.debug("{}: Variable type is set to string or undefined.. printing in raw string value format".format(log_msg))
+                log.debug("{}: Variable type is set to string or undefined.. printing in raw string value format", log_msg)
                 click.secho("'{}'".format(var.get('default', 'Example_Value')), fg='green')
-        log.debug("{}: Listing optional variable results completed!".format(log_msg))
+        log.debug("{}: Listing optional variable results completed!", log_msg)
         click.echo()
     except Exception as e:
         log.write("MagicDoc failed to parse the terraform project variables object! Check your syntax, and retry. If you feel this is a bug please submit an issue on the project repository.".format(log_msg), 'error', arg_lower_nl=True, arg_upper_nl=True)
@@ -228,8 +229,8 @@ def outputs(ctx, include_examples):
     """Display Terraform Project Outputs"""
     # DEFINE_SELF: Assign function identifier, log and declare the cmd environment.
     log = ctx.obj.log
-    this = inspect.stack()[0][3]
-    log_msg = "{}.{}".format(LOG_CONTEXT, this)
+    this = function_name()
+    log_msg = log_context(LOG_CONTEXT)
 
     # CLS: Clear the screen for the command unless in verbose mode.
     log.clear()
@@ -245,9 +246,9 @@ def outputs(ctx, include_examples):
     # COMMAND SYNTAX: Define the command sequence.
     try:
         # LOCAL_ENV_VARIABLES: Define any local environments that the command function requires.
-        # Trigger the property setter to populate the outputs object, then assign it for usage.
-        click.secho("Parsing outputs.tf files for Terraform outputs...", fg='green')
-        ctx.obj.tf.outputs = include_examples
+        # Select the include_examples setting, the outputs are collected lazily when the property is first read.
+        click.secho("Parsing terraform files for Terraform outputs...", fg='green')
+        ctx.obj.tf.include_examples = include_examples
         outputs = ctx.obj.tf.outputs
 
         click.secho("Terraform output search target directory location: {}".format(ctx.obj.workdir), fg='blue')
@@ -259,7 +260,7 @@ def outputs(ctx, include_examples):
         # Check length of output name, if longer then current value replace. This variable will be used for alignment offset.
         for output in outputs:
             local_outputs_maxlength = len(output.get('name')) if len(output.get('name')) > local_outputs_maxlength else local_outputs_maxlength
-            log.debug("{}: Output maxlength offset value set to {}".format(log_msg, local_outputs_maxlength))
+            log.debug("{}: Output maxlength offset value set to {}", log_msg, local_outputs_maxlength)
         
         # Iterate back through the output list, and print all the things.
         for output in outputs:
@@ -268,7 +269,7 @@ def outputs(ctx, include_examples):
             click.secho("{}{}".format(" " * 4, output.get('value', 'resource.name.arn')), fg='green')
             click.secho("}", fg='blue')
             click.echo()
-        log.debug("{}: Listing output results completed!".format(log_msg))
+        log.debug("{}: Listing output results completed!", log_msg)
         click.echo()
     except Exception as e:
         log.write("MagicDoc failed to parse the terraform project outputs object! Check your syntax, and retry. If you feel this is a bug please submit an issue on the project repository.", 'error', arg_lower_nl=True, arg_upper_nl=True)
@@ -288,8 +289,8 @@ def tree(ctx):
     """Display Terraform Project Directory Tree"""
     # DEFINE_SELF: Assign function identifier, log and declare the cmd environment.
     log = ctx.obj.log
-    this = inspect.stack()[0][3]
-    log_msg = "{}.{}".format(LOG_CONTEXT, this)
+    this = function_name()
+    log_msg = log_context(LOG_CONTEXT)
 
     # CLS: Clear the screen for the command unless in verbose mode.
     log.clear()
@@ -304,15 +305,15 @@ def tree(ctx):
 
     # COMMAND SYNTAX: Define the command sequence.
     try:
-        log.debug("{}: Call tree constructor module...".format(log_msg))
+        log.debug("{}: Call tree constructor module...", log_msg)
         # Call the tree module to construct the tree variable used for output.
         local_dir_tree = DirTree(ctx.obj.log, ctx.obj.workdir)
-        log.debug("{}: Directory tree render completed!".format(log_msg))
+        log.debug("{}: Directory tree render completed!", log_msg)
         click.secho(local_dir_tree, fg='blue')
         click.echo()
     except Exception as e:
         log.write("MagicDoc failed to render directory tree structure! Check your syntax, and retry. If you feel this is a bug please submit an issue on the project repository.", 'warning', arg_upper_nl=True, arg_lower_nl=True)
-        log.warning("{}: MagicDoc failed to render directory tree structure! Check your syntax, and retry. If you feel this is a bug please submit an issue on the project repository.".format(log_msg))
+        log.warning("{}: MagicDoc failed to render directory tree structure! Check your syntax, and retry. If you feel this is a bug please submit an issue on the project repository.", log_msg)
         log.warning("{}: Exception: {}".format(str(e)).format(log_msg))
         click.echo()
         sys.exit()
@@ -327,22 +328,50 @@ def tree(ctx):
     '--overwrite', '-o', show_envvar=True,
     type=click.BOOL,
     default=False,
-    help='Overwrite existing .terraform init if found.'
+    help='Regenerate the graph instead of using a cached one. Only used by the terraform engine.'
+)
+@click.option(
+    '--engine', '-e', show_envvar=True,
+    type=click.Choice(['native', 'terraform'], case_sensitive=False),
+    default='native',
+    help='Build the graph natively from the parsed terraform files, or with terraform init and terraform graph, which needs the terraform binary and network access.'
+)
+@click.option(
+    '--simplify', '-s', show_envvar=True,
+    type=click.BOOL,
+    default=False,
+    help='Display the simplified graph that is rendered to images, without provider and bookkeeping nodes, with modules collapsed and implied edges removed.'
+)
+@click.option(
+    '--max_nodes', '-m', show_envvar=True,
+    type=click.IntRange(min=0),
+    default=None,
+    help='Most nodes that the simplified graph keeps, the most connected nodes are kept. 0 keeps every node. Defaults to 150.'
+)
+@click.option(
+    '--report', '-r', show_envvar=True,
+    type=click.BOOL,
+    default=False,
+    help='Display a report of the graph size, the nodes with the most dependents and dependencies, and the longest dependency chain instead of the graph. Reports on the simplified graph with --simplify.'
 )
 @click.pass_context
-def graph(ctx, overwrite):
+def graph(ctx, overwrite, engine, simplify, max_nodes, report):
     """Display Terraform Project dot Graph Object"""
     # DEFINE_SELF: Assign function identifier, log and declare the cmd environment.
     log = ctx.obj.log
-    this = inspect.stack()[0][3]
-    log_msg = "{}.{}".format(LOG_CONTEXT, this)
+    this = function_name()
+    log_msg = log_context(LOG_CONTEXT)
+    # The graph module and GraphModel class are imported by the command that uses them, so that loading the CLI stays cheap.
+    from magicdoc.modules.graph import GRAPH_MAX_NODES
+    from magicdoc.classes.GraphModel import GraphModel
+    max_nodes = GRAPH_MAX_NODES if max_nodes is None else max_nodes
 
     # CLS: Clear the screen for the command unless in verbose mode.
     log.clear()
 
     # HEADER Command function header.
     # Options arg can be passed in the format of {'Option Text': 'Value'}
-    log.header(log_msg, "show {}".format(this), "MagicDoc Terraform Project Graph dot Structure:", arg_args={'Overwrite Existing .terraform Directory': str(overwrite)})
+    log.header(log_msg, "show {}".format(this), "MagicDoc Terraform Project Graph dot Structure:", arg_args={'Graph Engine': engine.lower(), 'Simplify Graph': str(simplify), 'Max Nodes': str(max_nodes), 'Report': str(report), 'Overwrite Existing Sandbox Init': str(overwrite)})
 
     # ACTION_TITLE: Define the command action title
     log.write("MagicDoc [tf show {}] Command Environment:".format(this), arg_lower_nl=False)
@@ -350,23 +379,43 @@ def graph(ctx, overwrite):
 
     # COMMAND SYNTAX: Define the command sequence.
     try:
-        log.debug("{}: Calling terraform dot graph file generation on target project directory: {}.".format(log_msg, ctx.obj.workdir))
+        log.debug("{}: Calling terraform dot graph file generation on target project directory: {}.", log_msg, ctx.obj.workdir)
 
-        # Trigger the property setter to populate the outputs object, then assign it for usage.
+        # Trigger the property setter only when a refresh of an existing init was requested, otherwise the graph is generated lazily on first read.
         click.secho("Generating terraform graph dot object...", fg='green')
-        ctx.obj.tf.graph = overwrite
-        graph = ctx.obj.tf.graph
+        ctx.obj.tf.graph_engine = engine.lower()
+        ctx.obj.tf.graph_max_nodes = max_nodes
+        if overwrite:
+            ctx.obj.tf.graph = overwrite
+        graph = ctx.obj.tf.simplified_graph if simplify else ctx.obj.tf.graph
         
-        if graph is not None:
-            log.debug("{}: Terraform project graph structure object instantiation completed successfully!".format(log_msg))
+        if graph is not None and report:
+            log.debug("{}: Terraform project graph structure object instantiation completed successfully!", log_msg)
+            # The project graph model is parsed once per graph, the simplified graph is modelled on demand.
+            graph_model = GraphModel(log, graph) if simplify else ctx.obj.tf.graph_model
+            click.secho("Nodes: {}    Edges: {}".format(graph_model.node_count, graph_model.edge_count), fg='blue')
+            click.echo()
+            click.secho("Most Dependents (fan-in):", fg='green')
+            for address, count in graph_model.ranked(graph_model.fan_in()):
+                click.secho("  {:<6} {}".format(count, address), fg='blue')
+            click.echo()
+            click.secho("Most Dependencies (fan-out):", fg='green')
+            for address, count in graph_model.ranked(graph_model.fan_out()):
+                click.secho("  {:<6} {}".format(count, address), fg='blue')
+            click.echo()
+            longest_chain = graph_model.longest_chain()
+            click.secho("Longest Dependency Chain ({} nodes):".format(len(longest_chain)), fg='green')
+            click.secho("  {}".format(" -> ".join(longest_chain)), fg='blue')
+        elif graph is not None:
+            log.debug("{}: Terraform project graph structure object instantiation completed successfully!", log_msg)
             click.secho(graph, fg='blue')
         else:
-            click.secho("Attempt to generate Terraform project graph structure object failed! See debug log for details", 'bright_red')
+            click.secho("Attempt to generate Terraform project graph structure object failed! See debug log for details", fg='bright_red')
         click.echo()
     except Exception as e:
         log.write("MagicDoc failed to generate graph dot structure object! Check your syntax, and retry. If you feel this is a bug please submit an issue on the project repository.", 'warning', arg_upper_nl=True, arg_lower_nl=True)
-        log.warning("{}: MagicDoc failed to generate graph dot structure object! Check your syntax, and retry. If you feel this is a bug please submit an issue on the project repository.".format(log_msg))
-        log.warning("{}: Exception: {}".format(log_msg, str(e)))
+        log.warning("{}: MagicDoc failed to generate graph dot structure object! Check your syntax, and retry. If you feel this is a bug please submit an issue on the project repository.", log_msg)
+        log.warning("{}: Exception: {}", log_msg, str(e))
         click.echo()
         sys.exit()
 
@@ -381,8 +430,8 @@ def git(ctx):
     """Display Terraform Project Git Config Data"""
     # DEFINE_SELF: Assign function identifier, log and declare the cmd environment.
     log = ctx.obj.log
-    this = inspect.stack()[0][3]
-    log_msg = "{}.{}".format(LOG_CONTEXT, this)
+    this = function_name()
+    log_msg = log_context(LOG_CONTEXT)
 
     # CLS: Clear the screen for the command unless in verbose mode.
     log.clear()
@@ -397,23 +446,23 @@ def git(ctx):
 
     # COMMAND SYNTAX: Define the command sequence.
     try:
-        log.debug("{}: Calling GitParser to attempt to parse the target project git config: {}.".format(log_msg, os.path.join(ctx.obj.workdir, '.git/config')))
+        log.debug("{}: Calling GitParser to attempt to parse the target project git config: {}.", log_msg, os.path.join(ctx.obj.workdir, '.git/config'))
 
         # Trigger the property setter to populate the outputs object, then assign it for usage.
         click.secho("Attempting to parse target project git config...", fg='green')
-        git = GitParser(ctx.obj.log, ctx.obj.workdir)
+        git = ctx.obj.git_parser()
         
         if git.config is not None and isinstance(git.config, list) and len(git.config) > 0:
-            log.debug("{}: Terraform project repo object instantiation completed successfully!".format(log_msg))
+            log.debug("{}: Terraform project repo object instantiation completed successfully!", log_msg)
             for item in git.config:
                 ctx.obj.format_as_map(item)
         else:
-            click.secho("Attempt to parse Terraform project git config failed! See debug log for details", 'bright_red')
+            click.secho("Attempt to parse Terraform project git config failed! See debug log for details", fg='bright_red')
         click.echo()
     except Exception as e:
         log.write("MagicDoc failed to parse git config for target project! Ensure that the project has a git configuration and try again.", 'warning', arg_upper_nl=True, arg_lower_nl=True)
-        log.warning("{}: MagicDoc failed to parse git config for target project!".format(log_msg))
-        log.warning("{}: Exception: {}".format(log_msg, str(e)))
+        log.warning("{}: MagicDoc failed to parse git config for target project!", log_msg)
+        log.warning("{}: Exception: {}", log_msg, str(e))
         click.echo()
         sys.exit()
 
@@ -434,8 +483,8 @@ def repo(ctx, auth):
     """Display Terraform Project Git Repository Data"""
     # DEFINE_SELF: Assign function identifier, log and declare the cmd environment.
     log = ctx.obj.log
-    this = inspect.stack()[0][3]
-    log_msg = "{}.{}".format(LOG_CONTEXT, this)
+    this = function_name()
+    log_msg = log_context(LOG_CONTEXT)
 
     # CLS: Clear the screen for the command unless in verbose mode.
     log.clear()
@@ -451,24 +500,24 @@ def repo(ctx, auth):
 
     # COMMAND SYNTAX: Define the command sequence.
     try:
-        log.debug("{}: Calling GitParser to attempt to send GET request to target project repository: {}.".format(log_msg, os.path.join(ctx.obj.workdir, '.git/config')))
+        log.debug("{}: Calling GitParser to attempt to send GET request to target project repository: {}.", log_msg, os.path.join(ctx.obj.workdir, '.git/config'))
 
         # Trigger the property setter to populate the outputs object, then assign it for usage.
         click.secho("Git Repository Response:", fg='yellow')
         click.secho("========================", fg='yellow')
-        git = GitParser(ctx.obj.log, ctx.obj.workdir)
+        git = ctx.obj.git_parser()
         
         if git.config is not None and isinstance(git.config, list) and len(git.config) > 0:
-            log.debug("{}: Terraform project repo object instantiation completed successfully!".format(log_msg))
+            log.debug("{}: Terraform project repo object instantiation completed successfully!", log_msg)
             git.repo = auth
             ctx.obj.format_as_map(git.repo)
         else:
-            click.secho("The Terraform project git repository request failed! See debug log for details", 'bright_red')
+            click.secho("The Terraform project git repository request failed! See debug log for details", fg='bright_red')
         click.echo()
     except Exception as e:
         log.write("MagicDoc failed to receive valid data back from a sent request for the target directories  git repository. Please Ensure that the project has a git configuration and try again.", 'warning', arg_upper_nl=True, arg_lower_nl=True)
-        log.warning("{}: MagicDoc failed to receive a valid git repository response for the target project!".format(log_msg))
-        log.warning("{}: Exception: {}".format(log_msg, str(e)))
+        log.warning("{}: MagicDoc failed to receive a valid git repository response for the target project!", log_msg)
+        log.warning("{}: Exception: {}", log_msg, str(e))
         click.echo()
         sys.exit()
 
@@ -489,8 +538,8 @@ def release(ctx, auth):
     """Display Terraform Project Latest Release"""
     # DEFINE_SELF: Assign function identifier, log and declare the cmd environment.
     log = ctx.obj.log
-    this = inspect.stack()[0][3]
-    log_msg = "{}.{}".format(LOG_CONTEXT, this)
+    this = function_name()
+    log_msg = log_context(LOG_CONTEXT)
 
     # CLS: Clear the screen for the command unless in verbose mode.
     log.clear()
@@ -507,24 +556,87 @@ def release(ctx, auth):
 
     # COMMAND SYNTAX: Define the command sequence.
     try:
-        log.debug("{}: Calling GitParser to attempt to send GET request to target project repository release data: {}.".format(log_msg, os.path.join(ctx.obj.workdir, '.git/config')))
+        log.debug("{}: Calling GitParser to attempt to send GET request to target project repository release data: {}.", log_msg, os.path.join(ctx.obj.workdir, '.git/config'))
 
         # Trigger the property setter to populate the outputs object, then assign it for usage.
         click.secho("Project Latest Release:", fg='green')
         click.secho("=======================", fg='green')
-        git = GitParser(ctx.obj.log, ctx.obj.workdir)
+        git = ctx.obj.git_parser()
         
         if git.config is not None and isinstance(git.config, list) and len(git.config) > 0:
-            log.debug("{}: Terraform project config object instantiation completed successfully!".format(log_msg))
+            log.debug("{}: Terraform project config object instantiation completed successfully!", log_msg)
             # Call the repo method to gather the required data from github.
             git.repo = auth
             ctx.obj.log.args("{} Latest Release".format(git.repo.get('name')), "     {}".format(git.release))
         else:
-            click.secho("The Terraform project git repository release request failed! See debug log for details", 'bright_red')
+            click.secho("The Terraform project git repository release request failed! See debug log for details", fg='bright_red')
         click.echo()
     except Exception as e:
         log.write("MagicDoc failed to receive valid data back from a request sent to obtain the lastest project release. Please Ensure that the project has a git configuration and try again.", 'warning', arg_upper_nl=True, arg_lower_nl=True)
-        log.warning("{}: MagicDoc failed to receive a valid git repository release response for the target project!".format(log_msg))
-        log.warning("{}: Exception: {}".format(log_msg, str(e)))
+        log.warning("{}: MagicDoc failed to receive a valid git repository release response for the target project!", log_msg)
+        log.warning("{}: Exception: {}", log_msg, str(e))
+        click.echo()
+        sys.exit()
+
+
+###############################
+# TF Repos CMD:
+# CMD: magicdoc tf show repos
+################################
+@show.command()
+@click.option(
+    '--auth', '-a', show_envvar=True,
+    type=click.STRING,
+    default=None,
+    help='Provide Git Repository Auth Token. With a token, every repository is resolved with batched Github GraphQL requests.'
+)
+@click.option(
+    '--concurrency', '-c', show_envvar=True,
+    type=click.IntRange(min=1),
+    default=8,
+    help='Maximum number of repository requests in flight at once, for the repositories that are not resolved in batches.'
+)
+@click.pass_context
+def repos(ctx, auth, concurrency):
+    """Display Git Repository and Latest Release of every Terraform Module Directory"""
+    # DEFINE_SELF: Assign function identifier, log and declare the cmd environment.
+    log = ctx.obj.log
+    this = function_name()
+    log_msg = log_context(LOG_CONTEXT)
+
+    # CLS: Clear the screen for the command unless in verbose mode.
+    log.clear()
+
+    # HEADER Command function header.
+    # Options arg can be passed in the format of {'Option Text': 'Value'}
+    log.header(log_msg, "show {}".format(this), "MagicDoc Terraform Project Module Repositories:", arg_args={'Git Authentication Token Provided': str(bool(auth))})
+
+    # ACTION_TITLE: Define the command action title
+    log.write("MagicDoc [tf show {}] Command Environment:".format(this), arg_lower_nl=False)
+    log.write("Sending Terraform Module Git Repository Requests...", arg_upper_nl=False, arg_lower_nl=True)
+
+    # COMMAND SYNTAX: Define the command sequence.
+    try:
+        # Every directory that holds project .tf files, outside of example directories, is treated as a module.
+        tf = ctx.obj.tf
+        module_dirs = sorted(set(os.path.dirname(tf_file) for tf_file in tf.files.get('list_tf_files', []) if tf.include_file(tf_file)))
+        log.debug("{}: Found {} module directories: {}", log_msg, len(module_dirs), module_dirs)
+        parsers = [ctx.obj.git_parser(os.path.join(ctx.obj.workdir, module_dir)) for module_dir in module_dirs]
+
+        # Resolve as many modules as possible in batches, then fall back to concurrent requests for the rest.
+        from magicdoc.classes.GitParser import GitParser
+        from magicdoc.classes.AsyncGitClient import AsyncGitClient
+        AsyncGitClient(log, ctx.obj.http, concurrency).resolve(GitParser.batch_request(parsers, auth), auth)
+
+        click.secho("Module Repositories:", fg='yellow')
+        click.secho("====================", fg='yellow')
+        for module_dir, git in zip(module_dirs, parsers):
+            repo_data = git._repo or {}
+            ctx.obj.log.args(module_dir or ".", "{}  {}".format(repo_data.get('full_name', 'Unavailable'), git._release or 'Unavailable'), arg_lower_nl=False)
+        click.echo()
+    except Exception as e:
+        log.write("MagicDoc failed to receive valid data back from the requests sent for the project module git repositories. Please Ensure that the project has a git configuration and try again.", 'warning', arg_upper_nl=True, arg_lower_nl=True)
+        log.warning("{}: MagicDoc failed to receive valid git repository responses for the project modules!", log_msg)
+        log.warning("{}: Exception: {}", log_msg, str(e))
         click.echo()
         sys.exit()
@@ -0,0 +1,102 @@
+##############################################################################
+# CloudMage : MagicDoc Benchmark Module
+#=============================================================================
+# CloudMage MagicDoc Automatic Documentation Generator CLI Utility/Library
+#   - CLI Startup Benchmark Module
+#   - Usage: python -m magicdoc.modules.benchmark [-d DIR] [-r REPEAT] [-b BUDGET_MS] [-ib IMPORT_BUDGET_MS]
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/28/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Pip Installed Modules:
+import click
+
+# Import Base Python Modules
+import os, sys, time, statistics, subprocess
+
+# Commands measured by default, from the cheapest to the most expensive.
+DEFAULT_COMMANDS = (
+    ('--help',),
+    ('tf', 'env'),
+    ('tf', 'show', 'git'),
+    ('tf', 'show', 'files'),
+)
+# Commands that must start without importing any of the HEAVY_MODULES.
+LIGHT_COMMANDS = (
+    ('--help',),
+    ('tf', 'env'),
+)
+# Dependencies that are only imported by the code paths that use them.
+HEAVY_MODULES = ('hcl', 'yaml', 'requests', 'graphviz', 'python_terraform', 'jinja2', 'cloudmage.jinjautils')
+
+
+def BuildCommand(Args, Directory, Options=()):
+    """
+    Function that will construct the interpreter command line that runs a magicdoc command against the target directory.
+    tf commands are run with --no_cache, so that every repeat measures a cold run, and no scan manifest is written into the target directory.
+    """
+    return [sys.executable] + list(Options) + ['-m', 'magicdoc.main'] + list(Args[:1]) + (['-d', Directory, '--no_cache'] if Args[0] == 'tf' else []) + list(Args[1:])
+
+
+def TimeCommand(Args, Directory, Repeat):
+    """Function that will run a magicdoc command in a fresh interpreter, with the caches bypassed, Repeat times, and return the median wall time in milliseconds."""
+    Timings = []
+    Command = BuildCommand(Args, Directory)
+    for _ in range(Repeat):
+        Start = time.perf_counter()
+        subprocess.run(Command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, stdin=subprocess.DEVNULL)
+        Timings.append((time.perf_counter() - Start) * 1000)
+    return statistics.median(Timings)
+
+
+def ImportTime(Args, Directory):
+    """
+    Function that will run a magicdoc command with `python -X importtime`, and return a tuple of the total import time in milliseconds
+    and the list of HEAVY_MODULES that the command imported.
+    """
+    Result = subprocess.run(BuildCommand(Args, Directory, ('-X', 'importtime')), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, stdin=subprocess.DEVNULL, universal_newlines=True)
+    Total = 0
+    Imported = set()
+    # importtime lines are formatted as: `import time: self [us] | cumulative | imported package`, nested imports are indented.
+    for Line in Result.stderr.splitlines():
+        if not Line.startswith('import time:') or Line.endswith('imported package'):
+            continue
+        Self, Cumulative, Name = Line[len('import time:'):].split('|')
+        if not Name.startswith('  '):
+            Total += int(Cumulative)
+        Imported.add(Name.strip())
+    return Total / 1000, sorted(Module for Module in HEAVY_MODULES if Module in Imported)
+
+
+@click.command()
+@click.option('--directory', '-d', type=click.Path(exists=True, file_okay=False, resolve_path=True), default=os.getcwd(), help='Target project directory passed to the tf commands.')
+@click.option('--repeat', '-r', type=click.IntRange(min=1), default=5, help='Number of runs per command, the median is reported.')
+@click.option('--budget', '-b', type=click.FLOAT, default=None, help='Fail if any measured command takes longer than this many milliseconds.')
+@click.option('--import_budget', '-ib', type=click.FLOAT, default=None, help='Fail if any measured command spends longer than this many milliseconds importing modules.')
+def cli(directory, repeat, budget, import_budget):
+    """Measure the startup wall time and import time of magicdoc commands."""
+    Failed = False
+    click.secho("MagicDoc Startup Benchmark: {} ({} runs per command)".format(directory, repeat), fg='yellow')
+    click.secho("  {:<39}{:>13}{:>13}".format("Command", "Wall", "Imports"), fg='yellow')
+    for Args in DEFAULT_COMMANDS:
+        Median = TimeCommand(Args, directory, repeat)
+        Imports, Heavy = ImportTime(Args, directory)
+        Problems = []
+        if budget is not None and Median > budget:
+            Problems.append("OVER BUDGET")
+        if import_budget is not None and Imports > import_budget:
+            Problems.append("OVER IMPORT BUDGET")
+        if Args in LIGHT_COMMANDS and Heavy:
+            Problems.append("IMPORTED {}".format(", ".join(Heavy)))
+        Failed = Failed or bool(Problems)
+        click.secho("  magicdoc {:<30}".format(" ".join(Args)), fg='blue', nl=False)
+        click.secho("{:>10.1f} ms{:>10.1f} ms{}".format(Median, Imports, "".join("  [{}]".format(Problem) for Problem in Problems)), fg='red' if Problems else 'green')
+    sys.exit(1 if Failed else 0)
+
+
+if __name__ == '__main__':
+    cli()
@@ -0,0 +1,230 @@
+##############################################################################
+# CloudMage : MagicDoc Git Repository Module
+#=============================================================================
+# CloudMage MagicDoc Automatic Documentation Generator CLI Utility/Library
+#   - Local Git Repository Reader Module
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/28/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Base Python Modules
+import os, re
+
+# Import MagicDoc Classes/Modules
+from magicdoc.classes.Log import log_context
+
+# Define Global Variables
+LOG_CONTEXT = "MOD->gitrepo"
+
+# Parsed remotes of each git config, keyed by the repository common directory, so that every module directory of a monorepo shares one parse.
+_REMOTES_CACHE = {}
+# Limit on nested [include] files, git itself uses 10.
+MAX_INCLUDE_DEPTH = 10
+
+# Semantic version tags, with an optional leading v, pre-release and build metadata: v1.2.3, 1.2.3-rc.1, v1.2.3+build.5
+SEMVER_PATTERN = re.compile(r'^v?(\d+)\.(\d+)\.(\d+)(?:-([0-9A-Za-z.-]+))?(?:\+[0-9A-Za-z.-]+)?$')
+
+
+def FindGitDir(Path):
+    """
+    Function that will walk up from Path to the root of the git repository that contains it, and return a tuple of the repository root,
+    the git directory and the common git directory, or None if Path is not inside a git repository.
+    A .git file, as used by worktrees and submodules, is followed to the git directory it points at. Worktree git directories share
+    their config, refs and packed-refs with the main repository through their commondir file.
+    """
+    Current = os.path.abspath(Path)
+    while True:
+        DotGit = os.path.join(Current, '.git')
+        GitDir = None
+        if os.path.isdir(DotGit):
+            GitDir = DotGit
+        elif os.path.isfile(DotGit):
+            try:
+                with open(DotGit) as f:
+                    Line = f.readline().strip()
+                if Line.startswith('gitdir:'):
+                    GitDir = os.path.normpath(os.path.join(Current, Line[len('gitdir:'):].strip()))
+            except OSError:
+                pass
+        if GitDir is not None:
+            CommonDir = GitDir
+            try:
+                with open(os.path.join(GitDir, 'commondir')) as f:
+                    CommonDir = os.path.normpath(os.path.join(GitDir, f.read().strip()))
+            except OSError:
+                pass
+            return Current, GitDir, CommonDir
+        Parent = os.path.dirname(Current)
+        if Parent == Current:
+            return None
+        Current = Parent
+
+
+def ReadConfig(Log, ConfigPath, Depth=0):
+    """
+    Function that will parse a git config file into a list of (section, subsection, key, value) tuples in file order.
+    Section and key names are lower cased, as git treats them case insensitively. Quoted values, escapes, comments and line continuations
+    are handled, and the files named by [include] path entries are read in place, relative to the including file.
+    """
+    log_msg = log_context(LOG_CONTEXT)
+    Entries = []
+    try:
+        with open(ConfigPath) as f:
+            Lines = f.read().split('\n')
+    except OSError as e:
+        Log.debug("{}: Unable to read git config {}: {}", log_msg, ConfigPath, str(e))
+        return Entries
+    Section, Subsection = None, None
+    Index = 0
+    while Index < len(Lines):
+        Line = Lines[Index]
+        Index += 1
+        # A trailing backslash continues the value on the next line.
+        while Line.endswith('\\') and Index < len(Lines):
+            Line = Line[:-1] + Lines[Index]
+            Index += 1
+        Stripped = Line.strip()
+        if not Stripped or Stripped.startswith(('#', ';')):
+            continue
+        if Stripped.startswith('['):
+            Header = Stripped[1:Stripped.index(']')] if ']' in Stripped else Stripped[1:]
+            Name, _, Sub = Header.partition(' ')
+            Section = Name.strip().lower()
+            Subsection = Sub.strip().strip('"') if Sub.strip() else None
+            # The older [section.subsection] form.
+            if Subsection is None and '.' in Section:
+                Section, _, Subsection = Section.partition('.')
+            # Anything after the header on the same line is a key.
+            Stripped = Stripped[Stripped.index(']') + 1:].strip() if ']' in Stripped else ''
+            if not Stripped:
+                continue
+        Key, Equals, Value = Stripped.partition('=')
+        Key = Key.strip().lower()
+        Value = ParseConfigValue(Value) if Equals else 'true'
+        if Section == 'include' and Key == 'path':
+            if Depth >= MAX_INCLUDE_DEPTH:
+                Log.warning("{}: Git config include depth exceeded at {}", log_msg, ConfigPath)
+                continue
+            IncludePath = os.path.join(os.path.dirname(ConfigPath), os.path.expanduser(Value))
+            Log.debug("{}: Following git config include: {}", log_msg, IncludePath)
+            Entries.extend(ReadConfig(Log, IncludePath, Depth + 1))
+            continue
+        Entries.append((Section, Subsection, Key, Value))
+    return Entries
+
+
+def ParseConfigValue(Value):
+    """Function that will decode a git config value, removing quotes, inline comments and escape sequences."""
+    Result = []
+    Quoted = False
+    Index = 0
+    Value = Value.strip()
+    while Index < len(Value):
+        Char = Value[Index]
+        if Char == '"':
+            Quoted = not Quoted
+        elif Char in '#;' and not Quoted:
+            break
+        elif Char == '\\' and Index + 1 < len(Value):
+            Index += 1
+            Result.append({'n': '\n', 't': '\t', 'b': '\b'}.get(Value[Index], Value[Index]))
+        else:
+            Result.append(Char)
+        Index += 1
+    return ''.join(Result).strip()
+
+
+def ParseRemoteUrl(Url):
+    """
+    Function that will split a git remote URL into a dictionary of the url, provider host, namespace and repository name.
+    scp style (git@host:namespace/name.git), ssh://, git:// and http(s):// URLs are supported, and nested namespaces such as GitLab subgroups are kept whole.
+    Returns None for URLs that do not name a hosted repository, such as local paths.
+    """
+    Match = re.match(r'^(?:[a-z+]+://)?(?:[^@/]+@)?([^/:]+)(?::\d+)?[:/](.+?)(?:\.git)?/?$', Url.strip())
+    if Match is None or '://' not in Url and ':' not in Url:
+        return None
+    Provider, RepoPath = Match.groups()
+    Parts = [Part for Part in RepoPath.split('/') if Part]
+    if len(Parts) < 2:
+        return None
+    return {'url': Url.strip(), 'namespace': '/'.join(Parts[:-1]), 'name': Parts[-1], 'provider': Provider}
+
+
+def ReadRemotes(Log, CommonDir):
+    """
+    Function that will return the list of parsed remote URLs of the repository with the given common git directory, with the origin remote first.
+    Results are cached for the lifetime of the process, keyed by the common directory.
+    """
+    log_msg = log_context(LOG_CONTEXT)
+    CacheKey = os.path.realpath(CommonDir)
+    if CacheKey in _REMOTES_CACHE:
+        Log.debug("{}: Using cached git remotes for {}", log_msg, CacheKey)
+        return [dict(Remote) for Remote in _REMOTES_CACHE[CacheKey]]
+    Remotes = []
+    for Section, Subsection, Key, Value in ReadConfig(Log, os.path.join(CommonDir, 'config')):
+        if Section == 'remote' and Key == 'url':
+            Remote = ParseRemoteUrl(Value)
+            if Remote is not None:
+                Remotes.append((Subsection != 'origin', Remote))
+            else:
+                Log.debug("{}: Skipping remote {} with unsupported URL: {}", log_msg, Subsection, Value)
+    # sorted is stable, so the remaining remotes keep their config file order behind origin.
+    Remotes = [Remote for IsNotOrigin, Remote in sorted(Remotes, key=lambda Item: Item[0])]
+    _REMOTES_CACHE[CacheKey] = Remotes
+    Log.debug("{}: Parsed {} git remotes from {}", log_msg, len(Remotes), CommonDir)
+    return [dict(Remote) for Remote in Remotes]
+
+
+def ReadTags(Log, GitDir):
+    """
+    Function that will return the set of tag names in a git directory, read directly from the loose refs in refs/tags
+    and from the packed-refs file, without running git.
+    """
+    log_msg = log_context(LOG_CONTEXT)
+    Tags = set()
+    TagsDir = os.path.join(GitDir, 'refs', 'tags')
+    # Loose tags are files under refs/tags, and may be nested, for example refs/tags/release/v1.0.0.
+    for Root, Dirs, Files in os.walk(TagsDir):
+        for File in Files:
+            Tags.add(os.path.relpath(os.path.join(Root, File), TagsDir).replace(os.sep, '/'))
+    # Packed tags are `<sha> refs/tags/<name>` lines. Comment lines start with # and peeled tag lines start with ^.
+    try:
+        with open(os.path.join(GitDir, 'packed-refs')) as f:
+            for Line in f:
+                Parts = Line.split()
+                if len(Parts) == 2 and Parts[1].startswith('refs/tags/') and not Line.startswith(('#', '^')):
+                    Tags.add(Parts[1][len('refs/tags/'):])
+    except OSError:
+        pass
+    Log.debug("{}: Found {} tags in {}", log_msg, len(Tags), GitDir)
+    return Tags
+
+
+def SemverKey(Tag):
+    """
+    Function that will return a sort key for a semantic version tag, or None if the tag is not a semantic version.
+    Pre-release versions sort before their release, and pre-release identifiers are compared numerically where they are numbers.
+    """
+    Match = SEMVER_PATTERN.match(Tag)
+    if Match is None:
+        return None
+    Major, Minor, Patch, PreRelease = Match.groups()
+    if PreRelease is None:
+        return (int(Major), int(Minor), int(Patch), 1, ())
+    return (int(Major), int(Minor), int(Patch), 0, tuple((0, int(Part), '') if Part.isdigit() else (1, 0, Part) for Part in PreRelease.split('.')))
+
+
+def LatestTag(Log, GitDir):
+    """Function that will return the highest semantic version tag in a git directory, or None if it has no semantic version tags."""
+    log_msg = log_context(LOG_CONTEXT)
+    Versions = [(SemverKey(Tag), Tag) for Tag in ReadTags(Log, GitDir) if SemverKey(Tag) is not None]
+    if not Versions:
+        Log.info("{}: No semantic version tags were found in {}", log_msg, GitDir)
+        return None
+    Latest = max(Versions)[1]
+    Log.info("{}: Latest semantic version tag: {}", log_msg, Latest)
+    return Latest
@@ -0,0 +1,381 @@
+##############################################################################
+# CloudMage : MagicDoc Graph Module
+#=============================================================================
+# CloudMage MagicDoc Automatic Documentation Generator CLI Utility/Library
+#   - Native Terraform Dependency Graph Builder Module
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/28/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Base Python Modules
+# subprocess and concurrent.futures are imported by RenderImages, the only function that uses them, so that importing this module stays cheap.
+import os, re
+
+# Import MagicDoc Classes/Modules
+from magicdoc.classes.Log import log_context
+
+# Define Global Variables
+LOG_CONTEXT = "MOD->graph"
+
+# Graph engines. native builds the graph from the parsed project, terraform runs terraform init and terraform graph.
+GRAPH_ENGINES = ('native', 'terraform')
+# Image formats that graphs are rendered to, the first is the one shown in the readme.
+GRAPH_IMAGE_FORMATS = ('png', 'svg')
+# Seconds that a single dot render may take.
+DOT_TIMEOUT = 120
+# Most nodes that a simplified graph keeps, so that dot layout time stays bounded however large the project is.
+GRAPH_MAX_NODES = 150
+
+# Dotted references, such as var.name, aws_s3_bucket.b.arn or module.vpc.id, inside interpolations or depends_on entries.
+REFERENCE_PATTERN = re.compile(r'(?<![\w.-])[A-Za-z_][\w-]*(?:\.[A-Za-z_][\w-]*)+')
+# Block arguments that name things rather than reference them.
+META_ARGUMENTS = ('file', 'provider', 'source', 'alias')
+# Node shapes used by terraform graph.
+SHAPES = {'resource': 'box', 'provider': 'diamond', 'value': 'note', 'module': 'box3d'}
+# Nodes that terraform adds to every graph.
+COUNT_BOUNDARY_NODE = 'meta.count-boundary (EachMode fixup)'
+ROOT_NODE = 'root'
+# Node address prefixes and suffixes of the terraform bookkeeping nodes that a simplified graph drops.
+META_NODE_PREFIXES = ('meta.', 'provider.', 'provider[', 'provisioner.')
+META_NODE_SUFFIXES = (' (close)', ' (prepare state)')
+# Node and edge statements of terraform graph output, node IDs are quoted strings that may contain escaped quotes.
+DOT_NODE_PATTERN = re.compile(r'^\s*"((?:[^"\\]|\\.)*)"\s*\[(.*)\]\s*$')
+DOT_EDGE_PATTERN = re.compile(r'^\s*"((?:[^"\\]|\\.)*)"\s*->\s*"((?:[^"\\]|\\.)*)"')
+DOT_SHAPE_PATTERN = re.compile(r'shape\s*=\s*"?(\w+)"?')
+
+
+def ReferenceTargets(Value, Declared):
+    """Function that will return the set of declared graph node addresses that a parsed block value references, searching nested lists and dictionaries."""
+    Targets = set()
+    Pending = [Value]
+    while Pending:
+        Item = Pending.pop()
+        if isinstance(Item, dict):
+            Pending.extend(Item.values())
+        elif isinstance(Item, list):
+            Pending.extend(Item)
+        elif isinstance(Item, str):
+            for Reference in REFERENCE_PATTERN.findall(Item):
+                Target = ReferenceAddress(Reference.split('.'))
+                if Target in Declared:
+                    Targets.add(Target)
+    return Targets
+
+
+def ReferenceAddress(Parts):
+    """Function that will return the graph node address of a dotted reference split into its parts, var.name.attr -> var.name, data.type.name.attr -> data.type.name and type.name.attr -> type.name."""
+    if Parts[0] in ('var', 'local', 'module'):
+        return "{}.{}".format(Parts[0], Parts[1])
+    if Parts[0] == 'data':
+        return "data.{}".format(".".join(Parts[1:3])) if len(Parts) > 2 else None
+    return "{}.{}".format(Parts[0], Parts[1])
+
+
+def ProviderAddress(Type, Block):
+    """Function that will return the address of the provider that manages a resource or data source, the default provider of its type unless its provider argument picks one."""
+    Provider = Block.get('provider') if isinstance(Block, dict) else None
+    if isinstance(Provider, str) and Provider:
+        return "provider.{}".format(Provider.strip('${}'))
+    return "provider.{}".format(Type.split('_', 1)[0])
+
+
+def BuildGraph(Log, Model):
+    """
+    Function that will build a terraform graph style DOT definition of a root module from its parsed ProjectModel, without running terraform.
+    Nodes are the module variables, locals, outputs, module calls, resources, data sources and providers, and every edge points from a node to a node
+    that it references. Resources and data sources also depend on the provider that manages them, and the provider close, count boundary and root
+    nodes that terraform adds are included, so the result has the same structure as `terraform graph` output.
+    """
+    log_msg = log_context(LOG_CONTEXT)
+    Nodes = {}
+    Bodies = []
+    for Name in Model.variables:
+        Nodes["var.{}".format(Name)] = SHAPES['value']
+    for Name, Value in Model.locals.items():
+        Nodes["local.{}".format(Name)] = SHAPES['value']
+        Bodies.append(("local.{}".format(Name), Value))
+    for Name, Block in Model.outputs.items():
+        Nodes["output.{}".format(Name)] = SHAPES['value']
+        Bodies.append(("output.{}".format(Name), Block))
+    for Name, Block in Model.modules.items():
+        Nodes["module.{}".format(Name)] = SHAPES['resource']
+        Bodies.append(("module.{}".format(Name), Block))
+    for Name, Blocks in Model.providers.items():
+        for Block in Blocks:
+            Address = "provider.{}".format(Name) if not Block.get('alias') else "provider.{}.{}".format(Name, Block.get('alias'))
+            Nodes[Address] = SHAPES['provider']
+            Bodies.append((Address, Block))
+    Managed = []
+    for Prefix, Blocks in (('', Model.resources), ('data.', Model.data)):
+        for Type, Resources in Blocks.items():
+            for Name, Block in Resources.items():
+                Address = "{}{}.{}".format(Prefix, Type, Name)
+                Nodes[Address] = SHAPES['resource']
+                Bodies.append((Address, Block))
+                Managed.append((Address, ProviderAddress(Type, Block)))
+
+    # Reference edges, from each block to every declared node that its arguments refer to.
+    Declared = set(Nodes)
+    Edges = set()
+    for Address, Body in Bodies:
+        if isinstance(Body, dict):
+            Body = {Key: Value for Key, Value in Body.items() if Key not in META_ARGUMENTS}
+        for Target in ReferenceTargets(Body, Declared):
+            if Target != Address:
+                Edges.add((Address, Target))
+
+    # Provider edges, providers that are used without a provider block are configured implicitly by terraform.
+    for Address, Provider in Managed:
+        Nodes.setdefault(Provider, SHAPES['provider'])
+        Edges.add((Address, Provider))
+        Edges.add(("{} (close)".format(Provider), Address))
+    for Address in Nodes:
+        if Address.startswith('provider.'):
+            Edges.add((ROOT_NODE, "{} (close)".format(Address)))
+        elif Address.startswith('output.'):
+            Edges.add((COUNT_BOUNDARY_NODE, Address))
+    Edges.add((ROOT_NODE, COUNT_BOUNDARY_NODE))
+    Log.info("{}: Built native graph with {} nodes and {} edges", log_msg, len(Nodes), len(Edges))
+    return RenderDot(Nodes, Edges)
+
+
+def RenderDot(Nodes, Edges, Labels=None, Title=None):
+    """
+    Function that will render a dictionary of node address -> shape and a set of (from, to) address edges in the DOT format of `terraform graph`.
+    Nodes are labelled with their address unless Labels gives them another label, and an optional Title is shown at the top of the graph.
+    """
+    Labels = Labels or {}
+    Lines = ['digraph {', '\tcompound = "true"', '\tnewrank = "true"']
+    if Title:
+        Lines.extend(['\tlabel = "{}"'.format(DotEscape(Title)), '\tlabelloc = "t"'])
+    Lines.append('\tsubgraph "root" {')
+    for Address in sorted(Nodes):
+        Lines.append('\t\t"[root] {}" [label = "{}", shape = "{}"]'.format(DotEscape(Address), DotEscape(Labels.get(Address, Address)), Nodes[Address]))
+    for Source, Target in sorted(Edges):
+        Lines.append('\t\t"[root] {}" -> "[root] {}"'.format(DotEscape(Source), DotEscape(Target)))
+    Lines.extend(['\t}', '}'])
+    return "\n".join(Lines) + "\n"
+
+
+def DotEscape(Text):
+    """Function that will escape the quotes of a string for use as a quoted DOT ID, terraform 0.13 and later provider addresses contain quotes."""
+    return Text.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def ParseDot(DotText):
+    """Function that will parse `terraform graph` style DOT text into a dictionary of node ID -> shape and a set of (from, to) node ID edges."""
+    Nodes = {}
+    Edges = set()
+    for Line in DotText.splitlines():
+        Edge = DOT_EDGE_PATTERN.match(Line)
+        if Edge:
+            Source, Target = (DotUnescape(Node) for Node in Edge.groups())
+            Nodes.setdefault(Source, SHAPES['resource'])
+            Nodes.setdefault(Target, SHAPES['resource'])
+            Edges.add((Source, Target))
+            continue
+        Node = DOT_NODE_PATTERN.match(Line)
+        if Node:
+            Shape = DOT_SHAPE_PATTERN.search(Node.group(2))
+            Nodes[DotUnescape(Node.group(1))] = Shape.group(1) if Shape else SHAPES['resource']
+    return Nodes, Edges
+
+
+def DotUnescape(Text):
+    """Function that will remove the escaping from a quoted DOT ID."""
+    return re.sub(r'\\(.)', r'\1', Text)
+
+
+def SimpleAddress(NodeId):
+    """
+    Function that will return the node that a `terraform graph` node ID maps to in a simplified graph, or None for bookkeeping nodes that are dropped.
+    Everything inside a module call maps to the module call, module.vpc.aws_vpc.this -> module.vpc, and (expand) nodes map to the object they expand.
+    """
+    Address = NodeId[len('[root] '):] if NodeId.startswith('[root] ') else NodeId
+    if Address.endswith(' (expand)'):
+        Address = Address[:-len(' (expand)')]
+    Parts = Address.split('.')
+    Local = Parts
+    while len(Local) > 2 and Local[0] == 'module':
+        Local = Local[2:]
+    Local = ".".join(Local)
+    if Address == ROOT_NODE or Local.startswith(META_NODE_PREFIXES) or Address.endswith(META_NODE_SUFFIXES):
+        return None
+    if Parts[0] == 'module' and len(Parts) > 1:
+        return "module.{}".format(Parts[1])
+    return Address
+
+
+def StrongComponents(Successors):
+    """
+    Function that will return the strongly connected component of each node of a graph given as a list of successor sets indexed by node, and the number of
+    components. Components are numbered in reverse topological order, every edge between two components points from a higher to a lower number.
+    """
+    Count = len(Successors)
+    Order = [None] * Count
+    Low = [0] * Count
+    OnStack = [False] * Count
+    Stack = []
+    Component = [None] * Count
+    Counter = 0
+    Components = 0
+    for Root in range(Count):
+        if Order[Root] is not None:
+            continue
+        Order[Root] = Low[Root] = Counter
+        Counter += 1
+        Stack.append(Root)
+        OnStack[Root] = True
+        # Iterative Tarjan, each work item is a node and the iterator over the successors that are still to be visited.
+        Work = [(Root, iter(sorted(Successors[Root])))]
+        while Work:
+            Node, Children = Work[-1]
+            for Child in Children:
+                if Order[Child] is None:
+                    Order[Child] = Low[Child] = Counter
+                    Counter += 1
+                    Stack.append(Child)
+                    OnStack[Child] = True
+                    Work.append((Child, iter(sorted(Successors[Child]))))
+                    break
+                if OnStack[Child]:
+                    Low[Node] = min(Low[Node], Order[Child])
+            else:
+                Work.pop()
+                if Work:
+                    Parent = Work[-1][0]
+                    Low[Parent] = min(Low[Parent], Low[Node])
+                if Low[Node] == Order[Node]:
+                    while True:
+                        Member = Stack.pop()
+                        OnStack[Member] = False
+                        Component[Member] = Components
+                        if Member == Node:
+                            break
+                    Components += 1
+    return Component, Components
+
+
+def TransitiveReduction(Nodes, Edges):
+    """
+    Function that will return the set of edges of a graph without the edges that are implied by a longer path, a -> c is dropped when a -> b -> c exists.
+    Collapsed modules can reference each other's outputs and form cycles, so the reduction runs on the graph of strongly connected components, and edges
+    inside a cycle are kept as they are. Reachability is tracked in integer bitsets, one per component.
+    """
+    Index = {Address: Position for Position, Address in enumerate(sorted(Nodes))}
+    Successors = [set() for Address in Index]
+    for Source, Target in Edges:
+        Successors[Index[Source]].add(Index[Target])
+    Component, Components = StrongComponents(Successors)
+    ComponentSuccessors = [set() for Position in range(Components)]
+    for Source, Targets in enumerate(Successors):
+        for Target in Targets:
+            if Component[Source] != Component[Target]:
+                ComponentSuccessors[Component[Source]].add(Component[Target])
+    # Components are numbered sinks first, so the reach of every successor is known before the components that point at it.
+    Reach = [0] * Components
+    Implied = [0] * Components
+    for Current in range(Components):
+        for Successor in ComponentSuccessors[Current]:
+            Reach[Current] |= (1 << Successor) | Reach[Successor]
+            Implied[Current] |= Reach[Successor]
+    return set(
+        (Source, Target) for Source, Target in Edges
+        if Component[Index[Source]] == Component[Index[Target]] or not (Implied[Component[Index[Source]]] >> Component[Index[Target]]) & 1
+    )
+
+
+def SimplifyGraph(Log, DotText, MaxNodes=GRAPH_MAX_NODES):
+    """
+    Function that will reduce a terraform graph style DOT definition to a graph that dot can lay out quickly, however large the project is.
+    Provider, close, count boundary and root bookkeeping nodes are dropped, everything inside each module.x collapses into a single module.x node, edges
+    that are implied by a longer path are removed, and when more than MaxNodes nodes remain only the most connected MaxNodes are kept. A MaxNodes of
+    0 or None keeps every node.
+    """
+    log_msg = log_context(LOG_CONTEXT)
+    Nodes, Edges = ParseDot(DotText)
+    Mapped = {}
+    Simple = {}
+    Members = {}
+    for NodeId, Shape in Nodes.items():
+        Address = SimpleAddress(NodeId)
+        if Address is None:
+            continue
+        Mapped[NodeId] = Address
+        Simple[Address] = SHAPES['module'] if Address.startswith('module.') else Simple.get(Address, Shape)
+        Members[Address] = Members.get(Address, 0) + 1
+    Labels = {Address: "{} ({} nodes)".format(Address, Count) for Address, Count in Members.items() if Count > 1 and Address.startswith('module.')}
+    SimpleEdges = set()
+    for Source, Target in Edges:
+        Source, Target = Mapped.get(Source), Mapped.get(Target)
+        if Source is not None and Target is not None and Source != Target:
+            SimpleEdges.add((Source, Target))
+    SimpleEdges = TransitiveReduction(Simple, SimpleEdges)
+    Title = None
+    if MaxNodes and len(Simple) > MaxNodes:
+        Degree = dict.fromkeys(Simple, 0)
+        for Source, Target in SimpleEdges:
+            Degree[Source] += 1
+            Degree[Target] += 1
+        Kept = set(sorted(Simple, key=lambda Address: (-Degree[Address], Address))[:MaxNodes])
+        Log.warning("{}: Graph has {} nodes after simplification, only the {} most connected nodes will be shown", log_msg, len(Simple), MaxNodes)
+        Title = "{} of {} nodes shown".format(MaxNodes, len(Simple))
+        Simple = {Address: Shape for Address, Shape in Simple.items() if Address in Kept}
+        SimpleEdges = set((Source, Target) for Source, Target in SimpleEdges if Source in Kept and Target in Kept)
+    Log.info("{}: Simplified graph from {} nodes and {} edges to {} nodes and {} edges", log_msg, len(Nodes), len(Edges), len(Simple), len(SimpleEdges))
+    return RenderDot(Simple, SimpleEdges, Labels, Title)
+
+
+def RenderImages(Log, DotBinary, DotText, Formats=GRAPH_IMAGE_FORMATS, Cache=None):
+    """
+    Function that will render DOT text to each of the requested image formats with the graphviz dot binary, and return a dictionary of format -> image bytes
+    for the formats that rendered. Each format is rendered by its own dot process, and the processes run in parallel.
+    Rendered images are cached by a hash of the DOT text, the format and the dot binary, so an unchanged graph is never rendered twice.
+    """
+    import subprocess
+    from concurrent.futures import ThreadPoolExecutor
+    log_msg = log_context(LOG_CONTEXT)
+    Images = {}
+    Pending = []
+    try:
+        BinaryStat = os.stat(DotBinary)
+        BinaryKey = (DotBinary, BinaryStat.st_size, BinaryStat.st_mtime)
+    except OSError as e:
+        Log.warning("{}: Graphviz dot binary {} is not available: {}", log_msg, DotBinary, str(e))
+        return Images
+    for Format in Formats:
+        Key = Cache.key('graph_image', DotText, Format, *BinaryKey) if Cache is not None else None
+        Image = Cache.get(Key) if Cache is not None else None
+        if Image is not None:
+            Log.info("{}: Using cached {} render of the graph", log_msg, Format)
+            Images[Format] = Image
+        else:
+            Pending.append((Format, Key))
+    if not Pending:
+        return Images
+
+    def Render(Format):
+        """Run one dot process, the DOT text is piped in and the image is read from stdout."""
+        return subprocess.run([DotBinary, "-T{}".format(Format)], input=DotText.encode('utf-8'), stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=DOT_TIMEOUT)
+
+    Log.info("{}: Rendering the graph to {} with {}", log_msg, ", ".join(Format for Format, Key in Pending), DotBinary)
+    with ThreadPoolExecutor(max_workers=len(Pending)) as Executor:
+        Renders = [(Format, Key, Executor.submit(Render, Format)) for Format, Key in Pending]
+        for Format, Key, Future in Renders:
+            try:
+                Result = Future.result()
+                if Result.returncode != 0 or not Result.stdout:
+                    Log.warning("{}: dot failed to render {}: {}", log_msg, Format, Result.stderr.decode('utf-8', errors='replace').strip())
+                    continue
+                Images[Format] = Result.stdout
+                if Cache is not None:
+                    Cache.put(Key, Result.stdout)
+            except Exception as e:
+                Log.warning("{}: dot failed to render {}: {}", log_msg, Format, str(e))
+    if Cache is not None:
+        Cache.evict()
+    return Images
@@ -0,0 +1,55 @@
+##############################################################################
+# CloudMage : MagicDoc Parse Module
+#=============================================================================
+# CloudMage MagicDoc Automatic Documentation Generator CLI Utility/Library
+#   - Terraform HCL Parser Module
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/28/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Base Python Modules
+import os
+
+# Import MagicDoc Classes/Modules
+from magicdoc.classes.Log import log_context
+
+# Define Global Variables
+LOG_CONTEXT = "MOD->parse"
+
+# Below this many files the cost of starting a process pool outweighs parsing the files serially.
+PARALLEL_MIN_FILES = 16
+
+
+def ParseHCL(Content):
+    """Function that will parse the provided HCL text, returning a tuple of the parsed document and None, or None and the error message."""
+    import hcl
+    try:
+        return hcl.loads(Content), None
+    except Exception as e:
+        return None, str(e)
+
+
+def ParseFiles(Log, Contents, Jobs=1):
+    """
+    Function that will parse a list of HCL texts and return a list of (document, error) tuples in the same order.
+    When Jobs is greater than 1 and there are enough texts to make it worthwhile, parsing is fanned out to a process pool,
+    as pyhcl parsing is CPU bound and holds the GIL. A Jobs value of 0 uses one process per CPU.
+    """
+    log_msg = log_context(LOG_CONTEXT)
+    Jobs = Jobs if Jobs > 0 else (os.cpu_count() or 1)
+    if Jobs <= 1 or len(Contents) < PARALLEL_MIN_FILES:
+        Log.debug("{}: Parsing {} files serially".format(log_msg, len(Contents)))
+        return [ParseHCL(Content) for Content in Contents]
+    Log.info("{}: Parsing {} files using {} processes".format(log_msg, len(Contents), Jobs))
+    from concurrent.futures import ProcessPoolExecutor
+    try:
+        with ProcessPoolExecutor(max_workers=min(Jobs, len(Contents))) as Pool:
+            # map preserves the input order, so results are merged deterministically regardless of completion order.
+            return list(Pool.map(ParseHCL, Contents, chunksize=max(1, len(Contents) // (Jobs * 4))))
+    except Exception as e:
+        Log.warning("{}: Process pool parsing failed, falling back to serial parsing: {}".format(log_msg, str(e)))
+        return [ParseHCL(Content) for Content in Contents]
@@ -0,0 +1,98 @@
+##############################################################################
+# CloudMage : MagicDoc Process Module
+#=============================================================================
+# CloudMage MagicDoc Automatic Documentation Generator CLI Utility/Library
+#   - Streaming Subprocess Runner Module
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/28/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Base Python Modules
+import io, os, signal, subprocess, threading, time
+
+# Import MagicDoc Classes/Modules
+from magicdoc.classes.Log import log_context
+
+# Define Global Variables
+LOG_CONTEXT = "MOD->process"
+
+# Seconds that a command may run for when no timeout is given.
+DEFAULT_TIMEOUT = 600
+# Seconds that a command is given to shut down after it is interrupted, before it is killed.
+TERMINATE_GRACE = 10
+
+
+def RunCommand(Log, Command, Cwd=None, Timeout=DEFAULT_TIMEOUT, Env=None, Capture=False):
+    """
+    Function that will run a command, stream its output to the log line by line as it is produced, and return a tuple of its return code and captured stdout.
+    stderr is always streamed to the log. stdout is streamed to the log too, unless Capture is set, in which case it is collected into a single buffer and
+    returned instead, so that large outputs such as a terraform graph are held in memory once. Captured stdout is None when Capture is not set.
+    A command that runs for longer than Timeout seconds is stopped and subprocess.TimeoutExpired is raised. On Ctrl-C the command is stopped, and the
+    KeyboardInterrupt is raised again once it has exited. A Timeout of 0 or None lets the command run for as long as it takes.
+    """
+    log_msg = log_context(LOG_CONTEXT)
+    Log.info("{}: Running: {}", log_msg, " ".join(Command))
+    # The command runs in its own process group, so that stopping it also stops the plugin processes that it started.
+    Process = subprocess.Popen(Command, cwd=Cwd, env=Env, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE, start_new_session=(os.name == 'posix'))
+    Output = io.StringIO() if Capture else None
+    Readers = [
+        threading.Thread(target=StreamLines, args=(Log, Process.stdout, Output)),
+        threading.Thread(target=StreamLines, args=(Log, Process.stderr, None)),
+    ]
+    for Reader in Readers:
+        Reader.daemon = True
+        Reader.start()
+    Started = time.time()
+    try:
+        Process.wait(timeout=Timeout or None)
+    except subprocess.TimeoutExpired:
+        Log.warning("{}: {} did not finish within {} seconds and is being stopped", log_msg, Command[0], Timeout)
+        StopProcess(Log, Process)
+        raise
+    except KeyboardInterrupt:
+        Log.warning("{}: Interrupted, stopping {}", log_msg, Command[0])
+        StopProcess(Log, Process)
+        raise
+    finally:
+        # A plugin that outlives the command may hold its output pipes open, so the readers are not waited on forever.
+        for Reader in Readers:
+            Reader.join(TERMINATE_GRACE)
+    Log.info("{}: {} exited with return code {} after {:.2f} seconds", log_msg, Command[0], Process.returncode, time.time() - Started)
+    return Process.returncode, Output.getvalue() if Output is not None else None
+
+
+def StreamLines(Log, Stream, Output=None):
+    """Function that will read a process output stream line by line until it closes, writing each line to the Output buffer if one is given, or to the log."""
+    log_msg = log_context(LOG_CONTEXT)
+    with Stream:
+        for Line in iter(Stream.readline, b''):
+            Line = Line.decode('utf-8', errors='replace')
+            if Output is not None:
+                Output.write(Line)
+            elif Line.strip():
+                Log.debug("{}: {}", log_msg, Line.rstrip())
+
+
+def StopProcess(Log, Process):
+    """Function that will ask a process and its process group to shut down, and kill them if they are still running after TERMINATE_GRACE seconds."""
+    log_msg = log_context(LOG_CONTEXT)
+    for Signal in (signal.SIGTERM, getattr(signal, 'SIGKILL', signal.SIGTERM)):
+        try:
+            if os.name == 'posix':
+                os.killpg(Process.pid, Signal)
+            elif Signal == signal.SIGTERM:
+                Process.terminate()
+            else:
+                Process.kill()
+        except OSError:
+            # The process has already exited.
+            pass
+        try:
+            Process.wait(timeout=TERMINATE_GRACE)
+            return
+        except subprocess.TimeoutExpired:
+            Log.warning("{}: Process {} did not stop within {} seconds, killing it", log_msg, Process.pid, TERMINATE_GRACE)
@@ -0,0 +1,123 @@
+##############################################################################
+# CloudMage : MagicDoc Scan Module
+#=============================================================================
+# CloudMage MagicDoc Automatic Documentation Generator CLI Utility/Library
+#   - Terraform Project File Scanner Module
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/28/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Base Python Modules
+import os, json
+
+# Import MagicDoc Classes/Modules
+from magicdoc.classes.Log import log_context
+
+# Define Global Variables
+LOG_CONTEXT = "MOD->scan"
+
+# Directories that never hold project terraform source and are pruned before the scanner descends into them.
+# The .magicdoc directory holds the scan manifest itself and must be pruned so that writing it never invalidates it.
+DEFAULT_PRUNE_DIRS = ('.terraform', '.git', '.venv', 'node_modules', '.magicdoc')
+# Location of the file manifest cache, relative to the scanned project directory.
+MANIFEST_PATH = os.path.join('.magicdoc', 'cache', 'manifest')
+MANIFEST_VERSION = 1
+
+
+def ScanDir(Log, DirPath, PruneDirs=None, ExcludeDir=None, NoRecursion=False):
+    """
+    Function that will scan a given directory path for terraform .tf and .tfvars files using os.scandir.
+    Any directory whose name is in PruneDirs, or whose path matches ExcludeDir, is skipped before it is descended into.
+    Returns a tuple of the file search results dictionary, the number of directory entries that were pruned,
+    and a dictionary of every scanned directory keyed by relative path holding its [mtime_ns, inode] stat values.
+    """
+    log_msg = log_context(LOG_CONTEXT)
+    PruneDirs = frozenset(PruneDirs if PruneDirs is not None else DEFAULT_PRUNE_DIRS)
+    Results = {'list_tf_files': [], 'list_tfvar_files': []}
+    Skipped = 0
+    Dirs = {}
+
+    Log.info("{}: ScanDir function called on {}", log_msg, DirPath)
+    Log.debug(lambda: "{}: Pruning directories: {}".format(log_msg, sorted(PruneDirs)))
+    # Each stack item holds an absolute directory path, and the path prefix relative to the scanned root.
+    Stack = [(DirPath, '')]
+    while Stack:
+        CurrentPath, Prefix = Stack.pop()
+        SubDirs = []
+        try:
+            Stat = os.stat(CurrentPath)
+            Dirs[Prefix] = [Stat.st_mtime_ns, Stat.st_ino]
+            with os.scandir(CurrentPath) as Entries:
+                Entries = sorted(Entries, key=lambda Entry: Entry.name)
+        except OSError as e:
+            Log.warning("{}: Unable to scan directory {}: {}", log_msg, CurrentPath, str(e))
+            continue
+        for Entry in Entries:
+            if Entry.is_dir(follow_symlinks=False):
+                if Entry.name in PruneDirs or (ExcludeDir is not None and ExcludeDir in (Entry.path, Entry.name)):
+                    Log.debug("{}: Pruning directory: {} [Skipping...]", log_msg, Entry.path)
+                    Skipped += 1
+                elif not NoRecursion:
+                    SubDirs.append((Entry.path, "{}{}/".format(Prefix, Entry.name)))
+            elif Entry.name.startswith('.terraform'):
+                Skipped += 1
+            elif Entry.name.endswith('.tf'):
+                Log.debug("{}: Terraform .tf file match found: {}{}", log_msg, Prefix, Entry.name)
+                Results.get('list_tf_files').append("{}{}".format(Prefix, Entry.name))
+            elif Entry.name.endswith('.tfvars'):
+                Log.debug("{}: Terraform .tfvar file match found: {}{}", log_msg, Prefix, Entry.name)
+                Results.get('list_tfvar_files').append("{}{}".format(Prefix, Entry.name))
+        # Push sub-directories in reverse so that they are popped, and therefore listed, in name order.
+        Stack.extend(reversed(SubDirs))
+    Log.info("{}: Scan of {} completed, {} entries pruned", log_msg, DirPath, Skipped)
+    return Results, Skipped, Dirs
+
+
+def LoadManifest(Log, DirPath, Settings):
+    """
+    Function that will load the file manifest cache for a given directory path and validate it against the current tree.
+    The manifest is only valid if it was written with the same scan settings and every recorded directory still has the
+    same mtime and inode, which costs one stat call per directory instead of a full directory walk.
+    Returns a tuple of the cached file search results and pruned entry count, or None if the manifest is missing or stale.
+    """
+    log_msg = log_context(LOG_CONTEXT)
+    ManifestFile = os.path.join(DirPath, MANIFEST_PATH)
+    try:
+        with open(ManifestFile) as f:
+            Manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        Log.debug("{}: No usable file manifest found at {}: {}", log_msg, ManifestFile, str(e))
+        return None
+    if Manifest.get('version') != MANIFEST_VERSION or Manifest.get('settings') != Settings:
+        Log.info("{}: File manifest {} was written with different scan settings, invalidating", log_msg, ManifestFile)
+        return None
+    for Prefix, Recorded in Manifest.get('dirs', {}).items():
+        try:
+            Stat = os.stat(os.path.join(DirPath, Prefix))
+        except OSError:
+            Log.info("{}: Directory {} no longer exists, invalidating file manifest", log_msg, Prefix)
+            return None
+        if [Stat.st_mtime_ns, Stat.st_ino] != Recorded:
+            Log.info("{}: Directory '{}' changed since the last scan, invalidating file manifest", log_msg, Prefix)
+            return None
+    Log.info("{}: File manifest {} validated against {} directories", log_msg, ManifestFile, len(Manifest.get('dirs', {})))
+    return Manifest.get('files'), Manifest.get('skipped', 0)
+
+
+def SaveManifest(Log, DirPath, Settings, Results, Skipped, Dirs):
+    """Function that will write the file manifest cache for a given directory path. Failures are logged and otherwise ignored."""
+    log_msg = log_context(LOG_CONTEXT)
+    ManifestFile = os.path.join(DirPath, MANIFEST_PATH)
+    Manifest = {'version': MANIFEST_VERSION, 'settings': Settings, 'dirs': Dirs, 'files': Results, 'skipped': Skipped}
+    try:
+        # Write to a temporary file and then replace, so that an interrupted run never leaves a truncated manifest behind.
+        with open("{}.tmp".format(ManifestFile), 'w') as f:
+            json.dump(Manifest, f)
+        os.replace("{}.tmp".format(ManifestFile), ManifestFile)
+        Log.info("{}: File manifest saved to {}", log_msg, ManifestFile)
+    except OSError as e:
+        Log.warning("{}: Unable to save file manifest to {}: {}", log_msg, ManifestFile, str(e))
@@ -13,7 +13,10 @@
 ###############
 # Import Base Python Modules
 from pathlib import Path
-import sys, logging, inspect
+import sys, logging
+
+# Import MagicDoc Classes/Modules
+from magicdoc.classes.Log import log_context
 
 # Define Global Variables
 LOG_CONTEXT = "MOD->tree"
@@ -22,8 +25,7 @@ log = logging.getLogger()
 
 def BuildDirTree(DirPath: Path, DirPrefix: str=''):
     """Function that will build a directory tree from a given file path"""
-    this = inspect.stack()[0][3]
-    log_msg = "{}.{}".format(LOG_CONTEXT, this)
+    log_msg = log_context(LOG_CONTEXT)
     try:
         # Designate Directory Tree Prefix Symbols
         SpacePrefix =  '    '
@@ -56,8 +58,7 @@ def BuildDirTree(DirPath: Path, DirPrefix: str=''):
 
 def DirTree(Log, DirPath):
     """Function will use the BuildDirTree Generator to generate a directory path ascii tree, store the output and return it to the caller."""
-    this = inspect.stack()[0][3]
-    log_msg = "{}.{}".format(LOG_CONTEXT, this)
+    log_msg = log_context(LOG_CONTEXT)
     try:
         Log.info("{}: DirTree function called on {}".format(log_msg, DirPath))
         Log.info("{}: Attempting to render tree structure for directory: {}".format(log_msg, DirPath))
@@ -0,0 +1,93 @@
+##############################################################################
+# CloudMage : MagicDoc Test Fixtures
+#=============================================================================
+# CloudMage MagicDoc Automatic Documentation Generator CLI Utility/Library
+#   - Shared pytest Fixtures
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/28/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Pip Installed Modules:
+import pytest
+
+# Import Base Python Modules
+import json, threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+
+class StubHTTPServer(ThreadingMixIn, HTTPServer):
+    """Local HTTP server that answers each path with its queue of canned responses, and records every request that it received."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), StubHandler)
+        # Dictionary of path -> list of (status, body, headers) responses. The last response of a path is repeated once the others were served.
+        self.routes = {}
+        # List of (method, path, headers, body) of the requests received.
+        self.requests = []
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:{}".format(self.server_address[1])
+
+    def route(self, path, *responses):
+        """Method that sets the responses of a path, each a (status, body, headers) tuple, or a (status, body) tuple without headers."""
+        self.routes[path] = [response if len(response) == 3 else response + ({},) for response in responses]
+
+    def received(self, path=None):
+        """Method that returns the requests received, for a path if one is given."""
+        return [request for request in self.requests if path is None or request[1] == path]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Request handler of the StubHTTPServer, json bodies are encoded, and paths without a route answer 404."""
+
+    def handle_request(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else None
+        with self.server.lock:
+            self.server.requests.append((self.command, self.path, dict(self.headers), json.loads(body) if body else None))
+            responses = self.server.routes.get(self.path, [(404, {'message': 'Not Found'}, {})])
+            status, payload, headers = responses.pop(0) if len(responses) > 1 else responses[0]
+        data = b'' if payload is None else json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = handle_request
+    do_POST = handle_request
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    """Fixture that runs a StubHTTPServer on a free local port for the length of a test."""
+    server = StubHTTPServer()
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05})
+    thread.daemon = True
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def write_git_checkout(path, remotes):
+    """Function that writes a minimal git checkout in path, with a dictionary of remote name -> url in its git config."""
+    git_dir = path / '.git'
+    (git_dir / 'refs' / 'tags').mkdir(parents=True)
+    (git_dir / 'HEAD').write_text('ref: refs/heads/master\n')
+    (git_dir / 'config').write_text('[core]\n\tbare = false\n' + ''.join('[remote "{}"]\n\turl = {}\n'.format(name, url) for name, url in remotes.items()))
+    return path
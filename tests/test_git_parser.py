@@ -0,0 +1,52 @@
+##############################################################################
+# CloudMage : MagicDoc GitParser Class Tests
+#=============================================================================
+# CloudMage MagicDoc Automatic Documentation Generator CLI Utility/Library
+#   - GitParser Class Tests, against a local stub server
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/28/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import MagicDoc Classes/Modules
+from magicdoc.classes.Log import Log
+from magicdoc.classes.HttpClient import HttpClient
+from magicdoc.classes.GitParser import GitParser
+from conftest import write_git_checkout
+
+
+def test_batch_request_resolves_repositories_with_one_graphql_query(stub_server, tmp_path):
+    stub_server.route('/graphql', (200, {
+        'data': {
+            'r0': {'name': 'vpc', 'nameWithOwner': 'acme/vpc', 'description': 'VPC module', 'owner': {'login': 'acme', 'url': 'https://github.com/acme'}, 'latestRelease': {'tagName': 'v2.0.0'}},
+            'r1': None
+        },
+        'errors': [{'message': "Could not resolve to a Repository with the name 'acme/missing'."}]
+    }))
+    http = HttpClient(Log())
+    parsers = []
+    for directory, remote in (('vpc', 'acme/vpc'), ('vpc-copy', 'acme/vpc'), ('missing', 'acme/missing')):
+        write_git_checkout(tmp_path / directory, {'origin': 'https://github.com/{}.git'.format(remote)})
+        parsers.append(GitParser(Log(), str(tmp_path / directory), github_api=stub_server.url, http=http))
+    unresolved = GitParser.batch_request(parsers, token='secret')
+    # Both checkouts of acme/vpc share one alias of a single query, and the repository that was not found is left to the REST path.
+    assert unresolved == [parsers[2]]
+    for parser in parsers[:2]:
+        assert parser.repo['full_name'] == 'acme/vpc'
+        assert parser.repo['owner_url'] == 'https://github.com/acme'
+        assert parser.release == 'v2.0.0'
+    requests = stub_server.received()
+    assert len(requests) == 1
+    method, path, headers, body = requests[0]
+    assert (method, path, headers.get('Authorization')) == ('POST', '/graphql', 'bearer secret')
+    assert body['query'].count('repository(') == 2
+
+
+def test_batch_request_without_token_sends_nothing(stub_server, tmp_path):
+    write_git_checkout(tmp_path, {'origin': 'https://github.com/acme/vpc.git'})
+    parsers = [GitParser(Log(), str(tmp_path), github_api=stub_server.url)]
+    assert GitParser.batch_request(parsers) == parsers
+    assert stub_server.received() == []
@@ -0,0 +1,65 @@
+##############################################################################
+# CloudMage : MagicDoc Git Provider Class Tests
+#=============================================================================
+# CloudMage MagicDoc Automatic Documentation Generator CLI Utility/Library
+#   - Git Provider Class Tests, against stub files and a local stub server
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/28/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Base Python Modules
+import json
+
+# Import MagicDoc Classes/Modules
+from magicdoc.classes.Log import Log
+from magicdoc.classes.GitParser import GitParser
+from magicdoc.classes.GitProvider import GitProvider, GithubProvider, GitlabProvider, LocalProvider
+from conftest import write_git_checkout
+
+
+def test_local_provider_reads_stub_directory(tmp_path):
+    stub_dir = tmp_path / 'stubs'
+    (stub_dir / 'gitlab.com' / 'acme').mkdir(parents=True)
+    (stub_dir / 'gitlab.com' / 'acme' / 'vpc.json').write_text(json.dumps({
+        'repo': {'name': 'vpc', 'full_name': 'acme/vpc', 'description': 'VPC module', 'owner': 'acme', 'owner_url': 'https://gitlab.com/acme'},
+        'release': 'v3.1.0'
+    }))
+    write_git_checkout(tmp_path / 'project', {'origin': 'https://gitlab.com/acme/vpc.git'})
+    git = GitParser(Log(), str(tmp_path / 'project'), provider_stub_dir=str(stub_dir))
+    git.repo = None
+    assert isinstance(git.provider('gitlab.com'), LocalProvider)
+    assert git.repo['description'] == 'VPC module'
+    assert git.release == 'v3.1.0'
+
+
+def test_local_provider_missing_stub_file(tmp_path):
+    provider = GitProvider.create(Log(), None, 'github.com', stub_dir=str(tmp_path))
+    repo_path, release_path, headers = provider.request_urls('acme/vpc')
+    assert provider.request(repo_path, headers) == {}
+
+
+def test_provider_api_selects_provider_for_any_host():
+    apis = {
+        'git.corp.example': 'https://git.corp.example/api/v4',
+        'code.corp.example': 'gitlab:https://code.corp.example/gitlab/api',
+        'ghe.corp.example': 'github:https://ghe.corp.example/api'
+    }
+    assert isinstance(GitProvider.create(Log(), None, 'git.corp.example', apis), GitlabProvider)
+    provider = GitProvider.create(Log(), None, 'code.corp.example', apis)
+    assert isinstance(provider, GitlabProvider) and provider.api == 'https://code.corp.example/gitlab/api'
+    assert isinstance(GitProvider.create(Log(), None, 'ghe.corp.example', apis), GithubProvider)
+    assert GitProvider.create(Log(), None, 'git.unknown.example', apis) is None
+
+
+def test_self_hosted_gitlab(stub_server, tmp_path):
+    stub_server.route('/api/v4/projects/acme%2Fnet%2Fvpc', (200, {'name': 'vpc', 'path_with_namespace': 'acme/net/vpc', 'description': 'VPC module', 'namespace': {'full_path': 'acme/net', 'web_url': 'https://git.corp.example/acme/net'}}))
+    stub_server.route('/api/v4/projects/acme%2Fnet%2Fvpc/releases?per_page=1', (200, [{'tag_name': 'v4.0.0'}]))
+    write_git_checkout(tmp_path, {'origin': 'https://git.corp.example/acme/net/vpc.git'})
+    git = GitParser(Log(), str(tmp_path), provider_apis={'git.corp.example': stub_server.url + '/api/v4'})
+    git.repo = None
+    assert git.repo['full_name'] == 'acme/net/vpc'
+    assert git.release == 'v4.0.0'
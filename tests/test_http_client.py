@@ -0,0 +1,104 @@
+##############################################################################
+# CloudMage : MagicDoc HttpClient Class Tests
+#=============================================================================
+# CloudMage MagicDoc Automatic Documentation Generator CLI Utility/Library
+#   - HttpClient Class Tests, against a local stub server
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/28/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Base Python Modules
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Import MagicDoc Classes/Modules
+from magicdoc.classes.Log import Log
+from magicdoc.classes.HttpClient import HttpClient
+from magicdoc.classes.CacheStore import CacheStore
+from magicdoc.classes.GitParser import GitParser
+from conftest import write_git_checkout
+
+
+def test_get_json(stub_server):
+    stub_server.route('/repos/acme/vpc', (200, {'name': 'vpc'}))
+    assert HttpClient(Log()).get_json(stub_server.url + '/repos/acme/vpc') == (200, {'name': 'vpc'})
+
+
+def test_session_is_created_once(stub_server):
+    HttpClient._session = None
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        sessions = set(executor.map(lambda _: id(HttpClient(Log()).session), range(64)))
+    assert len(sessions) == 1
+
+
+def test_git_parser_requests_each_repository_once(stub_server, tmp_path):
+    stub_server.route('/repos/acme/vpc', (200, {'name': 'vpc', 'full_name': 'acme/vpc', 'description': 'VPC module', 'owner': {'login': 'acme', 'html_url': 'https://github.com/acme'}}))
+    stub_server.route('/repos/acme/vpc/releases/latest', (200, {'tag_name': 'v1.2.0'}))
+    write_git_checkout(tmp_path, {'origin': 'https://github.com/acme/vpc.git', 'upstream': 'git@github.com:acme/vpc.git'})
+    git = GitParser(Log(), str(tmp_path), github_api=stub_server.url)
+    git.repo = None
+    assert git.repo['full_name'] == 'acme/vpc'
+    assert git.repo['owner_url'] == 'https://github.com/acme'
+    assert git.release == 'v1.2.0'
+    # Both remotes point at the same repository, which is requested once.
+    assert sorted(request[1] for request in stub_server.received()) == ['/repos/acme/vpc', '/repos/acme/vpc/releases/latest']
+
+
+def test_etag_revalidation(stub_server, tmp_path):
+    url = stub_server.url + '/repos/acme/vpc'
+    stub_server.route('/repos/acme/vpc', (200, {'name': 'vpc'}, {'ETag': '"v1"'}), (304, None))
+    http = HttpClient(Log(), cache=CacheStore(Log(), str(tmp_path)), ttl=0)
+    assert http.get_json(url) == (200, {'name': 'vpc'})
+    # The cached response is revalidated with its ETag, and the 304 response serves the cached body.
+    assert http.get_json(url) == (200, {'name': 'vpc'})
+    requests = stub_server.received('/repos/acme/vpc')
+    assert 'If-None-Match' not in requests[0][2]
+    assert requests[1][2].get('If-None-Match') == '"v1"'
+
+
+def test_ttl_serves_cache_without_request(stub_server, tmp_path):
+    url = stub_server.url + '/repos/acme/vpc'
+    stub_server.route('/repos/acme/vpc', (200, {'name': 'vpc'}, {'ETag': '"v1"'}))
+    http = HttpClient(Log(), cache=CacheStore(Log(), str(tmp_path)), ttl=3600)
+    http.get_json(url)
+    assert http.get_json(url) == (200, {'name': 'vpc'})
+    assert len(stub_server.received('/repos/acme/vpc')) == 1
+
+
+def test_retry_after_server_error(stub_server):
+    url = stub_server.url + '/repos/acme/vpc'
+    stub_server.route('/repos/acme/vpc', (503, {'message': 'Unavailable'}, {'Retry-After': '0'}), (200, {'name': 'vpc'}))
+    assert HttpClient(Log(), retries=2).get_json(url) == (200, {'name': 'vpc'})
+    assert len(stub_server.received('/repos/acme/vpc')) == 2
+
+
+def test_retries_are_bounded(stub_server):
+    url = stub_server.url + '/repos/acme/vpc'
+    stub_server.route('/repos/acme/vpc', (500, {'message': 'Error'}, {'Retry-After': '0'}))
+    assert HttpClient(Log(), retries=1).get_json(url) == (500, {'message': 'Error'})
+    assert len(stub_server.received('/repos/acme/vpc')) == 2
+
+
+def test_retry_that_exceeds_the_network_budget_is_not_sent(stub_server):
+    url = stub_server.url + '/repos/acme/vpc'
+    stub_server.route('/repos/acme/vpc', (429, {'message': 'Slow down'}, {'Retry-After': '60'}), (200, {'name': 'vpc'}))
+    assert HttpClient(Log(), retries=2, budget=5).get_json(url) == (429, {'message': 'Slow down'})
+    assert len(stub_server.received('/repos/acme/vpc')) == 1
+
+
+def test_distant_rate_limit_reset_is_not_waited_for(stub_server):
+    url = stub_server.url + '/repos/acme/vpc'
+    reset = int(time.time()) + 3600
+    stub_server.route('/repos/acme/vpc', (403, {'message': 'API rate limit exceeded'}, {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': str(reset)}))
+    http = HttpClient(Log(), retries=2, budget=0)
+    started = time.time()
+    assert http.get_json(url)[0] == 403
+    assert time.time() - started < 5
+    assert len(stub_server.received('/repos/acme/vpc')) == 1
+    # The rate limit is recorded for the host that reported it only.
+    assert http.rate_limit(url) == (0, reset)
+    assert http.rate_limit('https://gitlab.com/api/v4/projects') == (None, None)
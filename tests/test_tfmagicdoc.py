@@ -0,0 +1,129 @@
+##############################################################################
+# CloudMage : MagicDoc TFMagicDoc Class Tests
+#=============================================================================
+# CloudMage MagicDoc Automatic Documentation Generator CLI Utility/Library
+#   - TFMagicDoc Class Tests
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/28/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Pip Installed Modules:
+import pytest
+
+# Import Base Python Modules
+import os
+
+# Import MagicDoc Classes/Modules
+from magicdoc.classes.Log import Log
+from magicdoc.classes.TFMagicDoc import TFMagicDoc
+
+
+def write_project(path):
+    """Function that writes a project with a root module, an example directory and a nested module that redeclare the root variables and outputs."""
+    (path / 'examples' / 'basic').mkdir(parents=True)
+    (path / 'modules' / 'net').mkdir(parents=True)
+    (path / 'variables.tf').write_text('variable "name" {\n  description = "Root name"\n}\n')
+    (path / 'outputs.tf').write_text('output "id" {\n  value = "root"\n}\n')
+    (path / 'examples' / 'basic' / 'variables.tf').write_text('variable "example_only" {\n  default = "x"\n}\nvariable "name" {\n  default = "example"\n}\n')
+    (path / 'modules' / 'net' / 'outputs.tf').write_text('output "cidr" {\n  value = "10.0.0.0/16"\n}\noutput "id" {\n  value = "net"\n}\n')
+
+
+def project(path):
+    """Function that returns a TFMagicDoc instance for a project directory, with every cache bypassed."""
+    return TFMagicDoc(Log(), str(path), no_cache=True)
+
+
+def test_root_module_only_by_default(tmp_path):
+    write_project(tmp_path)
+    tf = project(tmp_path)
+    assert [v['name'] for v in tf.variables['required_vars'] + tf.variables['optional_vars']] == ['name']
+    assert [o['name'] for o in tf.outputs] == ['id']
+
+
+def test_include_examples_adds_sub_directory_declarations(tmp_path):
+    write_project(tmp_path)
+    tf = project(tmp_path)
+    tf.include_examples = True
+    assert [v['name'] for v in tf.variables['required_vars']] == ['name']
+    assert [v['name'] for v in tf.variables['optional_vars']] == ['example_only']
+    assert [o['name'] for o in tf.outputs] == ['id', 'cidr']
+    # A sub-directory declaration never replaces the root module declaration of the same name.
+    assert tf.outputs[0]['value'] == 'root'
+
+
+# Fake terraform binary that logs the directory and environment of every command, checks the sandbox override and provider mirror on init,
+# writes into its data directory, and prints a graph. Set FAKE_TERRAFORM_EXIT to make every command but version fail.
+FAKE_TERRAFORM = """#!/bin/sh
+echo "$1|$PWD|$TF_DATA_DIR|$TF_PLUGIN_CACHE_DIR" >> "$FAKE_TERRAFORM_LOG"
+[ "$1" = "version" ] || [ -z "$FAKE_TERRAFORM_EXIT" ] || exit "$FAKE_TERRAFORM_EXIT"
+case "$1" in
+  version) echo "Terraform v0.13.5";;
+  init)
+    grep -q 'backend "local"' magicdoc_override.tf || exit 1
+    grep -q "$FAKE_TERRAFORM_MIRROR" "$TF_CLI_CONFIG_FILE" || exit 1
+    mkdir -p "$TF_DATA_DIR/providers"
+    echo "init passed" >> "$FAKE_TERRAFORM_LOG";;
+  graph) printf 'digraph {\\n\\t"[root] aws_s3_bucket.b" -> "[root] var.name"\\n}\\n';;
+esac
+"""
+
+
+@pytest.fixture
+def fake_terraform(tmp_path, monkeypatch):
+    """Fixture that puts the fake terraform binary first on the PATH, and returns the path of its command log."""
+    bin_dir = tmp_path / 'bin'
+    bin_dir.mkdir()
+    (bin_dir / 'terraform').write_text(FAKE_TERRAFORM)
+    (bin_dir / 'terraform').chmod(0o755)
+    (tmp_path / 'mirror').mkdir()
+    monkeypatch.setenv('PATH', "{}{}{}".format(bin_dir, os.pathsep, os.environ.get('PATH', '')))
+    monkeypatch.setenv('FAKE_TERRAFORM_LOG', str(tmp_path / 'terraform.log'))
+    monkeypatch.setenv('FAKE_TERRAFORM_MIRROR', str(tmp_path / 'mirror'))
+    return tmp_path / 'terraform.log'
+
+
+def sandbox_graph(tmp_path):
+    """Function that generates the terraform graph of a one file project in a sandbox under tmp_path, and returns the TFMagicDoc instance."""
+    (tmp_path / 'project').mkdir()
+    (tmp_path / 'project' / 'main.tf').write_text('variable "name" {}\nresource "aws_s3_bucket" "b" {\n  bucket = var.name\n}\n')
+    tf = TFMagicDoc(Log(), str(tmp_path / 'project'), no_cache=True, cache_dir=str(tmp_path / 'cache'))
+    tf.provider_mirror = str(tmp_path / 'mirror')
+    tf.graph_engine = 'terraform'
+    tf.graph = False
+    return tf
+
+
+@pytest.mark.skipif(os.name != 'posix', reason='The fake terraform binary is a shell script')
+def test_sandbox_init_and_cleanup(tmp_path, fake_terraform):
+    tf = sandbox_graph(tmp_path)
+    assert '"[root] aws_s3_bucket.b" -> "[root] var.name"' in tf.graph
+    lines = fake_terraform.read_text().splitlines()
+    # The init found the local backend override and the provider mirror configuration in the sandbox.
+    assert 'init passed' in lines
+    runs = [line.split('|') for line in lines if line.startswith(('init|', 'graph|'))]
+    assert [run[0] for run in runs] == ['init', 'graph']
+    # Both commands run in the same sandbox work directory, with a data directory of its own, outside of the project.
+    work_dir, data_dir = runs[0][1], runs[0][2]
+    assert runs[1][1:3] == [work_dir, data_dir]
+    assert not work_dir.startswith(str(tmp_path / 'project'))
+    assert os.path.commonpath([work_dir, data_dir]) == os.path.dirname(data_dir)
+    assert runs[0][3] == str(tmp_path / 'cache' / 'terraform' / 'plugins')
+    # The project is never changed, and the work directory and its data directory are removed, while the plugin cache is kept.
+    assert sorted(os.listdir(str(tmp_path / 'project'))) == ['main.tf']
+    assert not os.path.exists(data_dir)
+    assert os.listdir(os.path.dirname(os.path.dirname(data_dir))) == []
+    assert os.path.isdir(runs[0][3])
+
+
+@pytest.mark.skipif(os.name != 'posix', reason='The fake terraform binary is a shell script')
+def test_sandbox_is_removed_when_terraform_fails(tmp_path, fake_terraform, monkeypatch):
+    monkeypatch.setenv('FAKE_TERRAFORM_EXIT', '1')
+    tf = sandbox_graph(tmp_path)
+    assert tf.graph is None
+    sandbox_root = tmp_path / 'cache' / 'terraform' / 'sandbox'
+    assert [os.listdir(str(sandbox_root / key)) for key in os.listdir(str(sandbox_root))] == [[]]
+    assert sorted(os.listdir(str(tmp_path / 'project'))) == ['main.tf']